@@ -1,175 +1,239 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 import os
+import tempfile
+import time
 
-st.set_page_config(page_title="Scouting Amateur", page_icon="⚽", layout="wide")
-
-os.makedirs('data/amateur', exist_ok=True)
+from src.amateur.database import open_database
+from src.amateur.data_access import CachedDataAccess
 
 PLAYERS_FILE = 'data/amateur/players.csv'
 MATCHES_FILE = 'data/amateur/match_stats.csv'
+DB_FILE = 'data/amateur/scouting.db'
+FORM_STATE_FILE = 'data/amateur/form_state_db.pkl'
+EXPORT_DIR = 'data/amateur/exports'
+PAGE_SIZES = [25, 50, 100, 250]
 
-def init_files():
-    if not os.path.exists(PLAYERS_FILE):
-        pd.DataFrame(columns=['player_id', 'name', 'birth_date', 'position', 'team', 'league', 'height_cm', 'weight_kg', 'preferred_foot', 'nationality', 'contact', 'notes', 'created_date']).to_csv(PLAYERS_FILE, index=False)
-    if not os.path.exists(MATCHES_FILE):
-        pd.DataFrame(columns=['match_id', 'player_id', 'player_name', 'match_date', 'opponent', 'minutes_played', 'goals', 'assists', 'shots', 'shots_on_target', 'key_passes', 'successful_dribbles', 'tackles', 'interceptions', 'clearances', 'fouls_committed', 'fouls_received', 'yellow_cards', 'red_cards', 'rating_1_10', 'scout_notes', 'video_url']).to_csv(MATCHES_FILE, index=False)
-
-init_files()
+def get_database():
+    # La primera vez se migran los CSV de la versión anterior (también lo usa
+    # import_from_excel de excel_template_generator)
+    os.makedirs('data/amateur', exist_ok=True)
+    return open_database(DB_FILE, PLAYERS_FILE, MATCHES_FILE)
 
-st.title("⚽ Sistema de Scouting - Ligas Amateur")
-st.markdown("---")
+@st.cache_resource
+def get_data_access():
+    # Una sola instancia por proceso: la caché se comparte entre sesiones
+    db = get_database()
+    db.start_compaction()
+    return CachedDataAccess(db, FORM_STATE_FILE)
 
-st.sidebar.title("📋 Menú")
-menu = st.sidebar.radio("Navegación:", ["🏠 Inicio", "➕ Registrar Jugador", "📊 Registrar Partido", "👥 Ver Jugadores", "📈 Estadísticas", "🎯 Rankings"])
+def table_filters(data, key, date_label):
+    # Filtros que se aplican en la base, no sobre un DataFrame completo
+    with st.expander("🔎 Filtros"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            teams = st.multiselect("Equipo", data.options('team'), key=f"{key}_team")
+        with col2:
+            leagues = st.multiselect("Liga", data.options('league'), key=f"{key}_league")
+        with col3:
+            positions = st.multiselect("Posición", data.options('position'), key=f"{key}_position")
+        with col4:
+            dates = st.date_input(date_label, value=[], key=f"{key}_dates")
+    filters = {'team': teams, 'league': leagues, 'position': positions}
+    if len(dates) == 2:
+        filters['date_from'], filters['date_to'] = (d.strftime('%Y-%m-%d') for d in dates)
+    return filters
 
-if menu == "🏠 Inicio":
-    col1, col2, col3 = st.columns(3)
-    players_df = pd.read_csv(PLAYERS_FILE)
-    matches_df = pd.read_csv(MATCHES_FILE)
+def paginated_table(data, key, kind, filters, columns, sort_labels, ascending=True):
+    # Solo la página visible se lee de la base y se envía al navegador
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
-        st.metric("👥 Jugadores", len(players_df))
+        sort = st.selectbox("Ordenar por", list(sort_labels), format_func=sort_labels.get, key=f"{key}_sort")
     with col2:
-        st.metric("⚽ Partidos", len(matches_df))
+        ascending = st.checkbox("Ascendente", value=ascending, key=f"{key}_ascending")
     with col3:
-        total_goals = int(matches_df['goals'].sum()) if len(matches_df) > 0 else 0
-        st.metric("🥅 Goles", total_goals)
+        page_size = st.selectbox("Filas por página", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    total = data.count(kind, filters)
+    n_pages = max(1, -(-total // page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = 1
+    page = st.number_input(f"Página (de {n_pages})", 1, n_pages, 1, key=f"{key}_page")
+    page_df = data.page(kind, filters, sort, ascending, page, page_size)
+    st.dataframe(page_df[columns].round(2), use_container_width=True)
+    st.caption(f"{total:,} filas · página {page} de {n_pages}")
+    return sort, ascending
+
+def prepare_export(db, kind, filters, sort, ascending, compress):
+    # El CSV se escribe por bloques en un archivo temporal; se borran los de
+    # más de una hora (sesiones que ya terminaron)
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        try:
+            if time.time() - os.path.getmtime(path) > 3600:
+                os.remove(path)
+        except FileNotFoundError:
+            pass  # Otra sesión lo borró primero
+    fd, path = tempfile.mkstemp(prefix=f"{kind}_", suffix='.csv.gz' if compress else '.csv', dir=EXPORT_DIR)
+    os.close(fd)
+    db.export_csv(kind, path, filters, sort, ascending, compress)
+    return path
+
+def export_section(data, key, kind, filters, sort, ascending, file_name):
+    # La exportación solo se genera al pedirla, con los filtros y el orden actuales
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        compress = st.checkbox("Comprimir (.gz)", key=f"{key}_gzip")
+    with col2:
+        if st.button("📦 Preparar exportación", key=f"{key}_export_button"):
+            previous = st.session_state.get(f"{key}_export")
+            if previous:
+                try:
+                    os.remove(previous)
+                except FileNotFoundError:
+                    pass
+            st.session_state[f"{key}_export"] = prepare_export(data.db, kind, filters, sort, ascending, compress)
+    path = st.session_state.get(f"{key}_export")
+    if path and os.path.exists(path):
+        compressed = path.endswith('.gz')
+        with open(path, 'rb') as f:
+            st.download_button("📥 Descargar CSV" + (" (.gz)" if compressed else ""), f, file_name + (".gz" if compressed else ""), "application/gzip" if compressed else "text/csv", key=f"{key}_download")
+
+def main():
+    st.set_page_config(page_title="Scouting Amateur", page_icon="⚽", layout="wide")
+    data = get_data_access()
+
+    st.title("⚽ Sistema de Scouting - Ligas Amateur")
     st.markdown("---")
-    st.info("### Bienvenido\n\n**Comienza por:**\n1. Registrar jugadores\n2. Agregar estadísticas\n3. Ver análisis")
 
-elif menu == "➕ Registrar Jugador":
-    st.subheader("Registrar Nuevo Jugador")
-    with st.form("player_form"):
-        col1, col2 = st.columns(2)
+    st.sidebar.title("📋 Menú")
+    menu = st.sidebar.radio("Navegación:", ["🏠 Inicio", "➕ Registrar Jugador", "📊 Registrar Partido", "👥 Ver Jugadores", "📈 Estadísticas", "🎯 Rankings"])
+    with st.sidebar.expander("⚙️ Caché de datos"):
+        st.dataframe(data.metrics(), use_container_width=True)
+
+    if menu == "🏠 Inicio":
+        col1, col2, col3 = st.columns(3)
+        summary = data.summary()
         with col1:
-            name = st.text_input("Nombre Completo *")
-            birth_date = st.date_input("Fecha de Nacimiento *")
-            position = st.selectbox("Posición *", ["Portero", "Defensa Central", "Lateral Derecho", "Lateral Izquierdo", "Mediocampista Defensivo", "Mediocampista Central", "Mediocampista Ofensivo", "Extremo Derecho", "Extremo Izquierdo", "Delantero Centro"])
-            team = st.text_input("Equipo *")
-            league = st.text_input("Liga *")
+            st.metric("👥 Jugadores", summary['players'])
         with col2:
-            height_cm = st.number_input("Altura (cm)", 150, 220, 175)
-            weight_kg = st.number_input("Peso (kg)", 50, 120, 70)
-            preferred_foot = st.selectbox("Pie Preferido", ["Derecho", "Izquierdo", "Ambidiestro"])
-            nationality = st.text_input("Nacionalidad", value="Colombia")
-            contact = st.text_input("Contacto")
-        notes = st.text_area("Notas")
-        submitted = st.form_submit_button("💾 Registrar")
-        if submitted and name and team and league:
-            players_df = pd.read_csv(PLAYERS_FILE)
-            if len(players_df) == 0:
-                player_id = 'P001'
-            else:
-                last_num = int(players_df['player_id'].iloc[-1][1:])
-                player_id = f'P{last_num + 1:03d}'
-            new_player = pd.DataFrame([{'player_id': player_id, 'name': name, 'birth_date': birth_date.strftime('%Y-%m-%d'), 'position': position, 'team': team, 'league': league, 'height_cm': height_cm, 'weight_kg': weight_kg, 'preferred_foot': preferred_foot, 'nationality': nationality, 'contact': contact, 'notes': notes, 'created_date': datetime.now().strftime('%Y-%m-%d')}])
-            players_df = pd.concat([players_df, new_player], ignore_index=True)
-            players_df.to_csv(PLAYERS_FILE, index=False)
-            st.success(f"✅ Jugador registrado: {player_id}")
-            st.balloons()
-
-elif menu == "📊 Registrar Partido":
-    st.subheader("Registrar Estadísticas de Partido")
-    players_df = pd.read_csv(PLAYERS_FILE)
-    if len(players_df) == 0:
-        st.warning("⚠️ No hay jugadores registrados")
-    else:
-        with st.form("match_form"):
-            player_options = {f"{row['name']} ({row['team']})": row['player_id'] for _, row in players_df.iterrows()}
-            selected = st.selectbox("Jugador *", list(player_options.keys()))
-            player_id = player_options[selected]
-            player_name = selected.split(" (")[0]
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                match_date = st.date_input("Fecha *")
-            with col2:
-                opponent = st.text_input("Rival *")
-            with col3:
-                minutes = st.number_input("Minutos", 0, 120, 90)
-            rating = st.slider("Rating (1-10)", 1, 10, 7)
-            st.markdown("### Estadísticas")
-            col1, col2, col3, col4 = st.columns(4)
+            st.metric("⚽ Partidos", summary['matches'])
+        with col3:
+            st.metric("🥅 Goles", summary['goals'])
+        st.markdown("---")
+        st.info("### Bienvenido\n\n**Comienza por:**\n1. Registrar jugadores\n2. Agregar estadísticas\n3. Ver análisis")
+
+    elif menu == "➕ Registrar Jugador":
+        st.subheader("Registrar Nuevo Jugador")
+        with st.form("player_form"):
+            col1, col2 = st.columns(2)
             with col1:
-                goals = st.number_input("Goles", 0, 10, 0)
-                assists = st.number_input("Asistencias", 0, 10, 0)
+                name = st.text_input("Nombre Completo *")
+                birth_date = st.date_input("Fecha de Nacimiento *")
+                position = st.selectbox("Posición *", ["Portero", "Defensa Central", "Lateral Derecho", "Lateral Izquierdo", "Mediocampista Defensivo", "Mediocampista Central", "Mediocampista Ofensivo", "Extremo Derecho", "Extremo Izquierdo", "Delantero Centro"])
+                team = st.text_input("Equipo *")
+                league = st.text_input("Liga *")
             with col2:
-                shots = st.number_input("Tiros", 0, 20, 0)
-                shots_target = st.number_input("Al arco", 0, 20, 0)
-            with col3:
-                key_passes = st.number_input("Pases clave", 0, 20, 0)
-                dribbles = st.number_input("Regates", 0, 20, 0)
-            with col4:
-                tackles = st.number_input("Tackles", 0, 20, 0)
-                interceptions = st.number_input("Intercepciones", 0, 20, 0)
-            notes = st.text_area("Observaciones")
-            submitted = st.form_submit_button("💾 Guardar")
-            if submitted and opponent:
-                matches_df = pd.read_csv(MATCHES_FILE)
-                if len(matches_df) == 0:
-                    match_id = 'M001'
-                else:
-                    last_num = int(matches_df['match_id'].iloc[-1][1:])
-                    match_id = f'M{last_num + 1:03d}'
-                new_match = pd.DataFrame([{'match_id': match_id, 'player_id': player_id, 'player_name': player_name, 'match_date': match_date.strftime('%Y-%m-%d'), 'opponent': opponent, 'minutes_played': minutes, 'goals': goals, 'assists': assists, 'shots': shots, 'shots_on_target': shots_target, 'key_passes': key_passes, 'successful_dribbles': dribbles, 'tackles': tackles, 'interceptions': interceptions, 'clearances': 0, 'fouls_committed': 0, 'fouls_received': 0, 'yellow_cards': 0, 'red_cards': 0, 'rating_1_10': rating, 'scout_notes': notes, 'video_url': ''}])
-                matches_df = pd.concat([matches_df, new_match], ignore_index=True)
-                matches_df.to_csv(MATCHES_FILE, index=False)
-                st.success(f"✅ Estadísticas guardadas: {match_id}")
+                height_cm = st.number_input("Altura (cm)", 150, 220, 175)
+                weight_kg = st.number_input("Peso (kg)", 50, 120, 70)
+                preferred_foot = st.selectbox("Pie Preferido", ["Derecho", "Izquierdo", "Ambidiestro"])
+                nationality = st.text_input("Nacionalidad", value="Colombia")
+                contact = st.text_input("Contacto")
+            notes = st.text_area("Notas")
+            submitted = st.form_submit_button("💾 Registrar")
+            if submitted and name and team and league:
+                player_id = data.add_player({'name': name, 'birth_date': birth_date.strftime('%Y-%m-%d'), 'position': position, 'team': team, 'league': league, 'height_cm': height_cm, 'weight_kg': weight_kg, 'preferred_foot': preferred_foot, 'nationality': nationality, 'contact': contact, 'notes': notes, 'created_date': datetime.now().strftime('%Y-%m-%d')})
+                st.success(f"✅ Jugador registrado: {player_id}")
                 st.balloons()
 
-elif menu == "👥 Ver Jugadores":
-    st.subheader("Base de Datos de Jugadores")
-    players_df = pd.read_csv(PLAYERS_FILE)
-    if len(players_df) == 0:
-        st.info("No hay jugadores registrados")
-    else:
-        st.dataframe(players_df[['player_id', 'name', 'position', 'team', 'league']], use_container_width=True)
-        csv = players_df.to_csv(index=False).encode('utf-8')
-        st.download_button("📥 Exportar CSV", csv, "jugadores.csv", "text/csv")
-
-elif menu == "📈 Estadísticas":
-    st.subheader("Estadísticas Agregadas")
-    matches_df = pd.read_csv(MATCHES_FILE)
-    if len(matches_df) == 0:
-        st.info("No hay estadísticas disponibles")
-    else:
-        numeric_cols = ['goals', 'assists', 'shots', 'rating_1_10', 'minutes_played']
-        for col in numeric_cols:
-            matches_df[col] = pd.to_numeric(matches_df[col], errors='coerce').fillna(0)
-        stats = matches_df.groupby('player_id').agg({'match_date': 'count', 'goals': 'sum', 'assists': 'sum', 'shots': 'sum', 'minutes_played': 'sum', 'rating_1_10': 'mean'}).reset_index()
-        stats.columns = ['player_id', 'partidos', 'goles', 'asistencias', 'tiros', 'minutos', 'rating_promedio']
-        players_df = pd.read_csv(PLAYERS_FILE)
-        stats = stats.merge(players_df[['player_id', 'name', 'team']], on='player_id')
-        st.dataframe(stats[['name', 'team', 'partidos', 'goles', 'asistencias', 'rating_promedio']].round(2), use_container_width=True)
-        csv = stats.to_csv(index=False).encode('utf-8')
-        st.download_button("📥 Exportar CSV", csv, "estadisticas.csv", "text/csv")
-
-elif menu == "🎯 Rankings":
-    st.subheader("Rankings")
-    matches_df = pd.read_csv(MATCHES_FILE)
-    if len(matches_df) == 0:
-        st.info("No hay datos para rankings")
-    else:
-        numeric_cols = ['goals', 'assists', 'rating_1_10']
-        for col in numeric_cols:
-            matches_df[col] = pd.to_numeric(matches_df[col], errors='coerce').fillna(0)
-        stats = matches_df.groupby('player_id').agg({'match_date': 'count', 'goals': 'sum', 'assists': 'sum', 'rating_1_10': 'mean'}).reset_index()
-        stats.columns = ['player_id', 'partidos', 'goles', 'asistencias', 'rating']
-        players_df = pd.read_csv(PLAYERS_FILE)
-        stats = stats.merge(players_df[['player_id', 'name', 'team']], on='player_id')
-        tab1, tab2, tab3 = st.tabs(["⚽ Goleadores", "🎯 Asistentes", "⭐ Rating"])
-        with tab1:
-            st.markdown("### Top 10 Goleadores")
-            top_scorers = stats.nlargest(10, 'goles')
-            st.dataframe(top_scorers[['name', 'team', 'goles', 'partidos']], use_container_width=True)
-        with tab2:
-            st.markdown("### Top 10 Asistentes")
-            top_assists = stats.nlargest(10, 'asistencias')
-            st.dataframe(top_assists[['name', 'team', 'asistencias', 'partidos']], use_container_width=True)
-        with tab3:
-            st.markdown("### Top 10 Mejor Rating")
-            top_rated = stats.nlargest(10, 'rating')
-            st.dataframe(top_rated[['name', 'team', 'rating', 'partidos']].round(2), use_container_width=True)
-
-st.markdown("---")
-st.markdown("⚽ **Sistema de Scouting Amateur**")
\ No newline at end of file
+    elif menu == "📊 Registrar Partido":
+        st.subheader("Registrar Estadísticas de Partido")
+        query = st.text_input("🔍 Buscar jugador", placeholder="Nombre, equipo o liga")
+        results = data.search_players(query, 20)
+        if data.summary()['players'] == 0:
+            st.warning("⚠️ No hay jugadores registrados")
+        elif not results:
+            st.warning("⚠️ Ningún jugador coincide con la búsqueda")
+        else:
+            with st.form("match_form"):
+                player_options = {f"{p['name']} ({p['team']}) · {p['player_id']}": p for p in results}
+                selected = st.selectbox("Jugador *", list(player_options.keys()))
+                player_id = player_options[selected]['player_id']
+                player_name = player_options[selected]['name']
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    match_date = st.date_input("Fecha *")
+                with col2:
+                    opponent = st.text_input("Rival *")
+                with col3:
+                    minutes = st.number_input("Minutos", 0, 120, 90)
+                rating = st.slider("Rating (1-10)", 1, 10, 7)
+                st.markdown("### Estadísticas")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    goals = st.number_input("Goles", 0, 10, 0)
+                    assists = st.number_input("Asistencias", 0, 10, 0)
+                with col2:
+                    shots = st.number_input("Tiros", 0, 20, 0)
+                    shots_target = st.number_input("Al arco", 0, 20, 0)
+                with col3:
+                    key_passes = st.number_input("Pases clave", 0, 20, 0)
+                    dribbles = st.number_input("Regates", 0, 20, 0)
+                with col4:
+                    tackles = st.number_input("Tackles", 0, 20, 0)
+                    interceptions = st.number_input("Intercepciones", 0, 20, 0)
+                notes = st.text_area("Observaciones")
+                submitted = st.form_submit_button("💾 Guardar")
+                if submitted and opponent:
+                    match_id = data.add_match_stats({'player_id': player_id, 'player_name': player_name, 'match_date': match_date.strftime('%Y-%m-%d'), 'opponent': opponent, 'minutes_played': minutes, 'goals': goals, 'assists': assists, 'shots': shots, 'shots_on_target': shots_target, 'key_passes': key_passes, 'successful_dribbles': dribbles, 'tackles': tackles, 'interceptions': interceptions, 'clearances': 0, 'fouls_committed': 0, 'fouls_received': 0, 'yellow_cards': 0, 'red_cards': 0, 'rating_1_10': rating, 'scout_notes': notes, 'video_url': ''})
+                    st.success(f"✅ Estadísticas guardadas: {match_id}")
+                    st.balloons()
+
+    elif menu == "👥 Ver Jugadores":
+        st.subheader("Base de Datos de Jugadores")
+        if data.summary()['players'] == 0:
+            st.info("No hay jugadores registrados")
+        else:
+            filters = table_filters(data, "players", "Fecha de alta")
+            sort, ascending = paginated_table(data, "players", "players", filters, ['player_id', 'name', 'position', 'team', 'league'], {'player_id': 'ID', 'name': 'Nombre', 'team': 'Equipo', 'league': 'Liga', 'position': 'Posición', 'created_date': 'Fecha de alta'})
+            export_section(data, "players", "players", filters, sort, ascending, "jugadores.csv")
+
+    elif menu == "📈 Estadísticas":
+        st.subheader("Estadísticas Agregadas")
+        if data.summary()['matches'] == 0:
+            st.info("No hay estadísticas disponibles")
+        else:
+            filters = table_filters(data, "stats", "Fecha del partido")
+            sort, ascending = paginated_table(data, "stats", "stats", filters, ['name', 'team', 'partidos', 'goles', 'asistencias', 'goles_90', 'rating_promedio'], {'goles': 'Goles', 'asistencias': 'Asistencias', 'partidos': 'Partidos', 'minutos': 'Minutos', 'goles_90': 'Goles/90', 'rating_promedio': 'Rating', 'name': 'Nombre', 'team': 'Equipo'}, ascending=False)
+            export_section(data, "stats", "stats", filters, sort, ascending, "estadisticas.csv")
+
+    elif menu == "🎯 Rankings":
+        st.subheader("Rankings")
+        if data.summary()['matches'] == 0:
+            st.info("No hay datos para rankings")
+        else:
+            tab1, tab2, tab3, tab4 = st.tabs(["⚽ Goleadores", "🎯 Asistentes", "⭐ Rating", "📈 Forma"])
+            with tab1:
+                st.markdown("### Top 10 Goleadores")
+                top_scorers = data.top_players('goals', 10)
+                st.dataframe(top_scorers[['name', 'team', 'goles', 'partidos']], use_container_width=True)
+            with tab2:
+                st.markdown("### Top 10 Asistentes")
+                top_assists = data.top_players('assists', 10)
+                st.dataframe(top_assists[['name', 'team', 'asistencias', 'partidos']], use_container_width=True)
+            with tab3:
+                st.markdown("### Top 10 Mejor Rating")
+                top_rated = data.top_players('rating_avg', 10).rename(columns={'rating_promedio': 'rating'})
+                st.dataframe(top_rated[['name', 'team', 'rating', 'partidos']].round(2), use_container_width=True)
+            with tab4:
+                st.markdown("### Mejor Momento (últimos 5 vs. promedio)")
+                trend = data.trend_ranking('rating_1_10', top_n=10, min_matches=3)
+                trend = trend.merge(data.players(['player_id', 'name', 'team']), on='player_id')
+                st.dataframe(trend[['name', 'team', 'rating_1_10_last5', 'rating_1_10_decay', 'rating_1_10_avg', 'trend', 'matches']].round(2), use_container_width=True)
+
+    st.markdown("---")
+    st.markdown("⚽ **Sistema de Scouting Amateur**")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Prueba de carga de escrituras concurrentes en la base amateur
+
+Varios procesos (como varias instancias del servidor) con varios hilos cada
+uno (como varias sesiones de Streamlit) registran jugadores y partidos a la
+vez, con la compactación del WAL en segundo plano. Al final se comprueba que
+no hay IDs repetidos ni escrituras perdidas y que los agregados coinciden
+con los partidos.
+
+Uso:
+    python -m benchmarks.bench_amateur_writes
+    python -m benchmarks.bench_amateur_writes --processes 8 --threads 8 --writes 500
+    python -m benchmarks.bench_amateur_writes --pause-ms 20   # ritmo más realista
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from src.amateur.database import AmateurPlayerDatabase
+
+
+def _writer(job):
+    """Un proceso: `threads` hilos que escriben `writes` partidos cada uno"""
+    db_path, worker, threads, writes, pause, seed = job
+    db = AmateurPlayerDatabase(db_path)
+    db.start_compaction(interval=0.5)
+    player_ids = db.get_players(['player_id'])['player_id'].tolist()
+    results = {'match_ids': [], 'player_ids': [], 'latencies': []}
+    lock = threading.Lock()
+
+    def run(thread):
+        rng = random.Random(seed * 1000 + thread)
+        match_ids, new_players, latencies = [], [], []
+        for i in range(writes):
+            start = time.perf_counter()
+            # Uno de cada 20 guardados es un jugador nuevo (formulario de alta)
+            if i % 20 == 0:
+                new_players.append(db.add_player({
+                    'name': f'Jugador {worker}-{thread}-{i}', 'team': f'Equipo {i % 12}',
+                    'league': 'Liga de prueba',
+                }))
+            else:
+                match_ids.append(db.add_match_stats({
+                    'player_id': rng.choice(player_ids),
+                    'match_date': f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                    'opponent': 'Rival', 'minutes_played': rng.randint(1, 90),
+                    'goals': rng.randint(0, 3), 'assists': rng.randint(0, 2),
+                    'shots': rng.randint(0, 6), 'rating_1_10': rng.randint(1, 10),
+                }))
+            latencies.append(time.perf_counter() - start)
+            if pause:
+                time.sleep(pause)
+        db.close()
+        with lock:
+            results['match_ids'].extend(match_ids)
+            results['player_ids'].extend(new_players)
+            results['latencies'].extend(latencies)
+
+    workers = [threading.Thread(target=run, args=(thread,)) for thread in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return results
+
+
+def verify(db, results, n_players_before):
+    """Comprueba IDs únicos, que no se perdió nada y que los agregados cuadran"""
+    match_ids = [i for result in results for i in result['match_ids']]
+    player_ids = [i for result in results for i in result['player_ids']]
+
+    matches = db.get_matches(columns=['match_id', 'player_id', 'goals', 'minutes_played'])
+    players = db.get_players(['player_id'])
+    stats = db.player_stats().set_index('player_id')
+    expected = matches.groupby('player_id').agg(
+        partidos=('match_id', 'count'), goles=('goals', 'sum'), minutos=('minutes_played', 'sum')
+    )
+    stats = stats.loc[expected.index]
+
+    checks = {
+        'IDs de partido únicos': len(set(match_ids)) == len(match_ids),
+        'IDs de jugador únicos': len(set(player_ids)) == len(player_ids),
+        'Ningún partido perdido': len(matches) == len(match_ids),
+        'Ningún jugador perdido': len(players) == n_players_before + len(player_ids),
+        'Agregados = partidos': bool(
+            (stats['partidos'] == expected['partidos']).all()
+            and (stats['goles'] == expected['goles']).all()
+            and (stats['minutos'] == expected['minutos']).all()
+        ),
+    }
+    for name, ok in checks.items():
+        print(f"   {'✓' if ok else '❌'} {name}")
+    return all(checks.values())
+
+
+def run(processes, threads, writes, n_players, pause_ms=0):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'scouting.db')
+        db = AmateurPlayerDatabase(db_path)
+        for i in range(n_players):
+            db.add_player({'name': f'Jugador base {i}', 'team': f'Equipo {i % 12}', 'league': 'Liga'})
+
+        jobs = [(db_path, worker, threads, writes, pause_ms / 1000, worker)
+                for worker in range(processes)]
+        start = time.perf_counter()
+        with Pool(processes) as pool:
+            results = pool.map(_writer, jobs)
+        elapsed = time.perf_counter() - start
+
+        latencies = np.array([t for result in results for t in result['latencies']]) * 1000
+        total = len(latencies)
+
+        print("=" * 70)
+        print(f"⏱️  PRUEBA DE CARGA: {processes} procesos x {threads} hilos x {writes} guardados")
+        print("=" * 70)
+        print(f"Guardados: {total:,} en {elapsed:.2f}s ({total / elapsed:,.0f}/s)")
+        print(f"Latencia (ms): p50 {np.percentile(latencies, 50):.2f}  "
+              f"p95 {np.percentile(latencies, 95):.2f}  p99 {np.percentile(latencies, 99):.2f}  "
+              f"máx {latencies.max():.2f}")
+        print(f"WAL al terminar: {db.wal_size() / 1024:.0f} KB")
+        db.checkpoint('TRUNCATE')
+        print(f"WAL después de compactar: {db.wal_size() / 1024:.0f} KB\n")
+
+        ok = verify(db, results, n_players)
+        db.close()
+        print(f"\n{'✅ Sin conflictos' if ok else '❌ Se detectaron inconsistencias'}")
+        return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200, help='Guardados por hilo')
+    parser.add_argument('--players', type=int, default=200, help='Jugadores iniciales')
+    parser.add_argument('--pause-ms', type=float, default=0,
+                        help='Pausa entre guardados de un hilo (0 = sin pausa, carga máxima)')
+    args = parser.parse_args()
+
+    run(args.processes, args.threads, args.writes, args.players, args.pause_ms)
@@ -0,0 +1,121 @@
+"""
+Prueba del crawler contra un servidor HTTP local (sin tocar FBref)
+
+Genera páginas con la estructura de FBref en las mismas rutas que build_url,
+las sirve con http.server y recorre todas con ConcurrentCrawler apuntando
+base_url al servidor. Con --flaky la primera petición a cada página responde
+503 con Retry-After para ejercitar los reintentos. Termina con código 1 si
+falta alguna tabla o alguna tiene un número de jugadores distinto.
+
+Uso:
+    python -m benchmarks.bench_crawler
+    python -m benchmarks.bench_crawler --players 500 --workers 8 --flaky
+"""
+import argparse
+import functools
+import os
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic import make_fbref_page
+from src.data_collection.crawler import ConcurrentCrawler, build_jobs
+from src.data_collection.data_collector import LEAGUES, STAT_PAGES, PlayerDataCollector
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    """Sirve las páginas guardadas y cuenta las peticiones"""
+
+    def __init__(self, *args, state, **kwargs):
+        self.state = state
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.state['lock']:
+            self.state['requests'] += 1
+            first = self.path not in self.state['seen']
+            self.state['seen'].add(self.path)
+        if first and self.state['flaky']:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+def write_site(root, leagues, stat_types, n_players):
+    """Páginas sintéticas en las rutas de build_url (la primera tabla visible, el resto comentadas)"""
+    for league in leagues:
+        for stat_type in stat_types:
+            directory = os.path.join(root, 'en', 'comps', str(LEAGUES[league]), STAT_PAGES[stat_type])
+            os.makedirs(directory, exist_ok=True)
+            page = make_fbref_page(n_players, stat_type, commented=stat_type != 'standard',
+                                   filler_blocks=200, seed=LEAGUES[league])
+            with open(os.path.join(directory, f'{league}-Stats'), 'w', encoding='utf-8') as f:
+                f.write(page)
+
+
+def start_server(root, flaky=False):
+    """Servidor en un puerto libre; devuelve (servidor, base_url, estado)"""
+    state = {'lock': threading.Lock(), 'requests': 0, 'seen': set(), 'flaky': flaky}
+    handler = functools.partial(_Handler, state=state, directory=root)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}', state
+
+
+def run(leagues, stat_types, n_players, workers, flaky=False):
+    with tempfile.TemporaryDirectory() as root:
+        write_site(root, leagues, stat_types, n_players)
+        server, base_url, state = start_server(root, flaky)
+        try:
+            crawler = ConcurrentCrawler(PlayerDataCollector(base_url=base_url),
+                                        max_workers=workers, rate=50, burst=workers)
+            jobs = build_jobs(leagues, stat_types)
+
+            start = time.perf_counter()
+            results = crawler.crawl(jobs)
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print("=" * 70)
+    print(f"⏱️  CRAWLER LOCAL: {len(jobs)} páginas, {workers} hilos"
+          f"{' (503 en la primera petición)' if flaky else ''}")
+    print("=" * 70)
+    print(f"Tiempo: {elapsed:.2f}s  Peticiones: {state['requests']}\n")
+
+    checks = {
+        'Todas las tablas descargadas': not crawler.errors and len(results) == len(jobs),
+        f'{n_players} jugadores por tabla': all(len(df) == n_players for df in results.values()),
+        'Un reintento por página' if flaky else 'Una petición por página':
+            state['requests'] == len(jobs) * (2 if flaky else 1),
+    }
+    for name, ok in checks.items():
+        print(f"   {'✓' if ok else '❌'} {name}")
+    for job, error in crawler.errors.items():
+        print(f"   ❌ {job[0]} / {job[1]}: {error}")
+
+    ok = all(checks.values())
+    print(f"\n{'✅ Crawler OK' if ok else '❌ El crawler falló contra el servidor local'}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--leagues', nargs='+', default=['La-Liga', 'Premier-League'])
+    parser.add_argument('--stat-types', nargs='+', default=['standard', 'shooting', 'passing'])
+    parser.add_argument('--players', type=int, default=200, help='Jugadores por tabla')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--flaky', action='store_true',
+                        help='Responde 503 a la primera petición de cada página')
+    args = parser.parse_args()
+
+    ok = run(args.leagues, args.stat_types, args.players, args.workers, args.flaky)
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,81 @@
+"""
+Benchmark de extracción de tablas: BeautifulSoup + read_html vs. lxml en una pasada
+
+Uso:
+    python -m benchmarks.bench_parsing
+    python -m benchmarks.bench_parsing --corpus data/cache/http --stat-type standard
+"""
+import argparse
+import glob
+import gzip
+import os
+import time
+
+from benchmarks.synthetic import make_fbref_page
+from src.data_collection.data_collector import PlayerDataCollector
+from src.data_collection.table_parser import extract_stats_table
+
+
+def load_corpus(directory):
+    """Páginas guardadas (.html o .html.gz, p. ej. la caché HTTP)"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html*'))):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def synthetic_corpus(n_pages, n_players):
+    """Mitad de las páginas con la tabla visible y mitad dentro de un comentario"""
+    return [
+        make_fbref_page(n_players, commented=i % 2 == 1, seed=i).encode('utf-8')
+        for i in range(n_pages)
+    ]
+
+
+def run(pages, stat_type):
+    collector = PlayerDataCollector()
+
+    start = time.perf_counter()
+    legacy = [collector._parse_stats_table_bs4(page, stat_type) for page in pages]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [extract_stats_table(page, stat_type) for page in pages]
+    fast_time = time.perf_counter() - start
+
+    # Mismo resultado una vez eliminadas las filas de encabezado repetidas
+    for old, new in zip(legacy, fast):
+        if old is None or new is None:
+            if old is not new:
+                raise AssertionError("Un método encontró la tabla y el otro no")
+            continue
+        old = collector.clean_player_data(old).reset_index(drop=True)
+        new = collector.clean_player_data(new).reset_index(drop=True)
+        if list(old.columns) != list(new.columns) or len(old) != len(new):
+            raise AssertionError("Las tablas extraídas no coinciden")
+
+    size_mb = sum(len(page) for page in pages) / 1024 ** 2
+    print("=" * 70)
+    print(f"⏱️  BENCHMARK: extracción de stats_{stat_type} ({len(pages)} páginas, {size_mb:.1f} MB)")
+    print("=" * 70)
+    print(f"BeautifulSoup + read_html: {legacy_time:8.3f}s ({legacy_time / len(pages) * 1000:.1f} ms/página)")
+    print(f"lxml una pasada:           {fast_time:8.3f}s ({fast_time / len(pages) * 1000:.1f} ms/página)")
+    print(f"Speedup: {legacy_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='Carpeta con páginas guardadas (.html/.html.gz)')
+    parser.add_argument('--stat-type', default='standard')
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--players', type=int, default=600)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages, args.players)
+    if not pages:
+        print(f"❌ No se encontraron páginas en {args.corpus}")
+    else:
+        run(pages, args.stat_type)
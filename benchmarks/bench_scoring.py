@@ -0,0 +1,84 @@
+"""
+Benchmark del cálculo de Overall_Score: apply fila por fila vs. vectorizado
+
+Uso:
+    python -m benchmarks.bench_scoring
+    python -m benchmarks.bench_scoring --sizes 10000 100000 --legacy-max-rows 20000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_players
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+
+
+def prepare_frame(scorer, n_rows):
+    """Ejecuta el pipeline hasta la normalización (común a ambos métodos)"""
+    df = make_players(n_rows)
+    df['Position_Category'] = scorer.classify_positions(df['Pos'])
+    df = scorer.calculate_per_90_stats(df)
+    metric_cols = [m for weights in scorer.position_weights.values() for m in weights]
+    return scorer.normalize_stats(df, sorted(set(metric_cols)))
+
+
+def time_legacy(scorer, df):
+    """Scoring original con df.apply(axis=1)"""
+    start = time.perf_counter()
+    scores = df.apply(
+        lambda row: scorer.calculate_position_score(row, row['Position_Category']),
+        axis=1
+    )
+    return time.perf_counter() - start, scores
+
+
+def time_vectorized(scorer, df):
+    """Scoring con un producto matricial por posición"""
+    start = time.perf_counter()
+    scores = scorer.calculate_position_scores(df)
+    return time.perf_counter() - start, scores
+
+
+def run(sizes, legacy_max_rows):
+    scorer = AdvancedPlayerScorer()
+
+    print("=" * 70)
+    print("⏱️  BENCHMARK: Overall_Score (apply vs. vectorizado)")
+    print("=" * 70)
+    print(f"{'Filas':>10} {'apply (s)':>14} {'vectorizado (s)':>16} {'speedup':>10}")
+
+    for n_rows in sizes:
+        df = prepare_frame(scorer, n_rows)
+        vec_time, vec_scores = time_vectorized(scorer, df)
+
+        # El método original es demasiado lento para tamaños grandes:
+        # se mide sobre una muestra y se extrapola linealmente
+        sample_rows = min(n_rows, legacy_max_rows)
+        sample = df.iloc[:sample_rows]
+        legacy_time, legacy_scores = time_legacy(scorer, sample)
+        estimated = sample_rows < n_rows
+        if estimated:
+            legacy_time *= n_rows / sample_rows
+
+        if not np.allclose(legacy_scores.to_numpy(dtype=float),
+                           vec_scores.iloc[:sample_rows].to_numpy()):
+            raise AssertionError(f"Los scores no coinciden para {n_rows} filas")
+
+        legacy_label = f"{legacy_time:.3f}{'*' if estimated else ''}"
+        print(f"{n_rows:>10,} {legacy_label:>14} {vec_time:>16.4f} "
+              f"{legacy_time / vec_time:>9.0f}x")
+
+    print("\n* estimado a partir de una muestra de "
+          f"{legacy_max_rows:,} filas (--legacy-max-rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    run(args.sizes, args.legacy_max_rows)
@@ -0,0 +1,71 @@
+"""
+Benchmark de almacenamiento del DataFrame puntuado: CSV vs. formato compacto
+
+Uso:
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --rows 500000 --full-output
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_players
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+from src.analysis.compact_storage import compact_frame, load_scored, memory_mb, save_scored
+
+# Columnas típicas de un informe (proyección)
+REPORT_COLUMNS = ['Player', 'Squad', 'Position_Category', 'Overall_Score', 'Rank']
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def run(n_rows, full_output):
+    scorer = AdvancedPlayerScorer()
+    df_scored = scorer.score_players(make_players(n_rows), full_output=full_output)
+    compact = compact_frame(df_scored)
+
+    print("=" * 70)
+    print(f"⏱️  BENCHMARK: almacenamiento ({n_rows:,} filas, {df_scored.shape[1]} columnas)")
+    print("=" * 70)
+    print(f"Memoria en pandas: {memory_mb(df_scored):.1f} MB -> {memory_mb(compact):.1f} MB "
+          f"({memory_mb(df_scored) / memory_mb(compact):.1f}x)\n")
+
+    print(f"{'Formato':>18} {'Disco (MB)':>11} {'Carga (s)':>10} {'Proyección (s)':>15} "
+          f"{'Memoria (MB)':>13}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        variants = [
+            ('CSV', 'scored.csv', False),
+            ('CSV compacto', 'scored_compact.csv', True),
+            ('Parquet', 'scored.parquet', True),
+            ('Feather', 'scored.feather', True),
+        ]
+        for label, filename, compact_output in variants:
+            path = os.path.join(tmp_dir, filename)
+            try:
+                save_scored(df_scored, path, compact=compact_output)
+            except ImportError as error:
+                print(f"{label:>18} ⚠️  {error}")
+                continue
+
+            # El CSV pierde los tipos: en modo compacto se reducen al leer
+            load_time, loaded = timed(load_scored, path, compact=label == 'CSV compacto')
+            projection_time, _ = timed(load_scored, path, columns=REPORT_COLUMNS)
+            print(f"{label:>18} {os.path.getsize(path) / 1024 ** 2:>11.1f} {load_time:>10.3f} "
+                  f"{projection_time:>15.3f} {memory_mb(loaded):>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--full-output', action='store_true',
+                        help='Usa la salida ancha (todas las columnas numéricas)')
+    args = parser.parse_args()
+
+    run(args.rows, args.full_output)
@@ -0,0 +1,102 @@
+"""
+Generador de datos sintéticos de jugadores para benchmarks
+"""
+import numpy as np
+import pandas as pd
+
+POSITIONS = ['FW', 'MF', 'DF', 'GK', 'FW,MF', 'DF,MF', 'MF,FW', 'MF,DF', 'DF,FW']
+
+METRICS = [
+    'goals', 'assists', 'shots', 'shot_on_target', 'key_passes',
+    'dribbles_successful', 'aerial_duels_won', 'offsides', 'pass_accuracy',
+    'progressive_passes', 'tackles', 'interceptions', 'clearances', 'blocks',
+    'errors_leading_to_shot', 'saves', 'clean_sheets', 'save_percentage',
+    'goals_against', 'distribution_accuracy'
+]
+
+
+def make_players(n_rows, seed=42):
+    """
+    Crea un DataFrame con el formato que espera AdvancedPlayerScorer
+
+    Args:
+        n_rows: Número de filas (jugador-temporada)
+        seed: Semilla para reproducibilidad
+
+    Returns:
+        DataFrame con columnas de identidad, minutos y métricas
+    """
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame({
+        'Player': [f'Jugador {i}' for i in range(n_rows)],
+        'Pos': rng.choice(POSITIONS, n_rows),
+        'Squad': rng.choice([f'Equipo {i}' for i in range(40)], n_rows),
+        'Age': rng.integers(16, 40, n_rows),
+        'Min': rng.integers(0, 3420, n_rows),
+    })
+
+    for metric in METRICS:
+        df[metric] = rng.poisson(rng.uniform(0.5, 30), n_rows).astype(float)
+
+    # Algunos valores faltantes, como en los datos reales
+    missing = rng.random(n_rows) < 0.02
+    df.loc[missing, 'key_passes'] = np.nan
+
+    return df
+
+
+def make_fbref_page(n_players, stat_type='standard', commented=False, filler_blocks=2000,
+                    seed=42):
+    """
+    Crea una página HTML con la estructura de las tablas de FBref
+
+    Incluye encabezado de dos niveles, filas de encabezado repetidas, minutos
+    con separador de miles y, con commented=True, la tabla dentro de un
+    comentario HTML (como hace FBref con casi todas las tablas salvo la primera).
+    """
+    rng = np.random.default_rng(seed)
+
+    groups = [('', ['Rk', 'Player', 'Nation', 'Pos', 'Squad', 'Age', 'Born']),
+              ('Playing Time', ['MP', 'Min']),
+              ('Performance', ['Gls', 'Ast', 'CrdY']),
+              ('Per 90 Minutes', ['Gls', 'Ast'])]
+    columns = [name for _, names in groups for name in names]
+
+    over_header = ''.join(
+        f'<th colspan="{len(names)}">{group}</th>' if group
+        else f'<th colspan="{len(names)}"></th>'
+        for group, names in groups
+    )
+    header = ''.join(f'<th>{name}</th>' for name in columns)
+
+    rows = []
+    for i in range(n_players):
+        if i and i % 25 == 0:
+            rows.append(f'<tr class="thead">{header}</tr>')
+        minutes = int(rng.integers(0, 3420))
+        goals, assists = int(rng.integers(0, 25)), int(rng.integers(0, 15))
+        nineties = max(minutes / 90, 0.1)
+        cells = [
+            f'<td><a href="/en/players/{i:08x}/">Jugador {i}</a></td>',
+            f'<td><span>es</span> ESP</td>',
+            f'<td>{rng.choice(POSITIONS)}</td>',
+            f'<td><a href="/en/squads/{i % 20}/">Equipo {i % 20}</a></td>',
+            f'<td>{rng.integers(17, 38)}-{rng.integers(0, 365):03d}</td>',
+            f'<td>{rng.integers(1985, 2007)}</td>',
+            f'<td>{rng.integers(0, 38)}</td>',
+            f'<td>{minutes:,}</td>',
+            f'<td>{goals}</td><td>{assists}</td><td>{rng.integers(0, 12)}</td>',
+            f'<td>{goals / nineties:.2f}</td><td>{assists / nineties:.2f}</td>',
+        ]
+        rows.append(f'<tr><th>{i + 1}</th>{"".join(cells)}</tr>')
+
+    table = (f'<table class="stats_table" id="stats_{stat_type}">'
+             f'<thead><tr class="over_header">{over_header}</tr><tr>{header}</tr></thead>'
+             f'<tbody>{"".join(rows)}</tbody></table>')
+    if commented:
+        table = f'<div id="all_stats_{stat_type}"><!--\n{table}\n--></div>'
+
+    filler = '<div class="section">' + '<p><a href="#">texto</a> de relleno</p>' * filler_blocks + '</div>'
+    squads = f'<table id="stats_squads_{stat_type}_for"><tr><td>Equipo</td></tr></table>'
+    return f'<html><head><title>FBref</title></head><body>{filler}{squads}{table}{filler}</body></html>'
@@ -280,13 +280,14 @@ def import_from_excel(players_file=None, matches_file=None):
     Función helper para importar datos desde Excel al sistema
     """
     try:
-        from amateur_data_entry import AmateurPlayerDatabase
+        from amateur_data_entry import get_database
     except ImportError:
         print("❌ Error: No se encuentra amateur_data_entry.py")
         print("   Asegúrate de tener todos los archivos del sistema")
         return
     
-    db = AmateurPlayerDatabase()
+    # Igual que la app: si es la primera vez, migra antes los CSV anteriores
+    db = get_database()
     
     print("="*60)
     print("📥 IMPORTANDO DATOS DESDE EXCEL")
@@ -12,8 +12,11 @@ def create_directory_structure():
         'data/raw',
         'data/processed',
         'data/amateur',
+        'data/cache',
+        'data/lake',
         'src/data_collection',
         'src/analysis',
+        'src/amateur',
         'src/scoring',
         'src/visualization',
         'notebooks',
@@ -28,7 +31,7 @@ def create_directory_structure():
         print(f"  ✓ {directory}")
     
     # Crear archivos __init__.py
-    init_dirs = ['src', 'src/data_collection', 'src/analysis', 'src/scoring', 'src/visualization']
+    init_dirs = ['src', 'src/data_collection', 'src/analysis', 'src/amateur', 'src/scoring', 'src/visualization']
     for directory in init_dirs:
         init_file = os.path.join(directory, '__init__.py')
         if not os.path.exists(init_file):
@@ -122,6 +125,7 @@ ENV/
 data/raw/*.csv
 data/processed/*.csv
 data/amateur/*.csv
+data/amateur/exports/
 *.xlsx
 *.mp4
 *.avi
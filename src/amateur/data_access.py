@@ -0,0 +1,166 @@
+"""
+Capa de acceso a datos con caché compartida entre sesiones de Streamlit
+
+Cada consulta se guarda junto con la versión de la base en la que se hizo
+(AmateurPlayerDatabase.version(), que cambia con cada escritura). Mientras la
+versión no cambie, todas las sesiones reutilizan el mismo DataFrame; en cuanto
+un formulario guarda, la siguiente lectura vuelve a la base.
+
+El buscador de jugadores y el FormTracker se mantienen igual: con cada
+versión nueva solo se agregan los jugadores o partidos registrados desde la
+anterior.
+"""
+import threading
+import time
+
+from src.amateur.form_tracker import load_tracker
+from src.amateur.search import PlayerSearchIndex
+
+# Con páginas y filtros hay muchas claves posibles: al llegar a este número de
+# entradas se descartan las de versiones anteriores
+MAX_ENTRIES = 512
+
+
+def _freeze(filters):
+    """Filtros (dict de listas) como clave de la caché"""
+    if not filters:
+        return None
+    return tuple(sorted(
+        (key, tuple(value) if isinstance(value, (list, tuple)) else value)
+        for key, value in filters.items() if value
+    ))
+
+
+class CachedDataAccess:
+    """
+    Lecturas de AmateurPlayerDatabase con caché por versión y métricas
+
+    Los DataFrames devueltos se comparten entre sesiones: no deben
+    modificarse en el lugar (usar .copy() si hace falta).
+    """
+
+    def __init__(self, db, form_state_path=None):
+        self.db = db
+        self.form_state_path = form_state_path
+        self.lock = threading.Lock()
+        self._cache = {}
+        self._metrics = {}
+        self.search_index = PlayerSearchIndex()
+        self._search_version = None
+        self._tracker = None
+        self._tracker_lock = threading.Lock()
+
+    def _get(self, key, loader):
+        version = self.db.version()
+
+        with self.lock:
+            entry = self._cache.get(key)
+            metrics = self._metrics.setdefault(
+                key[0], {'hits': 0, 'misses': 0, 'load_seconds': 0.0, 'last_load_ms': 0.0}
+            )
+            if entry is not None and entry[0] == version:
+                metrics['hits'] += 1
+                return entry[1]
+
+        start = time.perf_counter()
+        value = loader()
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            if len(self._cache) >= MAX_ENTRIES:
+                self._cache = {k: e for k, e in self._cache.items() if e[0] == version}
+                if len(self._cache) >= MAX_ENTRIES:
+                    self._cache.clear()
+            self._cache[key] = (version, value)
+            metrics['misses'] += 1
+            metrics['load_seconds'] += elapsed
+            metrics['last_load_ms'] = elapsed * 1000
+        return value
+
+    def players(self, columns=None):
+        """Jugadores (ver AmateurPlayerDatabase.get_players)"""
+        key = ('players', tuple(columns) if columns else None)
+        return self._get(key, lambda: self.db.get_players(columns))
+
+    def matches(self, player_id=None):
+        """Partidos de todos o de un jugador"""
+        return self._get(('matches', player_id), lambda: self.db.get_matches(player_id))
+
+    def player_stats(self):
+        """Agregados por jugador"""
+        return self._get(('player_stats',), self.db.player_stats)
+
+    def top_players(self, metric='goals', n=10):
+        """Top N de un ranking (índice ordenado de los agregados)"""
+        return self._get(('top_players', metric, n), lambda: self.db.top_players(metric, n))
+
+    def summary(self):
+        """Totales de la portada"""
+        return self._get(('summary',), self.db.summary)
+
+    def count(self, kind, filters=None):
+        """Filas de una tabla paginada (ver AmateurPlayerDatabase.count)"""
+        return self._get(('count', kind, _freeze(filters)),
+                         lambda: self.db.count(kind, filters))
+
+    def page(self, kind, filters=None, sort=None, ascending=True, page=1, page_size=50):
+        """Una página filtrada y ordenada (ver AmateurPlayerDatabase.page)"""
+        key = ('page', kind, _freeze(filters), sort, ascending, page, page_size)
+        return self._get(key, lambda: self.db.page(kind, filters, sort, ascending, page, page_size))
+
+    def options(self, column):
+        """Valores posibles de un filtro (equipos, ligas o posiciones)"""
+        return self._get(('options', column), lambda: self.db.options(column))
+
+    def search_players(self, query, limit=20):
+        """Jugadores que coinciden con una búsqueda (ver PlayerSearchIndex.search)"""
+        version = self.db.version()
+        if version != self._search_version:
+            self.search_index.sync(self.db)
+            self._search_version = version
+        return self.search_index.search(query, limit)
+
+    def trend_ranking(self, metric='rating_1_10', top_n=10, min_matches=3):
+        """
+        Ranking de forma (ver FormTracker.trend_ranking)
+
+        El FormTracker vive en memoria: se carga del archivo de estado una sola
+        vez y después solo se le agregan los partidos nuevos.
+        """
+        def load():
+            with self._tracker_lock:
+                self._tracker = load_tracker(self.db, self.form_state_path, self._tracker)
+                return self._tracker.trend_ranking(metric, top_n=top_n, min_matches=min_matches)
+        return self._get(('trend_ranking', metric, top_n, min_matches), load)
+
+    # Las escrituras pasan a la base; la versión nueva invalida la caché
+    def add_player(self, player_data):
+        return self.db.add_player(player_data)
+
+    def add_match_stats(self, match_data):
+        return self.db.add_match_stats(match_data)
+
+    def invalidate(self):
+        """Vacía la caché (p. ej. tras editar la base por fuera de la app)"""
+        with self.lock:
+            self._cache.clear()
+            self.search_index = PlayerSearchIndex()
+            self._search_version = None
+        with self._tracker_lock:
+            self._tracker = None
+
+    def metrics(self):
+        """
+        Aciertos, fallos y tiempo de carga por consulta
+
+        Returns:
+            Lista de dicts (query, hits, misses, hit_rate, load_seconds,
+            last_load_ms)
+        """
+        with self.lock:
+            rows = []
+            for query, metrics in sorted(self._metrics.items()):
+                total = metrics['hits'] + metrics['misses']
+                rows.append(dict(query=query, hit_rate=metrics['hits'] / total if total else 0.0,
+                                 **metrics))
+            return rows
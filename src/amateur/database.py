@@ -0,0 +1,826 @@
+"""
+Base de datos de jugadores y partidos amateur (SQLite en modo WAL)
+
+Reemplaza a players.csv / match_stats.csv: cada alta es un INSERT indexado en
+lugar de reescribir el archivo completo, y las agregaciones se hacen en SQL.
+
+Uso:
+    python -m src.amateur.database --migrate
+"""
+import argparse
+import gzip
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    # Windows: los escritores de distintos procesos se coordinan solo con
+    # el busy timeout de SQLite
+    HAS_FCNTL = False
+
+DB_FILE = 'data/amateur/scouting.db'
+
+# pandas < 2 no acepta format='ISO8601', pero su parser ya admite formatos
+# mezclados en una misma columna
+DATE_FORMAT = {'format': 'ISO8601'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+PLAYER_COLUMNS = {
+    'player_id': 'TEXT PRIMARY KEY',
+    'name': 'TEXT NOT NULL',
+    'birth_date': 'TEXT',
+    'position': 'TEXT',
+    'team': 'TEXT',
+    'league': 'TEXT',
+    'height_cm': 'REAL',
+    'weight_kg': 'REAL',
+    'preferred_foot': 'TEXT',
+    'nationality': 'TEXT',
+    'contact': 'TEXT',
+    'notes': 'TEXT',
+    'created_date': 'TEXT',
+}
+
+MATCH_COLUMNS = {
+    'match_id': 'TEXT PRIMARY KEY',
+    'player_id': 'TEXT NOT NULL',
+    'player_name': 'TEXT',
+    'match_date': 'TEXT',
+    'opponent': 'TEXT',
+    'minutes_played': 'INTEGER DEFAULT 0',
+    'goals': 'INTEGER DEFAULT 0',
+    'assists': 'INTEGER DEFAULT 0',
+    'shots': 'INTEGER DEFAULT 0',
+    'shots_on_target': 'INTEGER DEFAULT 0',
+    'key_passes': 'INTEGER DEFAULT 0',
+    'successful_dribbles': 'INTEGER DEFAULT 0',
+    'tackles': 'INTEGER DEFAULT 0',
+    'interceptions': 'INTEGER DEFAULT 0',
+    'clearances': 'INTEGER DEFAULT 0',
+    'fouls_committed': 'INTEGER DEFAULT 0',
+    'fouls_received': 'INTEGER DEFAULT 0',
+    'yellow_cards': 'INTEGER DEFAULT 0',
+    'red_cards': 'INTEGER DEFAULT 0',
+    'rating_1_10': 'REAL',
+    'scout_notes': 'TEXT',
+    'video_url': 'TEXT',
+}
+
+INDEXES = {
+    'idx_players_team': 'players(team)',
+    'idx_players_league': 'players(league)',
+    'idx_matches_player': 'matches(player_id, match_date)',
+    'idx_matches_date': 'matches(match_date)',
+}
+
+# Agregados por jugador que se mantienen al registrar cada partido
+AGGREGATE_COLUMNS = {
+    'player_id': 'TEXT PRIMARY KEY',
+    'name': 'TEXT',
+    'team': 'TEXT',
+    'league': 'TEXT',
+    'matches': 'INTEGER NOT NULL DEFAULT 0',
+    'goals': 'INTEGER NOT NULL DEFAULT 0',
+    'assists': 'INTEGER NOT NULL DEFAULT 0',
+    'shots': 'INTEGER NOT NULL DEFAULT 0',
+    'minutes': 'INTEGER NOT NULL DEFAULT 0',
+    'rating_sum': 'REAL NOT NULL DEFAULT 0',
+    'rating_count': 'INTEGER NOT NULL DEFAULT 0',
+    'rating_avg': 'REAL',
+}
+
+# Rankings que se leen directamente de un índice ordenado
+RANKING_INDEXES = {
+    'goals': 'idx_aggregates_goals',
+    'assists': 'idx_aggregates_assists',
+    'rating_avg': 'idx_aggregates_rating',
+}
+
+# Columnas de los agregados tal como las muestran las páginas
+STATS_FIELDS = (
+    'matches AS partidos, goals AS goles, '
+    'assists AS asistencias, shots AS tiros, minutes AS minutos, '
+    'rating_avg AS rating_promedio, '
+    'goals * 90.0 / NULLIF(minutes, 0) AS goles_90, '
+    'assists * 90.0 / NULLIF(minutes, 0) AS asistencias_90, '
+    'shots * 90.0 / NULLIF(minutes, 0) AS tiros_90'
+)
+STATS_SELECT = f'SELECT player_id, name, team, {STATS_FIELDS} FROM player_aggregates'
+
+# Agregados de los partidos de un rango de fechas (mismas columnas que
+# player_aggregates; el WHERE lo pone _filtered)
+RANGE_AGGREGATES = (
+    'SELECT player_id, COUNT(*) AS matches, SUM(goals) AS goals, '
+    'SUM(assists) AS assists, SUM(shots) AS shots, SUM(minutes_played) AS minutes, '
+    'AVG(rating_1_10) AS rating_avg FROM matches WHERE {conditions} GROUP BY player_id'
+)
+
+# Tablas paginadas: columnas (por las que también se puede ordenar) y
+# columna de fecha del filtro por rango
+PAGE_COLUMNS = {
+    'players': list(PLAYER_COLUMNS),
+    'stats': ['player_id', 'name', 'team', 'league', 'position', 'partidos', 'goles',
+              'asistencias', 'tiros', 'minutos', 'rating_promedio', 'goles_90',
+              'asistencias_90', 'tiros_90'],
+}
+DATE_COLUMNS = {'players': 'created_date', 'stats': 'match_date'}
+
+# Filtros por valor (uno o varios) de las tablas paginadas
+FILTER_COLUMNS = ['team', 'league', 'position']
+
+# Prefijo de los IDs de cada tabla (P001, M001...)
+ID_PREFIXES = {'players': 'P', 'matches': 'M'}
+ID_ORDER = 'CAST(substr(player_id, 2) AS INTEGER)'
+
+
+class AmateurPlayerDatabase:
+    """
+    Almacenamiento de jugadores y estadísticas de partidos
+
+    Cada hilo (cada sesión de Streamlit) usa su propia conexión; el modo WAL
+    permite leer mientras otra sesión escribe. Los IDs se asignan dentro de
+    una transacción BEGIN IMMEDIATE, así dos altas simultáneas nunca reciben
+    el mismo ID.
+    """
+
+    def __init__(self, db_path=DB_FILE):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._compaction = None
+        self._write_lock = threading.Lock()
+        self._lock_file = None
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # isolation_level=None: las transacciones se abren explícitamente
+            connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('PRAGMA foreign_keys=ON')
+            self._local.connection = connection
+        return connection
+
+    def _create_schema(self):
+        players = ', '.join(f'{name} {kind}' for name, kind in PLAYER_COLUMNS.items())
+        matches = ', '.join(f'{name} {kind}' for name, kind in MATCH_COLUMNS.items())
+
+        with self.transaction() as connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS players ({players})')
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS matches ({matches}, '
+                f'FOREIGN KEY (player_id) REFERENCES players(player_id))'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)'
+            )
+            aggregates = ', '.join(f'{name} {kind}' for name, kind in AGGREGATE_COLUMNS.items())
+            connection.execute(f'CREATE TABLE IF NOT EXISTS player_aggregates ({aggregates})')
+            for name, target in INDEXES.items():
+                connection.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+            for column, name in RANKING_INDEXES.items():
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS {name} ON player_aggregates({column} DESC)'
+                )
+
+            # Bases creadas antes de existir los agregados
+            has_matches = connection.execute('SELECT 1 FROM matches LIMIT 1').fetchone()
+            has_aggregates = connection.execute('SELECT 1 FROM player_aggregates LIMIT 1').fetchone()
+            if has_matches and not has_aggregates:
+                self._rebuild_aggregates(connection)
+
+            # Bases con fechas 'YYYY-MM-DD HH:MM:SS' (import_from_excel): una
+            # sola vez se dejan como 'YYYY-MM-DD', igual que add_match_stats
+            normalized = connection.execute(
+                "SELECT 1 FROM meta WHERE key = 'match_dates_normalized'"
+            ).fetchone()
+            if not normalized:
+                connection.execute(
+                    'UPDATE matches SET match_date = substr(match_date, 1, 10) '
+                    'WHERE length(match_date) > 10'
+                )
+                connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('match_dates_normalized', '1')"
+                )
+
+    def transaction(self):
+        """Transacción de escritura (BEGIN IMMEDIATE toma el bloqueo al empezar)"""
+        return _Transaction(self)
+
+    def _acquire_write_lock(self):
+        # Los escritores esperan en cola (lock del proceso + flock entre
+        # procesos) en lugar de reintentar con el busy timeout de SQLite, que
+        # duerme a intervalos crecientes y puede dejar a uno esperando segundos
+        self._write_lock.acquire()
+        if HAS_FCNTL:
+            try:
+                if self._lock_file is None:
+                    self._lock_file = open(f'{self.db_path}.lock', 'a')
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            except BaseException:
+                self._write_lock.release()
+                raise
+
+    def _release_write_lock(self):
+        if HAS_FCNTL and self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+        self._write_lock.release()
+
+    @contextmanager
+    def write_lock(self):
+        """
+        Bloqueo de los escritores sin abrir una transacción (para guardar
+        archivos derivados de la base, como el estado de FormTracker)
+        """
+        self._acquire_write_lock()
+        try:
+            yield
+        finally:
+            self._release_write_lock()
+
+    def _next_id(self, connection, table):
+        """
+        Siguiente ID de la tabla; debe llamarse dentro de transaction()
+
+        El contador es monótono (no se reutilizan IDs) y no tiene límite de
+        dígitos: después de P999 viene P1000.
+        """
+        connection.execute(
+            'INSERT INTO counters (name, value) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + 1',
+            (table,)
+        )
+        value = connection.execute(
+            'SELECT value FROM counters WHERE name = ?', (table,)
+        ).fetchone()[0]
+        return f'{ID_PREFIXES[table]}{value:03d}'
+
+    def _bump_version(self, connection):
+        """Incrementa la versión de los datos (en la misma transacción que la escritura)"""
+        connection.execute(
+            "INSERT INTO counters (name, value) VALUES ('version', 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+        )
+
+    def version(self):
+        """Versión de los datos: cambia con cada escritura confirmada"""
+        row = self.connection.execute(
+            "SELECT value FROM counters WHERE name = 'version'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _update_aggregates(self, connection, record):
+        """Suma un partido a los agregados de su jugador (UPSERT de una fila)"""
+        values = [_to_number(record.get(name)) for name in
+                  ['goals', 'assists', 'shots', 'minutes_played']]
+        rating = _to_sql(record.get('rating_1_10'))
+        rated = 0 if rating is None else 1
+
+        connection.execute(
+            'INSERT INTO player_aggregates (player_id, name, team, league, matches, goals, '
+            'assists, shots, minutes, rating_sum, rating_count, rating_avg) '
+            'SELECT player_id, name, team, league, 1, ?, ?, ?, ?, ?, ?, ? '
+            'FROM players WHERE player_id = ? '
+            'ON CONFLICT(player_id) DO UPDATE SET '
+            'matches = matches + 1, goals = goals + excluded.goals, '
+            'assists = assists + excluded.assists, shots = shots + excluded.shots, '
+            'minutes = minutes + excluded.minutes, '
+            'rating_sum = rating_sum + excluded.rating_sum, '
+            'rating_count = rating_count + excluded.rating_count, '
+            'rating_avg = (rating_sum + excluded.rating_sum) / '
+            'NULLIF(rating_count + excluded.rating_count, 0)',
+            values + [rating or 0, rated, rating, record['player_id']]
+        )
+
+    def _rebuild_aggregates(self, connection):
+        """Recalcula todos los agregados desde la tabla de partidos"""
+        connection.execute('DELETE FROM player_aggregates')
+        connection.execute(
+            'INSERT INTO player_aggregates (player_id, name, team, league, matches, goals, '
+            'assists, shots, minutes, rating_sum, rating_count, rating_avg) '
+            'SELECT m.player_id, p.name, p.team, p.league, COUNT(*), '
+            'COALESCE(SUM(m.goals), 0), COALESCE(SUM(m.assists), 0), '
+            'COALESCE(SUM(m.shots), 0), COALESCE(SUM(m.minutes_played), 0), '
+            'COALESCE(SUM(m.rating_1_10), 0), COUNT(m.rating_1_10), AVG(m.rating_1_10) '
+            'FROM matches m JOIN players p ON p.player_id = m.player_id '
+            'GROUP BY m.player_id ORDER BY MIN(m.rowid)'
+        )
+
+    def rebuild_aggregates(self):
+        """Recalcula los agregados (p. ej. tras editar partidos por fuera de la app)"""
+        with self.transaction() as connection:
+            self._rebuild_aggregates(connection)
+            self._bump_version(connection)
+
+    def _insert(self, connection, table, columns, record):
+        names = [name for name in columns if name in record]
+        connection.execute(
+            f'INSERT INTO {table} ({", ".join(names)}) VALUES ({", ".join("?" * len(names))})',
+            [_to_sql(record[name]) for name in names]
+        )
+
+    def add_player(self, player_data):
+        """
+        Registra un jugador
+
+        Args:
+            player_data: Dict con las columnas de PLAYER_COLUMNS (las demás
+                claves se ignoran; player_id y created_date son opcionales)
+
+        Returns:
+            player_id asignado
+        """
+        record = dict(player_data)
+        record.setdefault('created_date', datetime.now().strftime('%Y-%m-%d'))
+
+        with self.transaction() as connection:
+            record['player_id'] = self._next_id(connection, 'players')
+            self._insert(connection, 'players', PLAYER_COLUMNS, record)
+            self._bump_version(connection)
+        return record['player_id']
+
+    def add_match_stats(self, match_data):
+        """
+        Registra las estadísticas de un jugador en un partido
+
+        match_date se guarda como 'YYYY-MM-DD' (acepta date, datetime o
+        'YYYY-MM-DD HH:MM:SS'); una fecha no válida lanza ValueError.
+
+        Returns:
+            match_id asignado
+        """
+        record = dict(match_data)
+        record['match_date'] = _to_date(record.get('match_date'))
+
+        with self.transaction() as connection:
+            record['match_id'] = self._next_id(connection, 'matches')
+            self._insert(connection, 'matches', MATCH_COLUMNS, record)
+            self._update_aggregates(connection, record)
+            self._bump_version(connection)
+        return record['match_id']
+
+    def _query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def get_players(self, columns=None):
+        """DataFrame de jugadores (solo las columnas pedidas)"""
+        columns = columns or list(PLAYER_COLUMNS)
+        return self._query(f'SELECT {", ".join(columns)} FROM players ORDER BY rowid')
+
+    def players_since(self, last_rowid=0, columns=None):
+        """
+        Jugadores registrados después de last_rowid, en orden de alta (para
+        el buscador)
+
+        Returns:
+            DataFrame con rowid y las columnas pedidas
+        """
+        columns = columns or list(PLAYER_COLUMNS)
+        return self._query(
+            f'SELECT rowid, {", ".join(columns)} FROM players WHERE rowid > ? ORDER BY rowid',
+            (last_rowid,)
+        )
+
+    def get_matches(self, player_id=None, columns=None):
+        """DataFrame de partidos, de todos o de un jugador (usa el índice)"""
+        columns = columns or list(MATCH_COLUMNS)
+        sql = f'SELECT {", ".join(columns)} FROM matches'
+        if player_id is not None:
+            return self._query(f'{sql} WHERE player_id = ? ORDER BY match_date', (player_id,))
+        return self._query(f'{sql} ORDER BY rowid')
+
+    def matches_since(self, last_rowid=0):
+        """
+        Partidos registrados después de last_rowid, en orden de alta (para
+        FormTracker). Lee solo las filas nuevas: la búsqueda por rowid usa la
+        clave de la tabla.
+
+        Returns:
+            DataFrame con rowid y las columnas de matches
+        """
+        return self._query(
+            f'SELECT rowid, {", ".join(MATCH_COLUMNS)} FROM matches '
+            f'WHERE rowid > ? ORDER BY rowid',
+            (last_rowid,)
+        )
+
+    def summary(self):
+        """Totales para la portada: jugadores, partidos y goles (de los agregados)"""
+        connection = self.connection
+        players = connection.execute('SELECT COUNT(*) FROM players').fetchone()[0]
+        matches, goals = connection.execute(
+            'SELECT COALESCE(SUM(matches), 0), COALESCE(SUM(goals), 0) FROM player_aggregates'
+        ).fetchone()
+        return {'players': players, 'matches': int(matches), 'goals': int(goals)}
+
+    def player_stats(self):
+        """
+        Agregados por jugador (tabla materializada, no recorre los partidos)
+
+        Returns:
+            DataFrame con player_id, name, team, partidos, goles,
+            asistencias, tiros, minutos, rating_promedio y los valores por
+            90 minutos (goles_90, asistencias_90, tiros_90)
+        """
+        return self._query(f'{STATS_SELECT} ORDER BY rowid')
+
+    def top_players(self, metric='goals', n=10):
+        """
+        Top N de un ranking leyendo el índice ordenado de los agregados
+
+        Args:
+            metric: 'goals', 'assists' o 'rating_avg'
+            n: Número de jugadores
+        """
+        if metric not in RANKING_INDEXES:
+            raise ValueError(f"Ranking no soportado: {metric} (usa {list(RANKING_INDEXES)})")
+        return self._query(
+            f'{STATS_SELECT} INDEXED BY {RANKING_INDEXES[metric]} '
+            f'WHERE {metric} IS NOT NULL ORDER BY {metric} DESC LIMIT ?',
+            (int(n),)
+        )
+
+    def _filtered(self, kind, filters=None):
+        """
+        SELECT (sin ordenar) y parámetros de una tabla paginada
+
+        Args:
+            kind: 'players' o 'stats'
+            filters: Dict con listas de valores para team, league y position
+                y fechas 'YYYY-MM-DD' opcionales date_from / date_to (fecha de
+                alta en players, fecha del partido en stats)
+        """
+        if kind not in PAGE_COLUMNS:
+            raise ValueError(f"Tabla no soportada: {kind} (usa {list(PAGE_COLUMNS)})")
+        filters = filters or {}
+
+        conditions, params = [], []
+        for column in FILTER_COLUMNS:
+            values = filters.get(column)
+            if values:
+                conditions.append(f'p.{column} IN ({", ".join("?" * len(values))})')
+                params.extend(values)
+
+        date_conditions, date_params = [], []
+        for key, operator in [('date_from', '>='), ('date_to', '<=')]:
+            if filters.get(key):
+                date_conditions.append(f'{DATE_COLUMNS[kind]} {operator} ?')
+                date_params.append(str(filters[key]))
+
+        if kind == 'players':
+            sql = f'SELECT {", ".join("p." + column for column in PLAYER_COLUMNS)} FROM players p'
+            conditions = [f'p.{condition}' for condition in date_conditions] + conditions
+        else:
+            # Sin rango de fechas se leen los agregados materializados
+            source = 'player_aggregates'
+            if date_conditions:
+                source = f'({RANGE_AGGREGATES.format(conditions=" AND ".join(date_conditions))})'
+            sql = (f'SELECT p.player_id, p.name, p.team, p.league, p.position, {STATS_FIELDS} '
+                   f'FROM {source} a JOIN players p ON p.player_id = a.player_id')
+        params = date_params + params
+
+        if conditions:
+            sql += f' WHERE {" AND ".join(conditions)}'
+        return sql, params
+
+    def _order_by(self, kind, sort=None, ascending=True):
+        sort = sort or PAGE_COLUMNS[kind][0]
+        if sort not in PAGE_COLUMNS[kind]:
+            raise ValueError(f"No se puede ordenar {kind} por {sort}")
+        # Los IDs se comparan por su número: P1000 va después de P999
+        column = ID_ORDER if sort == 'player_id' else sort
+        return f'{column} {"ASC" if ascending else "DESC"}, {ID_ORDER}'
+
+    def count(self, kind, filters=None):
+        """Filas de una tabla paginada que cumplen los filtros"""
+        sql, params = self._filtered(kind, filters)
+        return self.connection.execute(f'SELECT COUNT(*) FROM ({sql})', params).fetchone()[0]
+
+    def page(self, kind, filters=None, sort=None, ascending=True, page=1, page_size=50):
+        """
+        Una página de jugadores o estadísticas, filtrada y ordenada en SQL
+
+        Solo se leen las filas de la página pedida (LIMIT / OFFSET).
+
+        Args:
+            kind: 'players' o 'stats'
+            filters: Ver _filtered
+            sort: Columna de PAGE_COLUMNS[kind] (por defecto, player_id)
+            page: Número de página, desde 1
+        """
+        sql, params = self._filtered(kind, filters)
+        return self._query(
+            f'SELECT * FROM ({sql}) ORDER BY {self._order_by(kind, sort, ascending)} '
+            f'LIMIT ? OFFSET ?',
+            params + [int(page_size), (max(int(page), 1) - 1) * int(page_size)]
+        )
+
+    def options(self, column):
+        """Valores distintos de un filtro (equipos, ligas o posiciones)"""
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Filtro no soportado: {column} (usa {FILTER_COLUMNS})")
+        rows = self.connection.execute(
+            f'SELECT DISTINCT {column} FROM players WHERE {column} IS NOT NULL ORDER BY {column}'
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def export_csv(self, kind, path, filters=None, sort=None, ascending=True, compress=False,
+                   chunk_size=5000):
+        """
+        Escribe la tabla filtrada completa en un CSV, por bloques
+
+        Las filas se leen del cursor de chunk_size en chunk_size, así que la
+        tabla nunca se carga entera en memoria.
+
+        Args:
+            compress: Escribe el CSV con gzip
+
+        Returns:
+            Número de filas exportadas
+        """
+        sql, params = self._filtered(kind, filters)
+        sql = f'SELECT * FROM ({sql}) ORDER BY {self._order_by(kind, sort, ascending)}'
+
+        opener = gzip.open if compress else open
+        rows = 0
+        with opener(path, 'wt', encoding='utf-8', newline='') as f:
+            for chunk in pd.read_sql_query(sql, self.connection, params=params,
+                                           chunksize=chunk_size):
+                chunk.to_csv(f, index=False, header=rows == 0)
+                rows += len(chunk)
+            if rows == 0:
+                f.write(','.join(PAGE_COLUMNS[kind]) + '\n')
+        return rows
+
+    def migrate_from_csv(self, players_file, matches_file):
+        """
+        Importa una sola vez los CSV de la versión anterior
+
+        La migración queda registrada en meta ('migrated_from'); una base con
+        datos pero sin esa marca (p. ej. si import_from_excel la abrió antes)
+        también recibe los CSV. Se conservan los IDs originales salvo los
+        repetidos (dos altas simultáneas con la lógica anterior), los vacíos
+        y los que ya usa un registro de la base: esos se renumeran con el
+        contador (la primera fila repetida conserva el ID) y los partidos del
+        jugador renumerado por choque pasan a su nuevo ID. Los partidos de
+        jugadores que no existen se descartan.
+
+        Returns:
+            (jugadores, partidos) importados
+        """
+        if not any(path and os.path.exists(path) for path in [players_file, matches_file]):
+            return 0, 0
+
+        players = _read_csv(players_file, PLAYER_COLUMNS)
+        matches = _read_csv(matches_file, MATCH_COLUMNS)
+        # Los partidos de jugadores que no existen romperían la clave foránea
+        matches['match_date'] = _dates(matches['match_date'])
+        known = matches['player_id'].isin(players['player_id'].dropna())
+        orphans = int((~known).sum())
+        matches = matches[known].copy()
+        renumbered = {}
+        collisions = {}
+
+        with self.transaction() as connection:
+            # Comprobación dentro de la transacción: si dos sesiones arrancan a
+            # la vez, solo la primera migra
+            done = connection.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from'"
+            ).fetchone()
+            if done:
+                return 0, 0
+
+            for table, df, columns in [('players', players, PLAYER_COLUMNS),
+                                       ('matches', matches, MATCH_COLUMNS)]:
+                if len(df) == 0:
+                    continue
+                id_column = 'player_id' if table == 'players' else 'match_id'
+                numbers = pd.to_numeric(df[id_column].str[1:], errors='coerce')
+                # El contador nunca retrocede (la base puede tener altas nuevas)
+                connection.execute(
+                    'INSERT INTO counters (name, value) VALUES (?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET value = MAX(value, excluded.value)',
+                    (table, int(numbers.max()) if numbers.notna().any() else 0)
+                )
+
+                existing = {row[0] for row in connection.execute(f'SELECT {id_column} FROM {table}')}
+                repeated = df[id_column].isna() | df[id_column].duplicated(keep='first')
+                colliding = df[id_column].isin(existing) & ~repeated
+                rows = df.index[repeated | colliding]
+                new_ids = pd.Series([self._next_id(connection, table) for _ in rows],
+                                    index=rows, dtype=object)
+                if table == 'players' and colliding.any():
+                    moved = df.loc[colliding, id_column]
+                    matches['player_id'] = matches['player_id'].replace(
+                        dict(zip(moved, new_ids[moved.index]))
+                    )
+                df.loc[rows, id_column] = new_ids
+                renumbered[table] = int(repeated.sum())
+                collisions[table] = int(colliding.sum())
+
+                connection.executemany(
+                    f'INSERT INTO {table} ({", ".join(columns)}) '
+                    f'VALUES ({", ".join("?" * len(columns))})',
+                    [[_to_sql(value) for value in row]
+                     for row in df[list(columns)].itertuples(index=False)]
+                )
+            self._rebuild_aggregates(connection)
+            self._bump_version(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                (f'{players_file}, {matches_file}',)
+            )
+
+        if renumbered.get('players'):
+            # Sus partidos siguen apuntando al primer jugador con ese ID
+            print(f"⚠️  {renumbered['players']} jugadores con ID repetido o vacío renumerados")
+        if renumbered.get('matches'):
+            print(f"⚠️  {renumbered['matches']} partidos con ID repetido o vacío renumerados")
+        if collisions.get('players') or collisions.get('matches'):
+            print(f"⚠️  {collisions.get('players', 0)} jugadores y {collisions.get('matches', 0)} "
+                  f"partidos renumerados porque la base ya usaba su ID")
+        if orphans:
+            print(f"⚠️  {orphans} partidos descartados (su jugador no existe)")
+        return len(players), len(matches)
+
+    def checkpoint(self, mode='PASSIVE'):
+        """
+        Compacta el WAL (el diario de escrituras) en el archivo principal
+
+        Args:
+            mode: 'PASSIVE' no espera a nadie; 'TRUNCATE' además deja el WAL
+                vacío cuando no hay lectores
+
+        Returns:
+            (busy, páginas en el WAL, páginas compactadas)
+        """
+        return self.connection.execute(f'PRAGMA wal_checkpoint({mode})').fetchone()
+
+    def wal_size(self):
+        """Tamaño del WAL en bytes"""
+        try:
+            return os.path.getsize(f'{self.db_path}-wal')
+        except OSError:
+            return 0
+
+    def start_compaction(self, interval=30):
+        """
+        Compacta el WAL en la base principal en un hilo de fondo
+
+        Cada alta solo añade páginas al final del WAL (el diario de
+        escrituras), así que guardar es O(1). SQLite ya vuelca el WAL cada
+        ~1000 páginas al confirmar, lo que lo mantiene acotado; este hilo
+        además lo vacía y lo trunca cuando la base lleva un intervalo sin
+        escrituras, sin bloquear nunca a un formulario que está guardando.
+
+        Returns:
+            threading.Event para detener el hilo
+        """
+        if self._compaction is not None:
+            return self._compaction
+
+        stop = threading.Event()
+
+        def run():
+            # Si otro proceso está escribiendo o compactando, se reintenta en
+            # el siguiente intervalo en vez de esperar
+            self.connection.execute('PRAGMA busy_timeout=100')
+            last_version = self.version()
+            while not stop.wait(interval):
+                try:
+                    version = self.version()
+                    if version == last_version and self.wal_size() > 0:
+                        self.checkpoint('TRUNCATE')
+                    last_version = version
+                except sqlite3.Error as e:
+                    print(f"⚠️ Compactación del WAL pospuesta: {e}")
+            self.close()
+
+        threading.Thread(target=run, name='wal-compaction', daemon=True).start()
+        self._compaction = stop
+        return stop
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class _Transaction:
+    def __init__(self, db):
+        self.db = db
+        self.connection = db.connection
+
+    def __enter__(self):
+        self.db._acquire_write_lock()
+        try:
+            self.connection.execute('BEGIN IMMEDIATE')
+        except BaseException:
+            self.db._release_write_lock()
+            raise
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+        finally:
+            self.db._release_write_lock()
+        return False
+
+
+def _to_sql(value):
+    """Valores de pandas/numpy a tipos que acepta sqlite3 (NaN -> NULL)"""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _to_number(value):
+    """Estadística de un partido a número (vacío o NaN -> 0)"""
+    value = _to_sql(value)
+    if value in (None, ''):
+        return 0
+    return float(value) if isinstance(value, str) else value
+
+
+def _dates(values):
+    """Columna de fechas a 'YYYY-MM-DD' (None si falta o no es válida)"""
+    dates = pd.to_datetime(values, errors='coerce', **DATE_FORMAT)
+    return dates.dt.strftime('%Y-%m-%d').astype(object).where(dates.notna(), None)
+
+
+def _to_date(value):
+    """Fecha de un partido a 'YYYY-MM-DD' (None si falta)"""
+    value = _to_sql(value)
+    if value in (None, ''):
+        return None
+    date = _dates(pd.Series([value])).iloc[0]
+    if date is None:
+        raise ValueError(f"Fecha de partido no válida: {value}")
+    return date
+
+
+def _read_csv(path, columns):
+    """CSV anterior con todas las columnas del esquema y tipos numéricos"""
+    if path and os.path.exists(path):
+        df = pd.read_csv(path, dtype={'player_id': str, 'match_id': str})
+    else:
+        df = pd.DataFrame()
+
+    for name, kind in columns.items():
+        if name not in df.columns:
+            df[name] = None
+        elif kind.startswith(('INTEGER', 'REAL')):
+            df[name] = pd.to_numeric(df[name], errors='coerce')
+    return df
+
+
+def open_database(db_path=DB_FILE, players_file=None, matches_file=None):
+    """
+    Abre la base y, la primera vez, migra los CSV anteriores si existen
+    """
+    db = AmateurPlayerDatabase(db_path)
+    players, matches = db.migrate_from_csv(players_file, matches_file)
+    if players or matches:
+        print(f"✓ Migrados {players} jugadores y {matches} partidos desde CSV")
+    return db
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Base de datos de scouting amateur')
+    parser.add_argument('--db', default=DB_FILE)
+    parser.add_argument('--migrate', action='store_true',
+                        help='Importa data/amateur/players.csv y match_stats.csv')
+    parser.add_argument('--players-csv', default='data/amateur/players.csv')
+    parser.add_argument('--matches-csv', default='data/amateur/match_stats.csv')
+    args = parser.parse_args()
+
+    if args.migrate:
+        db = open_database(args.db, args.players_csv, args.matches_csv)
+    else:
+        db = AmateurPlayerDatabase(args.db)
+
+    summary = db.summary()
+    print(f"📊 {args.db}: {summary['players']} jugadores, {summary['matches']} partidos, "
+          f"{summary['goals']} goles")
@@ -0,0 +1,396 @@
+"""
+Forma reciente de jugadores amateur (ventanas móviles y decaimiento temporal)
+
+Uso:
+    python -m src.amateur.form_tracker data/amateur/match_stats.csv --top 10
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.amateur.database import DATE_FORMAT
+
+FORM_METRICS = [
+    'minutes_played', 'goals', 'assists', 'shots', 'shots_on_target', 'key_passes',
+    'successful_dribbles', 'tackles', 'interceptions', 'rating_1_10'
+]
+
+# Segundos mínimos entre dos guardados del estado (load_tracker); lo que no
+# llegó a guardarse se vuelve a agregar desde el log en la siguiente carga
+SAVE_INTERVAL = 60
+
+
+def parse_dates(values):
+    """
+    Fechas 'YYYY-MM-DD' o 'YYYY-MM-DD HH:MM:SS' (import_from_excel) a
+    datetime64; NaT si faltan o no son válidas
+    """
+    return pd.to_datetime(values, errors='coerce', **DATE_FORMAT)
+
+
+def date_to_day(date):
+    """Fecha 'YYYY-MM-DD' (o datetime) -> número de día (None si no es válida)"""
+    timestamp = parse_dates(pd.Series([date])).iloc[0]
+    if pd.isna(timestamp):
+        return None
+    return int(np.datetime64(timestamp.date(), 'D').astype(np.int64))
+
+
+class FormTracker:
+    """
+    Agregados de forma por jugador que se actualizan partido a partido
+
+    Para cada jugador se mantiene:
+    - Sumas de los últimos N partidos (p. ej. 5 y 10), con un deque de los
+      últimos max(N) partidos para restar el que sale de cada ventana
+    - Suma y peso con decaimiento exponencial según match_date (vida media
+      en días), referidos a la fecha más reciente del jugador
+    - Totales históricos
+
+    Agregar un partido cuesta O(1) (no depende del tamaño del log) y el
+    ranking de tendencia es vectorizado sobre los jugadores, no sobre los
+    partidos.
+    """
+
+    def __init__(self, metrics=None, windows=(5, 10), half_life_days=30, capacity=256):
+        self.metrics = list(metrics or FORM_METRICS)
+        self.windows = sorted(windows)
+        self.half_life_days = half_life_days
+        self.n_rows = 0
+        self.last_rowid = 0
+        self.saved_at = None
+
+        self.player_ids = []
+        self._slots = {}
+        self._recent = []
+
+        n_metrics = len(self.metrics)
+        self._window_sums = np.zeros((capacity, len(self.windows), n_metrics))
+        self._totals = np.zeros((capacity, n_metrics))
+        self._decay_sums = np.zeros((capacity, n_metrics))
+        self._decay_weights = np.zeros(capacity)
+        self._matches = np.zeros(capacity, dtype=np.int64)
+        self._last_day = np.zeros(capacity, dtype=np.int64)
+
+    def _slot(self, player_id):
+        """Posición del jugador en los arrays (crece duplicando la capacidad)"""
+        slot = self._slots.get(player_id)
+        if slot is not None:
+            return slot
+
+        slot = len(self.player_ids)
+        if slot == len(self._matches):
+            for name in ['_window_sums', '_totals', '_decay_sums', '_decay_weights',
+                         '_matches', '_last_day']:
+                array = getattr(self, name)
+                grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+                grown[:len(array)] = array
+                setattr(self, name, grown)
+
+        self._slots[player_id] = slot
+        self.player_ids.append(player_id)
+        self._recent.append(deque(maxlen=self.windows[-1]))
+        return slot
+
+    def _values(self, match):
+        values = np.zeros(len(self.metrics))
+        for i, metric in enumerate(self.metrics):
+            try:
+                value = float(match.get(metric))
+            except (TypeError, ValueError):
+                continue
+            if np.isfinite(value):
+                values[i] = value
+        return values
+
+    def add_match(self, match):
+        """
+        Agrega un partido (dict con player_id, match_date y las métricas)
+
+        Las ventanas siguen el orden de llegada (el log se registra partido a
+        partido); el decaimiento usa match_date, así que un partido cargado
+        tarde pesa según su fecha real.
+        """
+        day = date_to_day(match.get('match_date'))
+        self.n_rows += 1
+        if day is None:
+            print(f"⚠️  Partido sin fecha válida ignorado en la forma: {match.get('match_id')}")
+            return self
+        self._add(self._slot(match['player_id']), self._values(match), day)
+        return self
+
+    def _add(self, slot, values, day):
+        recent = self._recent[slot]
+        for w, size in enumerate(self.windows):
+            if len(recent) >= size:
+                self._window_sums[slot, w] -= recent[-size]
+            self._window_sums[slot, w] += values
+        recent.append(values)
+
+        self._totals[slot] += values
+        self._matches[slot] += 1
+
+        # Todo se refiere a la fecha más reciente: escalar suma y peso por el
+        # mismo factor no cambia la media ponderada
+        if self._matches[slot] == 1:
+            self._last_day[slot] = day
+        last_day = self._last_day[slot]
+        if day >= last_day:
+            factor = 0.5 ** ((day - last_day) / self.half_life_days)
+            self._decay_sums[slot] = self._decay_sums[slot] * factor + values
+            self._decay_weights[slot] = self._decay_weights[slot] * factor + 1
+            self._last_day[slot] = day
+        else:
+            weight = 0.5 ** ((last_day - day) / self.half_life_days)
+            self._decay_sums[slot] += values * weight
+            self._decay_weights[slot] += weight
+
+    def add_log(self, matches_df):
+        """
+        Agrega muchos partidos a la vez (p. ej. el CSV completo) de forma
+        vectorizada; el resultado es el mismo que llamar a add_match fila a fila
+        """
+        # n_rows cuenta todas las filas del log (es la posición para sync),
+        # también las que se ignoran por no tener fecha válida
+        n_rows = len(matches_df)
+        dates = parse_dates(matches_df['match_date']) if n_rows else pd.Series(dtype='datetime64[ns]')
+        valid = dates.notna().to_numpy()
+        if not valid.all():
+            print(f"⚠️  {int((~valid).sum())} partidos sin fecha válida ignorados en la forma")
+            matches_df, dates = matches_df[valid], dates[valid]
+        if len(matches_df) == 0:
+            self.n_rows += n_rows
+            return self
+
+        df = matches_df[['player_id', 'match_date']].copy()
+        values = matches_df.reindex(columns=self.metrics).apply(pd.to_numeric, errors='coerce')
+        values = values.fillna(0).to_numpy(dtype=float)
+        days = dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+
+        codes, players = pd.factorize(df['player_id'])
+        slots = np.array([self._slot(player) for player in players])
+        row_slots = slots[codes]
+
+        # Los partidos previos de cada jugador se reproducen partido a partido
+        # solo si ya tenía estado (pocos jugadores en una carga incremental)
+        had_state = self._matches[slots] > 0
+        if had_state.any():
+            replay = np.isin(codes, np.flatnonzero(had_state))
+            for row in np.flatnonzero(replay):
+                self._add(row_slots[row], values[row], days[row])
+            keep = ~replay
+            values, days, row_slots = values[keep], days[keep], row_slots[keep]
+            if len(row_slots) == 0:
+                self.n_rows += n_rows
+                return self
+
+        n_slots = len(self.player_ids)
+        np.add.at(self._totals, row_slots, values)
+        self._matches[:n_slots] += np.bincount(row_slots, minlength=n_slots)
+
+        last_day = np.full(n_slots, np.iinfo(np.int64).min)
+        np.maximum.at(last_day, row_slots, days)
+        weights = 0.5 ** ((last_day[row_slots] - days) / self.half_life_days)
+        np.add.at(self._decay_sums, row_slots, values * weights[:, None])
+        np.add.at(self._decay_weights, row_slots, weights)
+        new_slots = np.unique(row_slots)
+        self._last_day[new_slots] = last_day[new_slots]
+
+        # Posición de cada partido contando desde el último del jugador
+        order = np.argsort(row_slots, kind='stable')
+        sorted_slots = row_slots[order]
+        counts = np.bincount(sorted_slots, minlength=n_slots)
+        ends = np.cumsum(counts)
+        from_end = np.empty(len(order), dtype=np.int64)
+        from_end[order] = ends[sorted_slots] - np.arange(len(order)) - 1
+
+        for w, size in enumerate(self.windows):
+            in_window = from_end < size
+            np.add.at(self._window_sums[:, w], row_slots[in_window], values[in_window])
+
+        tail = np.flatnonzero(from_end < self.windows[-1])
+        tail = tail[np.lexsort((-from_end[tail], row_slots[tail]))]
+        for row in tail:
+            self._recent[row_slots[row]].append(values[row])
+
+        self.n_rows += n_rows
+        return self
+
+    def sync(self, path):
+        """Agrega solo las filas del CSV que aún no se procesaron"""
+        if not os.path.exists(path):
+            return self
+        new_rows = pd.read_csv(path, skiprows=range(1, self.n_rows + 1))
+        return self.add_log(new_rows)
+
+    def sync_database(self, db):
+        """
+        Agrega solo los partidos de la base (AmateurPlayerDatabase) aún no
+        procesados; last_rowid recuerda el último leído
+        """
+        new_rows = db.matches_since(self.last_rowid)
+        if len(new_rows):
+            self.last_rowid = int(new_rows['rowid'].iloc[-1])
+        return self.add_log(new_rows)
+
+    def form_table(self):
+        """
+        Tabla de forma por jugador
+
+        Returns:
+            DataFrame con player_id, matches y, por métrica, la media de cada
+            ventana ({metric}_last{N}), la media con decaimiento
+            ({metric}_decay) y la media histórica ({metric}_avg)
+        """
+        n = len(self.player_ids)
+        matches = self._matches[:n]
+        columns = {'player_id': self.player_ids, 'matches': matches}
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for w, size in enumerate(self.windows):
+                window_counts = np.minimum(matches, size)[:, None]
+                means = self._window_sums[:n, w] / window_counts
+                for i, metric in enumerate(self.metrics):
+                    columns[f'{metric}_last{size}'] = means[:, i]
+
+            decay = self._decay_sums[:n] / self._decay_weights[:n, None]
+            average = self._totals[:n] / matches[:, None]
+            for i, metric in enumerate(self.metrics):
+                columns[f'{metric}_decay'] = decay[:, i]
+                columns[f'{metric}_avg'] = average[:, i]
+
+        return pd.DataFrame(columns)
+
+    def trend_ranking(self, metric='rating_1_10', top_n=10, min_matches=3):
+        """
+        Jugadores en mejor momento: media de la ventana corta menos la media
+        histórica de una métrica
+
+        Args:
+            metric: Métrica de forma (p. ej. 'rating_1_10' o 'goals')
+            top_n: Número de jugadores
+            min_matches: Partidos mínimos para entrar en el ranking
+        """
+        i = self.metrics.index(metric)
+        n = len(self.player_ids)
+        matches = self._matches[:n]
+        short = self.windows[0]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            recent = self._window_sums[:n, 0, i] / np.minimum(matches, short)
+            average = self._totals[:n, i] / matches
+            decay = self._decay_sums[:n, i] / self._decay_weights[:n]
+        trend = recent - average
+
+        candidates = np.flatnonzero(matches >= min_matches)
+        if len(candidates) > top_n:
+            best = np.argpartition(-trend[candidates], top_n - 1)[:top_n]
+            candidates = candidates[best]
+        candidates = candidates[np.argsort(-trend[candidates], kind='stable')]
+
+        return pd.DataFrame({
+            'player_id': [self.player_ids[slot] for slot in candidates],
+            'matches': matches[candidates],
+            f'{metric}_last{short}': recent[candidates],
+            f'{metric}_decay': decay[candidates],
+            f'{metric}_avg': average[candidates],
+            'trend': trend[candidates],
+        })
+
+    def save(self, path):
+        """
+        Guarda el estado para no reprocesar el log completo
+
+        Se escribe en un temporal y se reemplaza, así quien lea el archivo a
+        la vez nunca ve un pickle a medias.
+        """
+        self.saved_at = time.time()
+        directory = os.path.dirname(path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix='.form_state_', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def load_tracker(matches_source, state_path, tracker=None, save_interval=SAVE_INTERVAL):
+    """
+    Carga el estado guardado (si existe), agrega las filas nuevas del log y
+    guarda el estado actualizado
+
+    El guardado reescribe el estado completo, así que no se hace con cada
+    partido nuevo sino como mucho una vez cada save_interval segundos: el
+    archivo siempre corresponde a su propia posición en el log, y la
+    siguiente carga agrega lo que falte.
+
+    Args:
+        matches_source: Ruta del CSV de partidos o AmateurPlayerDatabase
+        state_path: Archivo del estado guardado (None: no se guarda)
+        tracker: Estado ya cargado en memoria (no se vuelve a leer el archivo)
+        save_interval: Segundos mínimos entre guardados (0 = siempre que
+            haya filas nuevas)
+    """
+    from_csv = isinstance(matches_source, str)
+    if tracker is None:
+        tracker = FormTracker()
+        if state_path and os.path.exists(state_path):
+            try:
+                tracker = FormTracker.load(state_path)
+            except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+                print(f"⚠️  Estado de forma ilegible ({e}); se recalcula desde el log")
+            else:
+                # Estados guardados antes de last_rowid: su posición en la base
+                # no se conoce
+                if not from_csv and not hasattr(tracker, 'last_rowid'):
+                    print("⚠️  Estado de forma sin posición en la base; se recalcula")
+                    tracker = FormTracker()
+
+    n_before = tracker.n_rows
+    if from_csv:
+        tracker.sync(matches_source)
+    else:
+        tracker.sync_database(matches_source)
+
+    saved_at = getattr(tracker, 'saved_at', None)
+    due = saved_at is None or time.time() - saved_at >= save_interval
+    if state_path and ((tracker.n_rows != n_before and due) or not os.path.exists(state_path)):
+        if from_csv:
+            tracker.save(state_path)
+        else:
+            # Un solo proceso escribe el estado a la vez (bloqueo de la base)
+            with matches_source.write_lock():
+                tracker.save(state_path)
+    return tracker
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Ranking de forma reciente')
+    parser.add_argument('matches', nargs='?', default='data/amateur/match_stats.csv')
+    parser.add_argument('--state', default='data/amateur/form_state.pkl')
+    parser.add_argument('--metric', default='rating_1_10')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.matches):
+        print(f"❌ No se encontró {args.matches}")
+        print("   Ejecuta primero: streamlit run amateur_data_entry.py")
+    else:
+        tracker = load_tracker(args.matches, args.state, save_interval=0)
+        print(f"✓ {tracker.n_rows} partidos, {len(tracker.player_ids)} jugadores")
+        print(f"\n📈 Mejor momento ({args.metric}):")
+        print(tracker.trend_ranking(args.metric, top_n=args.top))
@@ -0,0 +1,197 @@
+"""
+Búsqueda de jugadores por nombre, equipo o liga (autocompletado)
+
+Índice en memoria de los tokens de cada jugador, sin distinguir acentos ni
+mayúsculas ("nunez" encuentra a "Núñez"). Cada palabra de la consulta se
+busca como prefijo en el vocabulario ordenado; si no hay ninguna, se buscan
+palabras parecidas por trigramas (errores de tipeo). Los jugadores nuevos se
+agregan al índice sin reconstruirlo.
+
+Uso:
+    python -m src.amateur.search "juan perez"
+"""
+import argparse
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+
+# Peso de cada campo en la puntuación (el nombre pesa más que el equipo)
+FIELD_WEIGHTS = {'name': 3.0, 'team': 2.0, 'league': 1.0}
+
+# Similitud mínima (Jaccard de trigramas) para aceptar una palabra parecida
+MIN_SIMILARITY = 0.35
+
+
+def normalize(text):
+    """Minúsculas y sin acentos ni diéresis ('Núñez' -> 'nunez')"""
+    if text is None or text != text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    """Palabras normalizadas de un texto"""
+    return re.findall(r'[a-z0-9]+', normalize(text))
+
+
+def trigrams(token):
+    """Trigramas de una palabra, con bordes (' ju', 'jua', 'uan', 'an ')"""
+    padded = f' {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    Índice de prefijos y trigramas sobre nombre, equipo y liga
+
+    - _postings: palabra -> {jugador: peso del mejor campo en que aparece}
+    - _vocabulary: palabras ordenadas (un prefijo es un rango con bisect)
+    - _trigrams: trigrama -> palabras que lo contienen
+
+    Los jugadores solo se agregan (la base no permite editarlos ni
+    borrarlos), así que sync() lee únicamente las filas posteriores al
+    último rowid leído.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.players = []
+        self.last_rowid = 0
+        self._postings = defaultdict(dict)
+        self._vocabulary = []
+        self._trigrams = defaultdict(set)
+
+    def add(self, player):
+        """Agrega un jugador (dict con player_id, name, team y league)"""
+        with self.lock:
+            self._add(player)
+
+    def _add(self, player):
+        doc = len(self.players)
+        self.players.append({field: player.get(field) for field in ['player_id', *FIELD_WEIGHTS]})
+
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(player.get(field)):
+                postings = self._postings[token]
+                if not postings:
+                    bisect.insort(self._vocabulary, token)
+                    for trigram in trigrams(token):
+                        self._trigrams[trigram].add(token)
+                postings[doc] = max(postings.get(doc, 0.0), weight)
+
+    def sync(self, db):
+        """
+        Agrega los jugadores registrados desde la última sincronización
+
+        Returns:
+            Número de jugadores nuevos
+        """
+        with self.lock:
+            new_players = db.players_since(self.last_rowid, ['player_id', *FIELD_WEIGHTS])
+            for player in new_players.to_dict('records'):
+                self._add(player)
+            if len(new_players):
+                self.last_rowid = int(new_players['rowid'].iloc[-1])
+        return len(new_players)
+
+    def _prefix_tokens(self, term):
+        """Palabras del vocabulario que empiezan por term"""
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + '\uffff', start)
+        return self._vocabulary[start:end]
+
+    def _similar_tokens(self, term):
+        """Palabras parecidas a term (trigramas en común), con su similitud"""
+        query = trigrams(term)
+        shared = defaultdict(int)
+        for trigram in query:
+            for token in self._trigrams.get(trigram, ()):
+                shared[token] += 1
+
+        similar = []
+        for token, count in shared.items():
+            similarity = count / (len(query) + len(token) - count)
+            if similarity >= MIN_SIMILARITY:
+                similar.append((token, similarity))
+        return similar
+
+    def _match_term(self, term):
+        """Puntuación de cada jugador para una palabra de la consulta"""
+        # Un prefijo puntúa más cuanto más completa la palabra; las palabras
+        # parecidas (sin prefijo) puntúan a la mitad según su similitud
+        matches = [(token, 0.5 + 0.5 * len(term) / len(token))
+                   for token in self._prefix_tokens(term)]
+        if not matches and len(term) >= 3:
+            matches = [(token, 0.5 * similarity) for token, similarity in self._similar_tokens(term)]
+
+        scores = {}
+        for token, factor in matches:
+            for doc, weight in self._postings[token].items():
+                score = weight * factor
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query, limit=20):
+        """
+        Mejores coincidencias de una consulta
+
+        Todas las palabras de la consulta deben coincidir (en cualquier
+        campo). Sin consulta se devuelven los últimos jugadores registrados.
+
+        Returns:
+            Lista de dicts (player_id, name, team, league, score), de mayor a
+            menor puntuación
+        """
+        terms = tokenize(query)
+
+        with self.lock:
+            if not terms:
+                recent = self.players[-limit:][::-1] if limit else []
+                return [dict(player, score=0.0) for player in recent]
+
+            scores = None
+            # Las palabras largas son las más selectivas: van primero
+            for term in sorted(set(terms), key=len, reverse=True):
+                matches = self._match_term(term)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {doc: score + matches[doc] for doc, score in scores.items()
+                              if doc in matches}
+                if not scores:
+                    return []
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [dict(self.players[doc], score=round(score, 3)) for doc, score in best]
+
+    def __len__(self):
+        return len(self.players)
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    from src.amateur.database import DB_FILE, AmateurPlayerDatabase
+
+    parser = argparse.ArgumentParser(description='Busca jugadores en la base amateur')
+    parser.add_argument('query', help='Nombre, equipo o liga (sin importar acentos)')
+    parser.add_argument('--db', default=DB_FILE)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    index = PlayerSearchIndex()
+    start = time.perf_counter()
+    index.sync(AmateurPlayerDatabase(args.db))
+    print(f"✓ Índice de {len(index):,} jugadores en {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    results = index.search(args.query, args.limit)
+    print(f"🔍 '{args.query}': {len(results)} resultados en {(time.perf_counter() - start) * 1000:.2f} ms\n")
+    for player in results:
+        print(f"   {player['player_id']}  {player['name']} ({player['team']}, {player['league']})  "
+              f"{player['score']}")
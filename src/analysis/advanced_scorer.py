@@ -1,12 +1,19 @@
+import argparse
+
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
 import warnings
 warnings.filterwarnings('ignore')
 
-class AdvancedPlayerScorer:
+from src.analysis.compact_storage import save_scored
+from src.analysis.position_classifier import PositionClassifier
+from src.analysis.quantile_sketch import PercentileEngine
+from src.analysis.scoring_model import (
+    ColumnStats, ScoringModel, ScoringModelMixin, fit_normalization, apply_normalization
+)
+
+class AdvancedPlayerScorer(ScoringModelMixin):
     """
     Sistema avanzado de scoring con Machine Learning
     """
@@ -50,7 +57,18 @@ class AdvancedPlayerScorer:
             }
         }
         
+        # Cohortes para la normalización por percentiles (si existen en los datos)
+        self.percentile_cohorts = ['League', 'Season']
+        
+        # Columnas que no se convierten a valores por 90 minutos
+        self.per90_excluded = ['Age', 'Minutes_Played', '90s_Played', 'Born']
+        
         self.scaler = MinMaxScaler(feature_range=(0, 100))
+        
+        # Referencia de normalización congelada (ver fit/transform)
+        self.model_ = None
+        
+        self.position_classifier = PositionClassifier(self.identify_position)
     
     def identify_position(self, pos_string):
         """Identificación mejorada de posición"""
@@ -76,49 +94,160 @@ class AdvancedPlayerScorer:
         
         return 'Unknown'
     
-    def calculate_per_90_stats(self, df):
-        """Calcula estadísticas por 90 minutos jugados"""
-        df_per90 = df.copy()
+    def classify_positions(self, positions, multi=False):
+        """
+        Clasifica una columna Pos completa (una vez por valor distinto)
         
-        minutes_col = None
+        Args:
+            positions: Series con la columna Pos
+            multi: Si es True devuelve también Position_Secondary
+        """
+        return self.position_classifier.classify(positions, multi=multi)
+    
+    def find_minutes_column(self, columns):
+        """Devuelve la columna de minutos disponible (o None)"""
         for col in ['Min', 'Minutes', '90s', 'MP']:
-            if col in df.columns:
-                minutes_col = col
-                break
+            if col in columns:
+                return col
+        return None
+    
+    def calculate_per_90_stats(self, df, columns=None):
+        """
+        Calcula estadísticas por 90 minutos jugados
+        
+        Args:
+            df: DataFrame de jugadores
+            columns: Columnas base a convertir (None = todas las numéricas)
+        """
+        df_per90 = df.copy()
+        
+        minutes_col = self.find_minutes_column(df.columns)
         
         if minutes_col:
             df_per90['Minutes_Played'] = pd.to_numeric(df[minutes_col], errors='coerce')
             df_per90['90s_Played'] = df_per90['Minutes_Played'] / 90
             
-            numeric_cols = df_per90.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                if col not in ['Age', 'Minutes_Played', '90s_Played', 'Born']:
+            if columns is None:
+                columns = df_per90.select_dtypes(include=[np.number]).columns
+            
+            per90 = {}
+            for col in columns:
+                if col not in self.per90_excluded:
                     try:
-                        df_per90[f'{col}_per90'] = (
+                        per90[f'{col}_per90'] = (
                             df_per90[col] / df_per90['90s_Played']
                         ).replace([np.inf, -np.inf], 0)
                     except:
                         pass
+            
+            for col, values in per90.items():
+                df_per90[col] = values
         
         return df_per90
     
+    def build_metric_plan(self, df, metrics=None):
+        """
+        Determina qué columnas necesitan realmente los pesos configurados
+        
+        Args:
+            df: DataFrame de jugadores
+            metrics: Métricas a planificar (None = las de position_weights)
+        
+        Returns:
+            Dict con las columnas 'source' (originales), 'per90' (a calcular)
+            y 'normalized' (columnas a normalizar, sin el sufijo)
+        """
+        numeric = set(df.select_dtypes(include=[np.number]).columns)
+        minutes_col = self.find_minutes_column(df.columns)
+        
+        plan = {'source': [], 'per90': [], 'normalized': []}
+        
+        if metrics is None:
+            metrics = [m for weights in self.position_weights.values() for m in weights]
+        
+        for metric in metrics:
+            if metric in plan['normalized']:
+                continue
+            
+            base = metric[:-len('_per90')] if metric.endswith('_per90') else None
+            
+            if metric in numeric:
+                source = metric
+            elif minutes_col and metric in ('Minutes_Played', '90s_Played'):
+                source = minutes_col
+            elif (minutes_col and base in numeric
+                  and base not in self.per90_excluded):
+                plan['per90'].append(base)
+                source = base
+            else:
+                # Métrica no disponible: se ignora, igual que en el scoring
+                continue
+            
+            if source not in plan['source']:
+                plan['source'].append(source)
+            plan['normalized'].append(metric)
+        
+        return plan
+    
+    def _normalize_matrix(self, values):
+        """
+        Recorte a 3 sigmas y escalado min-max de todas las columnas a la vez
+        
+        Args:
+            values: Array 2D (filas x métricas), sin valores nulos
+        """
+        params = fit_normalization(values, clip_sigma=3)
+        normalized = apply_normalization(
+            values, params, self.scaler.feature_range, constant_value=50
+        )
+        
+        return normalized
+    
     def normalize_stats(self, df, columns):
-        """Normalización mejorada"""
+        """Normalización mejorada (todas las columnas en un solo array 2D)"""
+        columns = [col for col in columns if col in df.columns]
         df_normalized = df.copy()
         
-        for col in columns:
-            if col in df.columns:
-                values = df[col].fillna(0).values.reshape(-1, 1)
-                mean = np.mean(values)
-                std = np.std(values)
-                values_clipped = np.clip(values, mean - 3*std, mean + 3*std)
-                
-                if values_clipped.max() > values_clipped.min():
-                    df_normalized[f'{col}_normalized'] = self.scaler.fit_transform(values_clipped)
-                else:
-                    df_normalized[f'{col}_normalized'] = 50
+        if not columns or len(df) == 0:
+            return df_normalized
+        
+        values = df[columns].fillna(0).to_numpy(dtype=float)
+        normalized = pd.DataFrame(
+            self._normalize_matrix(values),
+            columns=[f'{col}_normalized' for col in columns],
+            index=df.index
+        )
+        
+        existing = [col for col in normalized.columns if col in df_normalized.columns]
+        for col in existing:
+            df_normalized[col] = normalized[col]
         
-        return df_normalized
+        return pd.concat([df_normalized, normalized.drop(columns=existing)], axis=1)
+    
+    def normalize_percentiles(self, df, engine=None):
+        """
+        Normalización alternativa: percentil (0-100) de cada métrica dentro
+        de su cohorte (posición + self.percentile_cohorts)
+        
+        Args:
+            df: DataFrame con Position_Category
+            engine: PercentileEngine ya construido; si es None se construye
+                con este DataFrame
+        """
+        plan = self.build_metric_plan(df)
+        df = self.calculate_per_90_stats(df, columns=plan['per90'])
+        
+        if engine is None:
+            engine = PercentileEngine(plan['normalized'], self.percentile_cohorts).update(df)
+        
+        # Cohortes sin sketch: valor neutro, como las columnas constantes
+        percentiles = np.nan_to_num(engine.percentiles(df), nan=50)
+        normalized_cols = [f'{metric}_normalized' for metric in engine.metrics]
+        
+        return pd.concat([
+            df.drop(columns=[col for col in normalized_cols if col in df.columns]),
+            pd.DataFrame(percentiles, columns=normalized_cols, index=df.index)
+        ], axis=1)
     
     def calculate_position_score(self, row, position):
         """Cálculo mejorado con penalizaciones"""
@@ -142,38 +271,180 @@ class AdvancedPlayerScorer:
         
         return score
     
-    def score_players(self, df):
-        """Pipeline completo de scoring"""
+    def compile_weights(self, columns):
+        """
+        Compila position_weights en vectores de pesos por posición
+        
+        Args:
+            columns: Columnas disponibles en el DataFrame normalizado
+        
+        Returns:
+            Dict posición -> (columnas normalizadas, vector de pesos, peso total)
+        """
+        available = set(columns)
+        compiled = {}
+        
+        for position, weights in self.position_weights.items():
+            metric_cols = []
+            vector = []
+            for metric, weight in weights.items():
+                metric_col = f'{metric}_normalized'
+                if metric_col in available:
+                    metric_cols.append(metric_col)
+                    vector.append(weight)
+            
+            vector = np.array(vector, dtype=float)
+            compiled[position] = (metric_cols, vector, np.abs(vector).sum())
+        
+        return compiled
+    
+    def calculate_position_scores(self, df, compiled=None):
+        """
+        Cálculo vectorizado de scores: un producto matricial por grupo de posición
+        
+        Equivalente a aplicar calculate_position_score fila por fila.
+        """
+        if compiled is None:
+            compiled = self.compile_weights(df.columns)
+        
+        scores = np.zeros(len(df))
+        positions = df['Position_Category'].to_numpy()
+        
+        for position, (metric_cols, vector, total_weight) in compiled.items():
+            if position == 'Unknown' or total_weight == 0:
+                continue
+            
+            mask = positions == position
+            if not mask.any():
+                continue
+            
+            values = df.loc[mask, metric_cols].to_numpy(dtype=float)
+            group_scores = ((values @ vector / total_weight) * 100) + 50
+            scores[mask] = np.clip(group_scores, 0, 100)
+        
+        return pd.Series(scores, index=df.index)
+    
+    def score_players(self, df, full_output=False, normalization='minmax',
+                      percentile_engine=None):
+        """
+        Pipeline completo de scoring
+        
+        Args:
+            df: DataFrame de jugadores
+            full_output: Si es True, calcula y normaliza todas las columnas
+                numéricas (salida ancha). Por defecto solo se calculan las
+                columnas que necesitan los pesos configurados.
+            normalization: 'minmax' (recorte a 3 sigmas + min-max global) o
+                'percentile' (percentil dentro de la cohorte de posición)
+            percentile_engine: PercentileEngine ya construido (p. ej. por
+                chunks); si es None se construye con este DataFrame
+        
+        Con normalization='minmax' y sin full_output, llama a fit(df): la
+        referencia que hubiera en self.model_ (fit/load_model) se reemplaza
+        por la de este DataFrame. Para puntuar contra una referencia guardada
+        usar transform().
+        """
+        if normalization not in ('minmax', 'percentile'):
+            raise ValueError("normalization debe ser 'minmax' o 'percentile'")
+        
         print("🔄 Iniciando análisis avanzado...")
         
-        df['Position_Category'] = df['Pos'].apply(self.identify_position)
+        df['Position_Category'] = self.classify_positions(df['Pos'])
         print(f"✓ Posiciones identificadas")
         
-        df = self.calculate_per_90_stats(df)
-        print(f"✓ Estadísticas normalizadas por tiempo")
-        
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        df = self.normalize_stats(df, numeric_cols)
-        print(f"✓ Normalización completada")
+        if normalization == 'percentile':
+            df = self.normalize_percentiles(df, percentile_engine)
+            print(f"✓ Percentiles por cohorte calculados")
+            
+            df['Overall_Score'] = self.calculate_position_scores(df)
+            df['Rank'] = df['Overall_Score'].rank(ascending=False, method='min')
+        elif full_output:
+            df = self.calculate_per_90_stats(df)
+            print(f"✓ Estadísticas normalizadas por tiempo")
+            
+            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+            df = self.normalize_stats(df, numeric_cols)
+            print(f"✓ Normalización completada ({len(numeric_cols)} columnas)")
+            
+            df['Overall_Score'] = self.calculate_position_scores(df)
+            df['Rank'] = df['Overall_Score'].rank(ascending=False, method='min')
+        else:
+            # Solo las columnas que leen los pesos; la referencia queda
+            # ajustada en self.model_ para puntuar jugadores nuevos
+            self.fit(df)
+            print(f"✓ Estadísticas normalizadas por tiempo "
+                  f"({len(self.model_.params['per90'])} columnas por 90)")
+            print(f"✓ Normalización completada ({len(self.model_.columns)} columnas)")
+            
+            df = self.transform(df)
         
-        df['Overall_Score'] = df.apply(
-            lambda row: self.calculate_position_score(row, row['Position_Category']),
-            axis=1
-        )
         print(f"✓ Scores calculados")
         
-        df['Rank'] = df['Overall_Score'].rank(ascending=False, method='min')
-        
         print(f"\n✅ Análisis completado: {len(df)} jugadores procesados")
         
         return df
+    
+    def fit(self, df):
+        """
+        Ajusta la referencia de normalización sobre una población
+        
+        Captura los límites del recorte a 3 sigmas, los parámetros min-max y
+        el plan de pesos, para puntuar después cualquier lote con transform.
+        """
+        plan = self.build_metric_plan(df)
+        stats = ColumnStats(len(plan['normalized'])).update(self.plan_matrix(df, plan))
+        
+        return self.fit_from_stats(stats, plan, self.find_minutes_column(df.columns))
+    
+    def plan_matrix(self, df, plan):
+        """Matriz de las métricas del plan (con valores por 90 y nulos = 0)"""
+        df = self.calculate_per_90_stats(df, columns=plan['per90'])
+        return df.reindex(columns=plan['normalized']).fillna(0).to_numpy(dtype=float)
+    
+    def fit_from_stats(self, stats, plan, minutes_col):
+        """
+        Ajusta la referencia a partir de estadísticas acumuladas (ColumnStats)
+        sobre la matriz de plan_matrix, p. ej. chunk a chunk
+        """
+        self.model_ = ScoringModel.from_stats(
+            stats,
+            plan['normalized'],
+            self.position_weights,
+            scorer=type(self).__name__,
+            score_mode='advanced',
+            clip_sigma=3,
+            feature_range=self.scaler.feature_range,
+            constant_value=50,
+            per90=plan['per90'],
+            minutes_col=minutes_col
+        )
+        
+        return self
 
 
 # Ejemplo de uso
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scoring avanzado de jugadores')
+    parser.add_argument('--lake', help='Lee del almacén Parquet (p. ej. data/lake) '
+                                       'en lugar de data/raw/players_stats.csv')
+    parser.add_argument('--leagues', nargs='+', help='Ligas a puntuar (con --lake)')
+    parser.add_argument('--seasons', nargs='+', help='Temporadas a puntuar (con --lake)')
+    parser.add_argument('--stat-type', default='wide', help='Partición a leer (con --lake)')
+    args = parser.parse_args()
+    
     try:
-        df = pd.read_csv('data/raw/players_stats.csv')
         scorer = AdvancedPlayerScorer()
+        if args.lake:
+            from src.data_collection.data_lake import RawDataLake
+            
+            # Solo las particiones pedidas y las columnas que usan los pesos
+            df = RawDataLake(args.lake).load_for_scoring(
+                scorer, leagues=args.leagues, seasons=args.seasons, stat_type=args.stat_type
+            )
+            if df.empty:
+                raise FileNotFoundError(args.lake)
+        else:
+            df = pd.read_csv('data/raw/players_stats.csv')
         df_scored = scorer.score_players(df)
         
         print("\n" + "="*70)
@@ -186,6 +457,12 @@ if __name__ == "__main__":
         
         df_scored.to_csv('data/processed/players_advanced_scored.csv', index=False)
         print("\n✓ Resultados guardados en data/processed/players_advanced_scored.csv")
+        
+        # Copia compacta (tipos reducidos + Parquet) para recargas rápidas
+        try:
+            save_scored(df_scored, 'data/processed/players_advanced_scored.parquet')
+        except ImportError as error:
+            print(f"⚠️  {error}")
     except FileNotFoundError:
-        print("❌ No se encontró data/raw/players_stats.csv")
-        print("   Ejecuta primero: python src/data_collection/data_collector.py")
\ No newline at end of file
+        print(f"❌ No se encontró {args.lake or 'data/raw/players_stats.csv'}")
+        print("   Ejecuta primero: python -m src.data_collection.data_collector")
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+Arquetipos de jugadores por posición con MiniBatchKMeans
+
+Uso:
+    python -m src.analysis.archetypes data/processed/players_advanced_scored.csv \
+        --chunksize 200000 --report
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+
+
+class ArchetypeClusterer:
+    """
+    Agrupa a los jugadores de cada posición en arquetipos
+
+    El entrenamiento es incremental (partial_fit por chunks), así que puede
+    recorrer todas las temporadas históricas sin cargarlas a la vez. Los
+    centroides se guardan en JSON para asignar jugadores nuevos sin reentrenar.
+    """
+
+    def __init__(self, n_clusters=6, batch_size=4096, random_state=42):
+        if batch_size < n_clusters:
+            raise ValueError(
+                f"batch_size ({batch_size}) debe ser al menos n_clusters ({n_clusters})"
+            )
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.random_state = random_state
+        self.feature_columns = None
+        self.models = {}
+        self.centroids = {}
+        self._buffers = {}
+
+    def _features(self, df):
+        if self.feature_columns is None:
+            self.feature_columns = [col for col in df.columns if col.endswith('_normalized')]
+            if not self.feature_columns:
+                raise ValueError("El DataFrame no tiene columnas *_normalized: puntúalo primero")
+        return df.reindex(columns=self.feature_columns).fillna(0).to_numpy(dtype=float)
+
+    def _groups(self, df):
+        """Filas de cada posición (se omite 'Unknown')"""
+        positions = df['Position_Category'].astype(str).to_numpy()
+        for position in pd.unique(positions):
+            if position != 'Unknown':
+                yield position, np.flatnonzero(positions == position)
+
+    def partial_fit(self, df_scored):
+        """
+        Entrena con un chunk de jugadores puntuados
+
+        Las posiciones con menos filas que batch_size se acumulan hasta el
+        siguiente chunk (o hasta finalize).
+        """
+        features = self._features(df_scored)
+
+        for position, rows in self._groups(df_scored):
+            buffer = self._buffers.setdefault(position, [])
+            buffer.append(features[rows])
+            if sum(len(part) for part in buffer) >= self.batch_size:
+                # Se vacía antes de entrenar: _train puede devolver las filas
+                # al buffer si aún no alcanzan para n_clusters
+                self._buffers[position] = []
+                self._train(position, np.concatenate(buffer))
+
+        return self
+
+    def _train(self, position, values):
+        if position not in self.models:
+            if len(values) < self.n_clusters:
+                self._buffers.setdefault(position, []).append(values)
+                return
+            self.models[position] = MiniBatchKMeans(
+                n_clusters=self.n_clusters,
+                batch_size=self.batch_size,
+                random_state=self.random_state,
+                n_init=3
+            )
+
+        model = self.models[position]
+        for start in range(0, len(values), self.batch_size):
+            model.partial_fit(values[start:start + self.batch_size])
+        self.centroids[position] = model.cluster_centers_
+
+    def finalize(self):
+        """Entrena con lo que quede en los buffers"""
+        for position, buffer in list(self._buffers.items()):
+            if buffer:
+                self._buffers[position] = []
+                self._train(position, np.concatenate(buffer))
+        return self
+
+    def fit(self, df_scored):
+        """Entrena sobre un DataFrame completo"""
+        return self.partial_fit(df_scored).finalize()
+
+    def fit_chunks(self, chunks, epochs=1):
+        """
+        Entrena recorriendo chunks (p. ej. pd.read_csv(..., chunksize=...))
+
+        Args:
+            chunks: Función sin argumentos que devuelve un iterable de chunks
+                (se llama una vez por época)
+            epochs: Número de pasadas sobre los datos
+        """
+        for _ in range(epochs):
+            for chunk in chunks():
+                self.partial_fit(chunk)
+            self.finalize()
+        return self
+
+    def assign(self, df_scored):
+        """
+        Asigna arquetipo y distancia al centroide a cada jugador
+
+        Returns:
+            DataFrame con las columnas Archetype (p. ej. 'MF-2') y
+            Archetype_Distance
+        """
+        features = self._features(df_scored)
+        labels = np.full(len(df_scored), None, dtype=object)
+        distances = np.full(len(df_scored), np.nan)
+
+        for position, rows in self._groups(df_scored):
+            if position not in self.centroids:
+                continue
+            centroids = self.centroids[position]
+            values = features[rows]
+            # ||x - c||^2 = ||x||^2 - 2 x·c + ||c||^2
+            squared = ((values ** 2).sum(axis=1)[:, None]
+                       - 2 * values @ centroids.T
+                       + (centroids ** 2).sum(axis=1)[None, :])
+            nearest = squared.argmin(axis=1)
+            labels[rows] = [f'{position}-{label}' for label in nearest]
+            distances[rows] = np.sqrt(np.maximum(squared[np.arange(len(rows)), nearest], 0))
+
+        result = df_scored.copy()
+        result['Archetype'] = pd.Categorical(labels)
+        result['Archetype_Distance'] = distances
+        return result
+
+    def inertia(self, df_scored):
+        """Suma de distancias al cuadrado a los centroides asignados"""
+        distances = self.assign(df_scored)['Archetype_Distance'].to_numpy()
+        return float(np.nansum(distances ** 2))
+
+    def save(self, path):
+        """Guarda los centroides en JSON"""
+        data = {
+            'n_clusters': self.n_clusters,
+            'feature_columns': self.feature_columns,
+            'centroids': {position: c.tolist() for position, c in self.centroids.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        print(f"✓ Centroides guardados en {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Carga centroides guardados para asignar jugadores nuevos"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        clusterer = cls(n_clusters=data['n_clusters'])
+        clusterer.feature_columns = data['feature_columns']
+        clusterer.centroids = {
+            position: np.asarray(c, dtype=float) for position, c in data['centroids'].items()
+        }
+        return clusterer
+
+
+def report_batch_sizes(df_scored, batch_sizes=(256, 1024, 4096, 16384), n_clusters=6,
+                       include_full_kmeans=True):
+    """
+    Tiempo de entrenamiento e inercia para distintos tamaños de batch
+
+    Returns:
+        DataFrame con una fila por configuración
+    """
+    rows = []
+
+    for batch_size in batch_sizes:
+        clusterer = ArchetypeClusterer(n_clusters=n_clusters, batch_size=batch_size)
+        start = time.perf_counter()
+        clusterer.fit(df_scored)
+        seconds = time.perf_counter() - start
+        rows.append({'method': 'MiniBatchKMeans', 'batch_size': batch_size,
+                     'seconds': seconds, 'inertia': clusterer.inertia(df_scored)})
+
+    if include_full_kmeans:
+        clusterer = ArchetypeClusterer(n_clusters=n_clusters)
+        features = clusterer._features(df_scored)
+        start = time.perf_counter()
+        for position, group_rows in clusterer._groups(df_scored):
+            model = KMeans(n_clusters=n_clusters, n_init=3, random_state=42)
+            clusterer.centroids[position] = model.fit(features[group_rows]).cluster_centers_
+        seconds = time.perf_counter() - start
+        rows.append({'method': 'KMeans', 'batch_size': None,
+                     'seconds': seconds, 'inertia': clusterer.inertia(df_scored)})
+
+    return pd.DataFrame(rows)
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Arquetipos de jugadores')
+    parser.add_argument('scored', nargs='?', default='data/processed/players_advanced_scored.csv')
+    parser.add_argument('--clusters', type=int, default=6)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    parser.add_argument('--centroids', default='data/processed/archetype_centroids.json')
+    parser.add_argument('--report', action='store_true',
+                        help='Compara tiempos e inercia con distintos batch sizes')
+    args = parser.parse_args()
+
+    try:
+        clusterer = ArchetypeClusterer(n_clusters=args.clusters, batch_size=args.batch_size)
+        start = time.perf_counter()
+        clusterer.fit_chunks(lambda: pd.read_csv(args.scored, chunksize=args.chunksize))
+        print(f"✓ Arquetipos entrenados en {time.perf_counter() - start:.2f}s")
+        clusterer.save(args.centroids)
+
+        if args.report:
+            sample = pd.read_csv(args.scored, nrows=args.chunksize)
+            print("\n📊 Tiempo e inercia por batch size:")
+            print(report_batch_sizes(sample, n_clusters=args.clusters))
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.scored}")
+        print("   Ejecuta primero: python -m src.analysis.advanced_scorer")
@@ -0,0 +1,269 @@
+"""
+Scoring en paralelo de varias ligas (un players_stats.csv por competición)
+
+Uso:
+    python -m src.analysis.batch_scorer data/raw/ligas/ --output data/processed/ligas
+    python -m src.analysis.batch_scorer laliga.csv premier.csv --normalization per_league
+"""
+import argparse
+import copy
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+from src.analysis.scoring_model import ColumnStats, coerce_numeric, header_plan
+from src.data_collection.crawl_manifest import TABLES_DIR, CrawlManifest
+
+
+def discover_league_files(sources):
+    """
+    Lista los CSV de ligas a puntuar
+
+    Args:
+        sources: Directorio, archivo o lista de ambos
+
+    Returns:
+        Lista de tuplas (liga, ruta). La liga es el nombre del archivo, o el
+        de su carpeta si el archivo se llama players_stats.csv
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            # Se ignoran salidas de ejecuciones anteriores ({liga}_scored.csv)
+            # y las tablas intermedias del crawler (data/raw/tables)
+            paths.extend(sorted(
+                path for path in glob.glob(os.path.join(source, '**', '*.csv'), recursive=True)
+                if not path.endswith('_scored.csv')
+                and TABLES_DIR not in os.path.relpath(path, source).split(os.sep)[:-1]
+            ))
+        else:
+            paths.append(source)
+
+    leagues = []
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem == 'players_stats':
+            stem = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        leagues.append((stem, path))
+
+    return leagues
+
+
+def _league_stats_task(league, path, scorer, plan):
+    """Primera fase (normalización compartida): estadísticas de una liga"""
+    start = time.perf_counter()
+    df = coerce_numeric(pd.read_csv(path), plan['source'])
+    stats = ColumnStats(len(plan['normalized'])).update(scorer.plan_matrix(df, plan))
+
+    return {
+        'league': league,
+        'phase': 'stats',
+        'pid': os.getpid(),
+        'rows': len(df),
+        'seconds': time.perf_counter() - start,
+        'stats': stats,
+        'minutes_col': scorer.find_minutes_column(df.columns),
+    }
+
+
+def _league_score_task(league, path, scorer, output_dir, per_league):
+    """Segunda fase: normaliza (si es por liga), puntúa y guarda una liga"""
+    start = time.perf_counter()
+    df = pd.read_csv(path)
+
+    if per_league:
+        scorer = copy.deepcopy(scorer)
+        scorer.fit(df)
+    model = scorer.model_
+    scored = scorer.transform(coerce_numeric(df, model.params['per90'] + model.columns))
+    scored = scored.drop(columns=['League'], errors='ignore')
+    scored.insert(0, 'League', league)
+
+    if output_dir:
+        scored.to_csv(os.path.join(output_dir, f'{league}_scored.csv'), index=False)
+
+    return {
+        'league': league,
+        'phase': 'score',
+        'pid': os.getpid(),
+        'rows': len(df),
+        'seconds': time.perf_counter() - start,
+        'scored': scored,
+    }
+
+
+class BatchScorer:
+    """
+    Puntúa varias ligas en paralelo con un pool de procesos
+
+    Modos de normalización:
+    - 'shared': una referencia común para todas las ligas. Se usa el
+      modelo congelado si se pasó uno (model=); si no, se ajusta combinando
+      las estadísticas de cada liga calculadas en paralelo. El model_ que el
+      scorer haya dejado al puntuar otro DataFrame no se reutiliza.
+    - 'per_league': cada liga se normaliza contra sí misma.
+    """
+
+    def __init__(self, scorer=None, workers=None, model=None):
+        """
+        Args:
+            scorer: AdvancedPlayerScorer (uno nuevo si es None)
+            workers: Procesos del pool (por defecto, los núcleos)
+            model: Ruta de una referencia guardada con save_model, que se
+                usa congelada en la normalización compartida
+        """
+        self.scorer = scorer or AdvancedPlayerScorer()
+        self.workers = workers or os.cpu_count() or 1
+        self.timings = []
+        self.frozen = model is not None
+        if self.frozen:
+            self.scorer.load_model(model)
+
+    def _run(self, task, jobs):
+        """Ejecuta las tareas en el pool; si no es posible, en este proceso"""
+        if self.workers > 1 and len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                    futures = [pool.submit(task, *job) for job in jobs]
+                    return [future.result() for future in futures]
+            except (BrokenProcessPool, OSError, NotImplementedError, PermissionError) as e:
+                print(f"⚠️ Pool de procesos no disponible ({e}), se continúa en un solo proceso")
+
+        return [task(*job) for job in jobs]
+
+    def fit_shared(self, leagues):
+        """Ajusta una referencia común combinando las estadísticas de cada liga"""
+        # El plan sale de la unión de las cabeceras de todas las ligas (una
+        # métrica que solo tiene una liga también entra en la referencia);
+        # los valores que no son números se leen como NaN en cada liga
+        columns = []
+        for _, path in leagues:
+            header = pd.read_csv(path, nrows=0).columns
+            columns.extend(col for col in header if col not in columns)
+        plan = header_plan(self.scorer, columns)
+
+        results = self._run(_league_stats_task,
+                            [(league, path, self.scorer, plan) for league, path in leagues])
+        self.timings.extend(results)
+
+        stats = ColumnStats(len(plan['normalized']))
+        for result in results:
+            stats.merge(result['stats'])
+
+        # Columna de minutos de referencia: la primera liga que tenga una
+        minutes_cols = [result['minutes_col'] for result in results if result['minutes_col']]
+        if len(set(minutes_cols)) > 1:
+            print(f"⚠️ Las ligas usan distintas columnas de minutos "
+                  f"({', '.join(sorted(set(minutes_cols)))}); se toma {minutes_cols[0]}")
+        self.scorer.fit_from_stats(stats, plan, minutes_cols[0] if minutes_cols else None)
+        return self.scorer.model_
+
+    def score_leagues(self, sources, output_dir='data/processed/leagues',
+                      normalization='shared', only=None):
+        """
+        Puntúa todas las ligas y genera las salidas por liga y combinada
+
+        Args:
+            sources: Directorio, archivo o lista de CSV de ligas
+            output_dir: Carpeta para {liga}_scored.csv y combined_scored.csv
+            normalization: 'shared' o 'per_league'
+            only: Nombres de las ligas a volver a puntuar (p. ej. las que
+                cambiaron según CrawlManifest). Las demás reutilizan su
+                {liga}_scored.csv. Solo se respeta si la referencia no depende
+                de las otras ligas ('per_league' o modelo congelado).
+
+        Returns:
+            DataFrame combinado con League, League_Rank y Rank global
+        """
+        if normalization not in ('shared', 'per_league'):
+            raise ValueError("normalization debe ser 'shared' o 'per_league'")
+
+        leagues = discover_league_files(sources)
+        if not leagues:
+            raise FileNotFoundError(f"No se encontraron CSV de ligas en {sources}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.timings = []
+
+        per_league = normalization == 'per_league'
+        if only is not None and not per_league and not self.frozen:
+            # Una referencia nueva cambia el score de todas las ligas
+            print("⚠️ Normalización compartida sin modelo congelado: se puntúan todas las ligas")
+            only = None
+        if not per_league and not self.frozen:
+            self.fit_shared(leagues)
+
+        reused = []
+        if only is not None:
+            only = set(only)
+            to_score = []
+            for league, path in leagues:
+                scored_path = os.path.join(output_dir, f'{league}_scored.csv')
+                if league not in only and os.path.exists(scored_path):
+                    reused.append(pd.read_csv(scored_path))
+                else:
+                    to_score.append((league, path))
+            leagues = to_score
+            print(f"🔄 {len(leagues)} ligas con cambios, {len(reused)} sin cambios")
+
+        results = self._run(_league_score_task, [
+            (league, path, self.scorer, output_dir, per_league) for league, path in leagues
+        ])
+        self.timings.extend(results)
+
+        combined = pd.concat([result.pop('scored') for result in results] + reused,
+                             ignore_index=True)
+        combined = combined.rename(columns={'Rank': 'League_Rank'})
+        combined['Rank'] = combined['Overall_Score'].rank(ascending=False, method='min')
+        combined.to_csv(os.path.join(output_dir, 'combined_scored.csv'), index=False)
+
+        return combined
+
+    def print_timings(self):
+        """Tiempos por liga y proceso"""
+        print(f"\n{'Fase':<6} {'Liga':<30} {'PID':>8} {'Filas':>10} {'Tiempo (s)':>11}")
+        for timing in self.timings:
+            print(f"{timing['phase']:<6} {timing['league'][:30]:<30} {timing['pid']:>8} "
+                  f"{timing['rows']:>10,} {timing['seconds']:>11.2f}")
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scoring en paralelo de varias ligas')
+    parser.add_argument('sources', nargs='+', help='Directorio o archivos CSV de ligas')
+    parser.add_argument('--output', default='data/processed/leagues')
+    parser.add_argument('--normalization', choices=['shared', 'per_league'], default='shared')
+    parser.add_argument('--model', help='Referencia congelada (JSON) para la normalización compartida')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--manifest', help='Solo vuelve a puntuar las ligas con datos nuevos '
+                                           'según el manifiesto del crawler')
+    args = parser.parse_args()
+
+    batch = BatchScorer(workers=args.workers, model=args.model)
+    print(f"🔄 Puntuando ligas con {batch.workers} procesos...")
+
+    start = time.perf_counter()
+    manifest = CrawlManifest(args.manifest) if args.manifest else None
+    only = manifest.dirty_names() if manifest is not None else None
+
+    try:
+        combined = batch.score_leagues(args.sources, args.output, args.normalization, only=only)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+    else:
+        if manifest is not None:
+            manifest.mark_scored(combined['League'].unique())
+        batch.print_timings()
+
+        print("\n🏆 TOP 10 GENERAL:")
+        print(combined.nsmallest(10, 'Rank')[['League', 'Player', 'Squad', 'Overall_Score', 'Rank']])
+        print(f"\n✅ {len(combined):,} jugadores de {combined['League'].nunique()} ligas "
+              f"en {time.perf_counter() - start:.2f}s → {args.output}")
@@ -0,0 +1,169 @@
+"""
+Almacenamiento compacto de DataFrames puntuados (tipos reducidos + Parquet/Feather)
+
+Uso:
+    python -m src.analysis.compact_storage data/processed/players_advanced_scored.csv \
+        --output data/processed/players_advanced_scored.parquet
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Formatos binarios por extensión (ambos requieren pyarrow)
+BINARY_FORMATS = {'.parquet': 'parquet', '.feather': 'feather'}
+
+
+def compact_frame(df, rtol=1e-6, max_category_ratio=0.5):
+    """
+    Reduce la memoria de un DataFrame sin perder información relevante
+
+    - Floats con solo valores enteros (sin nulos) -> entero más pequeño posible
+    - Resto de floats -> float32 si el error relativo es menor que rtol
+    - Enteros -> entero más pequeño posible (int8/int16/...)
+    - Textos repetidos (Pos, Squad, Nation...) -> category
+
+    Args:
+        df: DataFrame (p. ej. salida de score_players)
+        rtol: Error relativo máximo aceptado al pasar a float32
+        max_category_ratio: Proporción máxima de valores distintos para
+            convertir una columna de texto en categoría
+
+    Returns:
+        Nuevo DataFrame compacto
+    """
+    columns = {}
+
+    for col in df.columns:
+        series = df[col]
+
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            columns[col] = series
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy(dtype=float)
+            finite = values[np.isfinite(values)]
+            if len(finite) == len(values) and np.array_equal(finite, np.round(finite)):
+                columns[col] = pd.to_numeric(series.astype(np.int64), downcast='integer')
+            else:
+                as_float32 = values.astype(np.float32)
+                with np.errstate(over='ignore', invalid='ignore'):
+                    error = np.abs(as_float32[np.isfinite(values)] - finite)
+                    within = np.all(error <= rtol * np.maximum(np.abs(finite), 1.0))
+                columns[col] = series.astype(np.float32) if within else series
+        elif pd.api.types.is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            n_unique = series.nunique(dropna=True)
+            if len(series) and n_unique <= max_category_ratio * len(series):
+                columns[col] = series.astype('category')
+            else:
+                columns[col] = series
+        else:
+            columns[col] = series
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_mb(df):
+    """Memoria real del DataFrame (incluye los objetos de texto) en MB"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def _format(path):
+    return BINARY_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Los formatos Parquet/Feather necesitan pyarrow: pip install pyarrow"
+        )
+
+
+def save_scored(df, path, compact=True):
+    """
+    Guarda un DataFrame puntuado; el formato se elige por la extensión
+    (.parquet, .feather o .csv)
+
+    Args:
+        df: DataFrame puntuado
+        path: Ruta de salida
+        compact: Si es True se aplica compact_frame antes de guardar
+    """
+    if compact:
+        df = compact_frame(df)
+
+    file_format = _format(path)
+    if file_format == 'parquet':
+        _require_pyarrow()
+        df.to_parquet(path, index=False)
+    elif file_format == 'feather':
+        _require_pyarrow()
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+
+    print(f"✓ Resultados guardados en {path}")
+    return df
+
+
+def _file_columns(path, file_format):
+    """Columnas de un archivo sin leer los datos (esquema o cabecera del CSV)"""
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if file_format == 'feather':
+        import pyarrow.ipc as ipc
+        return ipc.open_file(path).schema.names
+    return pd.read_csv(path, nrows=0).columns
+
+
+def load_scored(path, columns=None, compact=False):
+    """
+    Carga un DataFrame puntuado leyendo solo las columnas pedidas
+
+    Args:
+        path: Ruta (.parquet, .feather o .csv)
+        columns: Lista de columnas a leer (None = todas). En Parquet y Feather
+            las demás columnas no se leen del disco. Las que no estén en el
+            archivo se omiten (p. ej. Age en resultados sin edad).
+        compact: Aplica compact_frame tras leer (útil con CSV; los formatos
+            binarios ya conservan los tipos compactos)
+    """
+    file_format = _format(path)
+    if file_format in BINARY_FORMATS.values():
+        _require_pyarrow()
+    if columns is not None:
+        available = set(_file_columns(path, file_format))
+        columns = [col for col in columns if col in available]
+
+    if file_format == 'parquet':
+        df = pd.read_parquet(path, columns=columns)
+    elif file_format == 'feather':
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+
+    return compact_frame(df) if compact else df
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convierte un CSV puntuado a formato compacto')
+    parser.add_argument('scored', nargs='?', default='data/processed/players_advanced_scored.csv')
+    parser.add_argument('--output', default='data/processed/players_advanced_scored.parquet')
+    args = parser.parse_args()
+
+    try:
+        df_scored = pd.read_csv(args.scored)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.scored}")
+        print("   Ejecuta primero: python -m src.analysis.advanced_scorer")
+    else:
+        compact = save_scored(df_scored, args.output)
+        print(f"📊 Memoria: {memory_mb(df_scored):.1f} MB -> {memory_mb(compact):.1f} MB")
+        print(f"📊 Disco: {os.path.getsize(args.scored) / 1024 ** 2:.1f} MB -> "
+              f"{os.path.getsize(args.output) / 1024 ** 2:.1f} MB")
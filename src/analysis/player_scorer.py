@@ -2,7 +2,10 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
 
-class PlayerScorer:
+from src.analysis.position_classifier import PositionClassifier
+from src.analysis.scoring_model import ScoringModel, ScoringModelMixin
+
+class PlayerScorer(ScoringModelMixin):
     """
     Sistema de puntuación para jugadores según posición
     """
@@ -40,6 +43,11 @@ class PlayerScorer:
                 'distribution': 0.20
             }
         }
+        
+        # Referencia de normalización congelada (ver fit/transform)
+        self.model_ = None
+        
+        self.position_classifier = PositionClassifier(self.identify_position)
     
     def normalize_stats(self, df, columns):
         """
@@ -78,6 +86,16 @@ class PlayerScorer:
         else:
             return 'Unknown'
     
+    def classify_positions(self, positions, multi=False):
+        """
+        Clasifica una columna Pos completa (una vez por valor distinto)
+        
+        Args:
+            positions: Series con la columna Pos
+            multi: Si es True devuelve también Position_Secondary
+        """
+        return self.position_classifier.classify(positions, multi=multi)
+    
     def calculate_position_score(self, row, position):
         """
         Calcula el score para una posición específica
@@ -108,7 +126,7 @@ class PlayerScorer:
         Calcula scores para todos los jugadores
         """
         # Identificar posiciones
-        df['Position_Category'] = df['Pos'].apply(self.identify_position)
+        df['Position_Category'] = self.classify_positions(df['Pos'])
         
         # Identificar columnas numéricas para normalizar
         numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -127,6 +145,28 @@ class PlayerScorer:
         
         return df_scored
     
+    def fit(self, df):
+        """
+        Ajusta la referencia de normalización (min-max) sobre una población
+        """
+        numeric = set(df.select_dtypes(include=[np.number]).columns)
+        columns = []
+        for weights in self.position_weights.values():
+            for metric in weights:
+                if metric in numeric and metric not in columns:
+                    columns.append(metric)
+        
+        values = df[columns].fillna(0).to_numpy(dtype=float)
+        self.model_ = ScoringModel.fit(
+            values,
+            columns,
+            self.position_weights,
+            scorer=type(self).__name__,
+            score_mode='classic'
+        )
+        
+        return self
+    
     def get_top_players(self, df_scored, position=None, top_n=10):
         """
         Obtiene los mejores jugadores
@@ -162,4 +202,4 @@ if __name__ == "__main__":
         print("\n✓ Resultados guardados en data/processed/players_scored.csv")
     except FileNotFoundError:
         print("❌ No se encontró data/raw/players_stats.csv")
-        print("   Ejecuta primero: python src/data_collection/data_collector.py")
\ No newline at end of file
+        print("   Ejecuta primero: python -m src.data_collection.data_collector")
\ No newline at end of file
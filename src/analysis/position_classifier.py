@@ -0,0 +1,100 @@
+import re
+import numpy as np
+import pandas as pd
+
+POSITION_CATEGORIES = ['FW', 'MF', 'DF', 'GK', 'Unknown']
+
+
+class PositionClassifier:
+    """
+    Clasificación de posiciones por valor único
+
+    La columna Pos de FBref tiene pocas decenas de valores distintos
+    ("FW,MF", "DF,MF", ...): cada valor se clasifica una sola vez y el
+    resultado se propaga a todas las filas como columna categórica.
+    """
+
+    def __init__(self, identify_position, categories=None):
+        """
+        Args:
+            identify_position: Función que clasifica un string de posición
+                (p. ej. AdvancedPlayerScorer.identify_position)
+            categories: Categorías posibles, con 'Unknown' al final (None =
+                POSITION_CATEGORIES)
+        """
+        self.identify_position = identify_position
+        self.categories = list(categories or POSITION_CATEGORIES)
+        self._cache = {}
+
+    def _roles(self, pos_string):
+        """Posición principal y secundaria de un valor (memorizado)"""
+        if pos_string not in self._cache:
+            primary = self.identify_position(pos_string)
+            secondary = 'Unknown'
+
+            for token in re.split(r'[,/\s]+', str(pos_string)):
+                if not token:
+                    continue
+                role = self.identify_position(token)
+                if role not in ('Unknown', primary):
+                    secondary = role
+                    break
+
+            self._cache[pos_string] = (primary, secondary)
+
+        return self._cache[pos_string]
+
+    def classify(self, positions, multi=False):
+        """
+        Clasifica una columna de posiciones
+
+        Args:
+            positions: Series con la columna Pos
+            multi: Si es True devuelve también la posición secundaria
+
+        Returns:
+            Series categórica (Position_Category) o, con multi=True, DataFrame
+            con Position_Category y Position_Secondary
+        """
+        codes, uniques = pd.factorize(positions)
+
+        def to_categorical(role_index, name):
+            return pd.Series(
+                pd.Categorical.from_codes(
+                    self.category_codes(codes, uniques, role_index),
+                    categories=self.categories
+                ),
+                index=positions.index,
+                name=name
+            )
+
+        primary = to_categorical(0, 'Position_Category')
+        if not multi:
+            return primary
+
+        return pd.concat([primary, to_categorical(1, 'Position_Secondary')], axis=1)
+
+    def category_codes(self, codes, uniques, role_index=0):
+        """
+        Índice en self.categories de cada fila a partir de pd.factorize
+
+        Permite reutilizar una sola factorización de Pos entre varios
+        clasificadores.
+
+        Args:
+            codes, uniques: Resultado de pd.factorize sobre la columna Pos
+            role_index: 0 = posición principal, 1 = secundaria
+        """
+        category_codes = {category: i for i, category in enumerate(self.categories)}
+        mapping = []
+        for value in uniques:
+            role = self._roles(value)[role_index]
+            if role not in category_codes:
+                raise ValueError(
+                    f"identify_position devolvió '{role}' para '{value}', que no está "
+                    f"entre las categorías {self.categories}"
+                )
+            mapping.append(category_codes[role])
+        # Código -1 de factorize (nulos) -> 'Unknown', el último de la lista
+        mapping.append(category_codes['Unknown'])
+        return np.asarray(mapping)[codes]
@@ -0,0 +1,242 @@
+"""
+Percentiles por posición y cohorte con sketches de cuantiles (tipo KLL)
+
+Uso:
+    python -m src.analysis.quantile_sketch data/raw/players_stats.csv \
+        --cohort League Season --chunksize 200000
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """
+    Sketch de cuantiles de memoria acotada (Karnin, Lang y Liberty)
+
+    Los valores se guardan en niveles; cuando un nivel se llena se ordena
+    y se promueve uno de cada dos elementos al nivel siguiente, donde pesa
+    el doble. La memoria es O(k log(n/k)) y los sketches se pueden combinar
+    (merge) entre chunks y procesos. Mientras n <= k el resultado es exacto.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+
+                items = np.sort(items)
+                # Con un número impar de elementos, el último se queda en este nivel
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """Agrega un array de valores (los nulos se ignoran)"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Combina otro sketch (de otro chunk o proceso) en este"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def rank(self, values):
+        """
+        Fracción estimada de valores por debajo de cada valor (0-1)
+
+        Los empates cuentan la mitad, como un rango medio.
+        """
+        values = np.asarray(values, dtype=float)
+        if self.n == 0:
+            return np.full(values.shape, np.nan)
+
+        below = np.zeros(values.shape)
+        for level, items in enumerate(self.levels):
+            if len(items) == 0:
+                continue
+            items = np.sort(items)
+            self.levels[level] = items
+            left = np.searchsorted(items, values, side='left')
+            right = np.searchsorted(items, values, side='right')
+            below += (left + right) / 2 * (2 ** level)
+
+        total = sum(len(items) * 2 ** level for level, items in enumerate(self.levels))
+        return below / total
+
+    def quantile(self, q):
+        """Valor estimado para el cuantil q (0-1)"""
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return np.nan
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order]) / weights.sum()
+        return items[order][min(np.searchsorted(cumulative, q), len(items) - 1)]
+
+    def to_dict(self):
+        return {'k': self.k, 'n': self.n, 'levels': [items.tolist() for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data['k'])
+        sketch.n = data['n']
+        sketch.levels = [np.asarray(items, dtype=float) for items in data['levels']]
+        return sketch
+
+
+class PercentileEngine:
+    """
+    Percentiles de cada métrica dentro de su cohorte de posición
+
+    Mantiene un KLLSketch por (posición, métrica, cohorte), donde la cohorte
+    es la combinación de columnas como League y Season. Se construye por
+    chunks, se combina entre procesos y se serializa a JSON.
+    """
+
+    def __init__(self, metrics, cohort_columns=('League', 'Season'), k=200):
+        self.metrics = list(metrics)
+        self.cohort_columns = list(cohort_columns)
+        self.k = k
+        self.sketches = {}
+
+    def _groups(self, df):
+        """Filas de cada (posición, cohorte) presentes en el DataFrame"""
+        columns = ['Position_Category'] + [col for col in self.cohort_columns if col in df.columns]
+        keys = df[columns].astype(str)
+        for key, index in keys.groupby(columns, sort=False).indices.items():
+            key = key if isinstance(key, tuple) else (key,)
+            yield key[0], '|'.join(key[1:]), index
+
+    def update(self, df):
+        """
+        Agrega un chunk (necesita Position_Category y las columnas de métricas;
+        los nulos cuentan como 0, igual que en la normalización min-max)
+        """
+        values = df.reindex(columns=self.metrics).fillna(0).to_numpy(dtype=float)
+        for position, cohort, rows in self._groups(df):
+            for i, metric in enumerate(self.metrics):
+                key = (position, metric, cohort)
+                if key not in self.sketches:
+                    self.sketches[key] = KLLSketch(self.k)
+                self.sketches[key].update(values[rows, i])
+        return self
+
+    def merge(self, other):
+        """Combina otro motor (p. ej. de otro proceso)"""
+        for key, sketch in other.sketches.items():
+            if key in self.sketches:
+                self.sketches[key].merge(sketch)
+            else:
+                self.sketches[key] = sketch
+        return self
+
+    def percentiles(self, df):
+        """
+        Percentil (0-100) de cada métrica dentro de su cohorte
+
+        Returns:
+            Array (filas x métricas); NaN si la cohorte no tiene sketch
+        """
+        values = df.reindex(columns=self.metrics).fillna(0).to_numpy(dtype=float)
+        result = np.full(values.shape, np.nan)
+
+        for position, cohort, rows in self._groups(df):
+            for i, metric in enumerate(self.metrics):
+                sketch = self.sketches.get((position, metric, cohort))
+                if sketch is not None:
+                    result[rows, i] = sketch.rank(values[rows, i]) * 100
+
+        return result
+
+    def save(self, path):
+        data = {
+            'metrics': self.metrics,
+            'cohort_columns': self.cohort_columns,
+            'k': self.k,
+            'sketches': [
+                {'position': p, 'metric': m, 'cohort': c, 'sketch': s.to_dict()}
+                for (p, m, c), s in self.sketches.items()
+            ],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        print(f"✓ Sketches de percentiles guardados en {path}")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        engine = cls(data['metrics'], data['cohort_columns'], data['k'])
+        for item in data['sketches']:
+            key = (item['position'], item['metric'], item['cohort'])
+            engine.sketches[key] = KLLSketch.from_dict(item['sketch'])
+        return engine
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    from src.analysis.advanced_scorer import AdvancedPlayerScorer
+    from src.analysis.scoring_model import coerce_numeric, header_plan
+
+    parser = argparse.ArgumentParser(description='Sketches de percentiles por cohorte')
+    parser.add_argument('input', nargs='?', default='data/raw/players_stats.csv')
+    parser.add_argument('--cohort', nargs='*', default=['League', 'Season'])
+    parser.add_argument('--chunksize', type=int, default=200_000)
+    parser.add_argument('--output', default='data/processed/percentile_sketches.json')
+    args = parser.parse_args()
+
+    scorer = AdvancedPlayerScorer()
+    n_rows = 0
+    try:
+        # Mismo plan que StreamingScorer: sale de la cabecera, no del primer chunk
+        plan = header_plan(scorer, pd.read_csv(args.input, nrows=0).columns)
+        engine = PercentileEngine(plan['normalized'], args.cohort)
+        for chunk in pd.read_csv(args.input, chunksize=args.chunksize):
+            chunk = coerce_numeric(chunk, plan['source'])
+            chunk['Position_Category'] = scorer.classify_positions(chunk['Pos'])
+            chunk = scorer.calculate_per_90_stats(chunk, columns=plan['per90'])
+            engine.update(chunk)
+            n_rows += len(chunk)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.input}")
+        print("   Ejecuta primero: python -m src.data_collection.data_collector")
+    else:
+        if n_rows == 0:
+            print(f"⚠️  {args.input} no tiene filas: no se generaron sketches")
+        else:
+            print(f"✓ {len(engine.sketches)} sketches (posición x métrica x cohorte)")
+            engine.save(args.output)
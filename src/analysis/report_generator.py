@@ -3,6 +3,11 @@ import json
 from datetime import datetime
 import os
 
+from src.analysis.compact_storage import load_scored
+
+# Columnas que usan los reportes (el resto no se lee del disco)
+REPORT_COLUMNS = ['Player', 'Pos', 'Squad', 'Age', 'Overall_Score', 'Rank']
+
 class ScoutingReportGenerator:
     """
     Genera reportes profesionales de scouting
@@ -76,7 +81,11 @@ class ScoutingReportGenerator:
 # Ejemplo de uso
 if __name__ == "__main__":
     try:
-        df = pd.read_csv('data/processed/players_advanced_scored.csv')
+        # La copia Parquet permite leer solo las columnas del reporte
+        path = 'data/processed/players_advanced_scored.parquet'
+        if not os.path.exists(path):
+            path = 'data/processed/players_advanced_scored.csv'
+        df = load_scored(path, columns=REPORT_COLUMNS)
         reporter = ScoutingReportGenerator(df)
         
         top_player = df.nlargest(1, 'Overall_Score').iloc[0]['Player']
@@ -88,4 +97,4 @@ if __name__ == "__main__":
         print("\n✅ Reportes generados exitosamente")
     except FileNotFoundError:
         print("❌ No se encontró data/processed/players_advanced_scored.csv")
-        print("   Ejecuta primero: python src/analysis/advanced_scorer.py")
\ No newline at end of file
+        print("   Ejecuta primero: python -m src.analysis.advanced_scorer")
\ No newline at end of file
@@ -0,0 +1,452 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class ColumnStats:
+    """
+    Estadísticas acumulables por columna (conteo, media, M2, mínimo, máximo)
+
+    Los datos se acumulan en bloques de tamaño fijo, así el resultado es
+    idéntico tanto si la matriz llega completa como si llega por chunks.
+    """
+
+    BLOCK_ROWS = 65536
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean_ = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min_ = np.full(n_columns, np.inf)
+        self.max_ = np.full(n_columns, -np.inf)
+        self._pending = []
+        self._pending_rows = 0
+
+    def update(self, values):
+        """Agrega un chunk (array 2D filas x columnas, sin valores nulos)"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return self
+
+        self.min_ = np.minimum(self.min_, values.min(axis=0))
+        self.max_ = np.maximum(self.max_, values.max(axis=0))
+
+        self._pending.append(values)
+        self._pending_rows += len(values)
+
+        if self._pending_rows >= self.BLOCK_ROWS:
+            pending = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+            n_full = (len(pending) // self.BLOCK_ROWS) * self.BLOCK_ROWS
+            for start in range(0, n_full, self.BLOCK_ROWS):
+                self._merge_block(pending[start:start + self.BLOCK_ROWS])
+            rest = pending[n_full:]
+            self._pending = [rest] if len(rest) else []
+            self._pending_rows = len(rest)
+
+        return self
+
+    def _flush(self):
+        if self._pending_rows:
+            pending = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+            self._merge_block(pending)
+            self._pending = []
+            self._pending_rows = 0
+
+    def _merge_block(self, block):
+        block = np.ascontiguousarray(block)
+        n_block = len(block)
+        mean_block = block.mean(axis=0)
+        deviations = block - mean_block
+        m2_block = (deviations * deviations).sum(axis=0)
+        self._merge_moments(n_block, mean_block, m2_block)
+
+    def _merge_moments(self, n_other, mean_other, m2_other):
+        # Fórmula de Chan et al. para combinar medias y varianzas
+        if self.count == 0:
+            self.count = n_other
+            self.mean_ = mean_other.copy()
+            self.m2 = m2_other.copy()
+            return
+
+        total = self.count + n_other
+        delta = mean_other - self.mean_
+        self.mean_ = self.mean_ + delta * (n_other / total)
+        self.m2 = self.m2 + m2_other + delta * delta * (self.count * n_other / total)
+        self.count = total
+
+    def merge(self, other):
+        """Combina las estadísticas de otro acumulador (otro chunk o proceso)"""
+        self._flush()
+        other._flush()
+        self.min_ = np.minimum(self.min_, other.min_)
+        self.max_ = np.maximum(self.max_, other.max_)
+        if other.count:
+            self._merge_moments(other.count, other.mean_, other.m2)
+        return self
+
+    @property
+    def mean(self):
+        self._flush()
+        return self.mean_
+
+    @property
+    def std(self):
+        self._flush()
+        return np.sqrt(self.m2 / self.count)
+
+    @property
+    def n_rows(self):
+        return self.count + self._pending_rows
+
+
+def normalization_from_stats(stats, clip_sigma=None):
+    """
+    Parámetros de recorte y min-max a partir de un ColumnStats
+
+    El mínimo y el máximo tras el recorte se obtienen recortando el mínimo
+    y el máximo originales (el recorte es monótono).
+    """
+    if stats.n_rows == 0:
+        raise ValueError("Se necesita al menos un jugador para ajustar la normalización")
+
+    if clip_sigma is not None:
+        mean, std = stats.mean, stats.std
+        clip_lower = mean - clip_sigma*std
+        clip_upper = mean + clip_sigma*std
+        data_min = np.clip(stats.min_, clip_lower, clip_upper)
+        data_max = np.clip(stats.max_, clip_lower, clip_upper)
+    else:
+        clip_lower = clip_upper = None
+        data_min, data_max = stats.min_, stats.max_
+
+    return {
+        'clip_lower': clip_lower,
+        'clip_upper': clip_upper,
+        'data_min': data_min,
+        'data_max': data_max,
+    }
+
+
+def fit_normalization(values, clip_sigma=None):
+    """
+    Calcula los parámetros de recorte y min-max de cada columna
+
+    Args:
+        values: Array 2D (filas x métricas), sin valores nulos
+        clip_sigma: Número de desviaciones estándar para recortar (None = sin recorte)
+
+    Returns:
+        Dict con 'clip_lower', 'clip_upper', 'data_min' y 'data_max'
+    """
+    stats = ColumnStats(values.shape[1]).update(values)
+    return normalization_from_stats(stats, clip_sigma)
+
+
+def apply_normalization(values, params, feature_range=(0, 100), constant_value=None,
+                        clip_to_range=False):
+    """
+    Recorta y escala un array 2D con parámetros ya calculados
+
+    Args:
+        values: Array 2D (filas x métricas), sin valores nulos
+        params: Parámetros devueltos por fit_normalization
+        feature_range: Rango de salida (como MinMaxScaler)
+        constant_value: Valor para columnas constantes (None = mínimo del rango)
+        clip_to_range: Recorta la salida al rango (para datos fuera de la referencia)
+    """
+    low, high = feature_range
+
+    if params['clip_lower'] is not None:
+        values = np.clip(values, params['clip_lower'], params['clip_upper'])
+
+    data_min = params['data_min']
+    data_range = params['data_max'] - data_min
+    constant = ~(data_range > 0)
+
+    # Misma fórmula que MinMaxScaler: X * scale + min
+    scale = (high - low) / np.where(constant, 1, data_range)
+    normalized = values * scale + (low - data_min * scale)
+
+    if clip_to_range:
+        np.clip(normalized, low, high, out=normalized)
+
+    normalized[:, constant] = low if constant_value is None else constant_value
+
+    return normalized
+
+
+def coerce_numeric(df, columns):
+    """
+    Convierte a número (texto -> NaN) las columnas indicadas que un CSV leyó
+    como texto; modifica df y lo devuelve
+    """
+    for col in columns:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def header_plan(scorer, columns):
+    """
+    Plan de métricas a partir solo de los nombres de columna: toda columna
+    que piden los pesos se trata como numérica (cada lote se convierte
+    después con coerce_numeric)
+    """
+    header = pd.DataFrame({col: pd.Series(dtype=float) for col in columns})
+    return scorer.build_metric_plan(header)
+
+
+class ScoringModel:
+    """
+    Referencia de normalización congelada: se ajusta una vez sobre una
+    población y puntúa cualquier lote (incluso un solo jugador) sin
+    volver a leer los datos de referencia
+    """
+
+    ARRAY_PARAMS = ['clip_lower', 'clip_upper', 'data_min', 'data_max']
+
+    def __init__(self, params):
+        self.params = dict(params)
+        for key in self.ARRAY_PARAMS:
+            if self.params.get(key) is not None:
+                self.params[key] = np.asarray(self.params[key], dtype=float)
+
+        self.columns = list(self.params['columns'])
+        self._compile_weights()
+
+    @classmethod
+    def fit(cls, values, columns, position_weights, scorer, score_mode,
+            clip_sigma=None, feature_range=(0, 100), constant_value=None,
+            per90=None, minutes_col=None):
+        """
+        Ajusta el modelo sobre la matriz de métricas de la población de referencia
+
+        Args:
+            values: Array 2D (filas x columnas) sin valores nulos
+            columns: Nombres de las métricas (sin el sufijo _normalized)
+            position_weights: Pesos por posición del scorer
+            scorer: Nombre de la clase del scorer
+            score_mode: 'classic' (media ponderada) o 'advanced' (+50 y recorte)
+            per90: Columnas base convertidas a valores por 90 minutos
+            minutes_col: Columna de minutos usada para los valores por 90
+        """
+        stats = ColumnStats(len(columns)).update(values)
+        return cls.from_stats(
+            stats, columns, position_weights, scorer, score_mode,
+            clip_sigma=clip_sigma, feature_range=feature_range,
+            constant_value=constant_value, per90=per90, minutes_col=minutes_col
+        )
+
+    @classmethod
+    def from_stats(cls, stats, columns, position_weights, scorer, score_mode,
+                   clip_sigma=None, feature_range=(0, 100), constant_value=None,
+                   per90=None, minutes_col=None):
+        """
+        Ajusta el modelo a partir de estadísticas acumuladas (ColumnStats),
+        por ejemplo chunk a chunk sobre un archivo que no cabe en memoria
+        """
+        if stats.n_rows == 0:
+            raise ValueError("Se necesita al menos un jugador para ajustar el modelo")
+
+        available = set(columns)
+        weights = {
+            position: {m: w for m, w in metrics.items() if m in available}
+            for position, metrics in position_weights.items()
+        }
+
+        params = {
+            'version': 1,
+            'scorer': scorer,
+            'score_mode': score_mode,
+            'columns': list(columns),
+            'position_weights': weights,
+            'per90': list(per90 or []),
+            'minutes_col': minutes_col,
+            'clip_sigma': clip_sigma,
+            'feature_range': list(feature_range),
+            'constant_value': constant_value,
+            'n_reference': int(stats.n_rows),
+        }
+        params.update(normalization_from_stats(stats, clip_sigma))
+
+        return cls(params)
+
+    def _compile_weights(self):
+        """Vectores de pesos por posición alineados con self.columns"""
+        index = {col: i for i, col in enumerate(self.columns)}
+        self._compiled = {}
+
+        for position, weights in self.params['position_weights'].items():
+            idx = np.array([index[m] for m in weights], dtype=int)
+            vector = np.array(list(weights.values()), dtype=float)
+            if self.params['score_mode'] == 'advanced':
+                total_weight = np.abs(vector).sum()
+            else:
+                total_weight = vector.sum()
+            self._compiled[position] = (idx, vector, total_weight)
+
+    def normalize(self, values):
+        """Normaliza una matriz de métricas contra la referencia congelada"""
+        return apply_normalization(
+            np.asarray(values, dtype=float),
+            self.params,
+            feature_range=tuple(self.params['feature_range']),
+            constant_value=self.params['constant_value'],
+            clip_to_range=True
+        )
+
+    def score(self, normalized, positions):
+        """
+        Calcula el score de cada fila según su posición
+
+        Args:
+            normalized: Matriz devuelta por normalize
+            positions: Array con la categoría de posición de cada fila
+        """
+        positions = np.asarray(positions)
+        scores = np.zeros(len(normalized))
+
+        for position, (idx, vector, total_weight) in self._compiled.items():
+            if position == 'Unknown' or total_weight == 0:
+                continue
+
+            rows = np.flatnonzero(positions == position)
+            if len(rows) == 0:
+                continue
+
+            group_scores = normalized[np.ix_(rows, idx)] @ vector / total_weight
+            if self.params['score_mode'] == 'advanced':
+                group_scores = np.clip(group_scores * 100 + 50, 0, 100)
+            scores[rows] = group_scores
+
+        return scores
+
+    def metric_matrix(self, df):
+        """Extrae del DataFrame las columnas del modelo (faltantes = 0)"""
+        return df.reindex(columns=self.columns).fillna(0).to_numpy(dtype=float)
+
+    def record_vector(self, record):
+        """
+        Vector de métricas de un solo jugador (dict), sin pasar por pandas
+
+        Calcula al vuelo las columnas por 90 minutos que falten.
+        """
+        minutes_col = self.params['minutes_col']
+        nineties = None
+        if minutes_col and record.get(minutes_col) is not None:
+            try:
+                nineties = float(record[minutes_col]) / 90
+            except (TypeError, ValueError):
+                nineties = None
+
+        values = np.zeros((1, len(self.columns)))
+        for i, col in enumerate(self.columns):
+            value = record.get(col)
+            if value is None and col == 'Minutes_Played':
+                value = None if nineties is None else nineties * 90
+            elif value is None and col == '90s_Played':
+                value = nineties
+            elif value is None and col.endswith('_per90') and nineties:
+                base = record.get(col[:-len('_per90')])
+                try:
+                    value = float(base) / nineties
+                except (TypeError, ValueError):
+                    value = None
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if np.isfinite(value):
+                values[0, i] = value
+
+        return values
+
+    def score_record(self, record, position):
+        """Score de un solo jugador contra la referencia congelada"""
+        normalized = self.normalize(self.record_vector(record))
+        return float(self.score(normalized, [position])[0])
+
+    def to_dict(self):
+        """Parámetros del modelo en formato serializable (JSON)"""
+        params = dict(self.params)
+        for key in self.ARRAY_PARAMS:
+            if params.get(key) is not None:
+                params[key] = params[key].tolist()
+        return params
+
+    def save(self, path):
+        """Guarda el modelo en un archivo JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """Carga un modelo guardado con save"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+
+class ScoringModelMixin:
+    """
+    Uso de un ScoringModel ajustado en self.model_ (transform, score_record,
+    save_model, load_model), común a PlayerScorer y AdvancedPlayerScorer
+
+    Cada scorer define su propio fit() y classify_positions /
+    identify_position; transform calcula los valores por 90 solo si el
+    modelo los usa (calculate_per_90_stats de AdvancedPlayerScorer).
+    """
+
+    model_ = None
+
+    def transform(self, df):
+        """Puntúa un lote de jugadores contra la referencia ajustada"""
+        model = self._require_model()
+
+        df = df.copy()
+        df['Position_Category'] = self.classify_positions(df['Pos'])
+
+        per90 = [col for col in model.params['per90'] if col in df.columns]
+        if per90:
+            df = self.calculate_per_90_stats(df, columns=per90)
+
+        normalized = model.normalize(model.metric_matrix(df))
+        normalized_cols = [f'{col}_normalized' for col in model.columns]
+        df = pd.concat([
+            df.drop(columns=[col for col in normalized_cols if col in df.columns]),
+            pd.DataFrame(normalized, columns=normalized_cols, index=df.index)
+        ], axis=1)
+
+        df['Overall_Score'] = model.score(normalized, df['Position_Category'].to_numpy())
+        df['Rank'] = df['Overall_Score'].rank(ascending=False, method='min')
+
+        return df
+
+    def score_record(self, record):
+        """
+        Score de un solo jugador (dict con 'Pos' y sus estadísticas)
+        contra la referencia ajustada, sin construir un DataFrame
+        """
+        model = self._require_model()
+        position = self.identify_position(record.get('Pos'))
+        return model.score_record(record, position)
+
+    def save_model(self, path):
+        """Guarda la referencia ajustada en un archivo JSON"""
+        self._require_model().save(path)
+        print(f"✓ Modelo de scoring guardado en {path}")
+
+    def load_model(self, path):
+        """Carga una referencia guardada (no necesita el CSV original)"""
+        model = ScoringModel.load(path)
+        if model.params['scorer'] != type(self).__name__:
+            raise ValueError(
+                f"El modelo {path} fue ajustado con {model.params['scorer']}, "
+                f"no con {type(self).__name__}"
+            )
+        self.model_ = model
+        return self
+
+    def _require_model(self):
+        if self.model_ is None:
+            raise ValueError("Modelo no ajustado: ejecuta fit() o load_model() primero")
+        return self.model_
@@ -0,0 +1,231 @@
+"""
+Búsqueda de jugadores similares sobre los perfiles normalizados
+
+Uso:
+    python -m src.analysis.similarity "Nombre del Jugador" --max-age 23
+"""
+import argparse
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.neighbors import BallTree, KDTree
+
+from src.analysis.compact_storage import load_scored
+
+
+class PlayerSimilarityIndex:
+    """
+    Índice de vecinos más cercanos por posición
+
+    Cada grupo de posición se reduce con PCA y se indexa con un KD-tree
+    (o un Ball-tree si quedan muchas dimensiones). Los filtros de edad, liga
+    y minutos se aplican en la consulta, sin reconstruir el índice.
+    """
+
+    META_COLUMNS = ['Player', 'Squad', 'Pos', 'Position_Category', 'League', 'Overall_Score']
+
+    def __init__(self, n_components=8, leaf_size=40):
+        self.n_components = n_components
+        self.leaf_size = leaf_size
+        self.feature_columns = []
+        self.meta = None
+        self.groups = {}
+        self._local_index = None
+        self._player_rows = {}
+
+    def _player_meta(self, df):
+        """Metadatos para mostrar y filtrar (edad y minutos como números)"""
+        meta = df[[col for col in self.META_COLUMNS if col in df.columns]].copy()
+        if 'Position_Category' in meta.columns:
+            meta['Position_Category'] = meta['Position_Category'].astype(str)
+
+        # FBref guarda la edad como "25-123" (años-días)
+        if 'Age' in df.columns:
+            meta['Age'] = pd.to_numeric(
+                df['Age'].astype(str).str.split('-').str[0], errors='coerce'
+            )
+
+        for col in ['Minutes_Played', 'Min', 'Minutes']:
+            if col in df.columns:
+                meta['Minutes'] = pd.to_numeric(df[col], errors='coerce')
+                break
+
+        return meta.reset_index(drop=True)
+
+    def fit(self, df_scored):
+        """
+        Construye el índice a partir de un DataFrame puntuado
+
+        Args:
+            df_scored: Salida de AdvancedPlayerScorer.score_players/transform
+        """
+        self.feature_columns = [col for col in df_scored.columns if col.endswith('_normalized')]
+        if not self.feature_columns:
+            raise ValueError("El DataFrame no tiene columnas *_normalized: puntúalo primero")
+
+        self.meta = self._player_meta(df_scored)
+        features = df_scored[self.feature_columns].fillna(0).to_numpy(dtype=float)
+
+        if 'Position_Category' in self.meta.columns:
+            positions = self.meta['Position_Category'].to_numpy()
+        else:
+            positions = np.full(len(self.meta), 'Unknown', dtype=object)
+
+        self.groups = {}
+        local_index = np.zeros(len(self.meta), dtype=np.int64)
+        for position in pd.unique(positions):
+            rows = np.flatnonzero(positions == position)
+            group_features = features[rows]
+
+            n_components = min(self.n_components, group_features.shape[1], len(rows))
+            pca = PCA(n_components=n_components).fit(group_features)
+            coords = pca.transform(group_features)
+
+            tree_class = KDTree if n_components <= 20 else BallTree
+            self.groups[position] = {
+                'rows': rows,
+                'pca': pca,
+                'coords': coords,
+                'tree': tree_class(coords, leaf_size=self.leaf_size),
+                # Columnas de filtro ya separadas por grupo
+                'filters': {
+                    col: self.meta[col].to_numpy()[rows]
+                    for col in ['Age', 'League', 'Minutes'] if col in self.meta.columns
+                },
+            }
+            local_index[rows] = np.arange(len(rows))
+
+        self._local_index = local_index
+        self._player_rows = {}
+        if 'Player' in self.meta.columns:
+            for row, name in enumerate(self.meta['Player'].to_numpy()):
+                self._player_rows.setdefault(name, row)
+
+        return self
+
+    def _filter_mask(self, group, max_age=None, min_age=None, leagues=None, min_minutes=None):
+        """Máscara de candidatos válidos dentro de un grupo"""
+        filters = group['filters']
+        mask = np.ones(len(group['rows']), dtype=bool)
+
+        if max_age is not None and 'Age' in filters:
+            mask &= filters['Age'] <= max_age
+        if min_age is not None and 'Age' in filters:
+            mask &= filters['Age'] >= min_age
+        if leagues is not None and 'League' in filters:
+            mask &= np.isin(filters['League'], list(leagues))
+        if min_minutes is not None and 'Minutes' in filters:
+            mask &= filters['Minutes'] >= min_minutes
+
+        return mask
+
+    def _find_player(self, player):
+        """Fila del jugador (por nombre o por posición en el DataFrame)"""
+        if isinstance(player, (int, np.integer)):
+            return int(player)
+
+        if player not in self._player_rows:
+            raise KeyError(f"Jugador '{player}' no encontrado en el índice")
+        return self._player_rows[player]
+
+    def query(self, player, k=10, max_age=None, min_age=None, leagues=None,
+              min_minutes=None):
+        """
+        Busca los k jugadores más parecidos a otro de su misma posición
+
+        Args:
+            player: Nombre del jugador o número de fila del DataFrame indexado
+            k: Número de resultados
+            max_age, min_age: Rango de edad de los candidatos
+            leagues: Lista de ligas permitidas (requiere columna League)
+            min_minutes: Minutos mínimos jugados
+
+        Returns:
+            DataFrame con los metadatos de los candidatos y su Distance
+        """
+        row = self._find_player(player)
+        if 'Position_Category' in self.meta.columns:
+            position = self.meta['Position_Category'].iloc[row]
+        else:
+            position = 'Unknown'
+        group = self.groups[position]
+
+        local = self._local_index[row]
+        point = group['coords'][local:local + 1]
+
+        mask = self._filter_mask(group, max_age, min_age, leagues, min_minutes)
+        mask[local] = False
+
+        n_allowed = int(mask.sum())
+        k = min(k, n_allowed)
+        if k == 0:
+            return self.meta.iloc[[]].assign(Distance=[])
+
+        if n_allowed < 0.05 * len(mask):
+            # Filtro muy selectivo: distancia exacta solo sobre los candidatos
+            candidates = np.flatnonzero(mask)
+            distances = np.sqrt(((group['coords'][candidates] - point) ** 2).sum(axis=1))
+            order = np.argsort(distances)[:k]
+            local_idx, distances = candidates[order], distances[order]
+        else:
+            # Se piden más vecinos de los necesarios y se filtran; si no
+            # alcanzan, se amplía la búsqueda
+            n_query = min(len(mask), int(np.ceil(k * len(mask) / n_allowed)) * 2 + 1)
+            while True:
+                distances, local_idx = group['tree'].query(point, k=n_query)
+                distances, local_idx = distances[0], local_idx[0]
+                keep = mask[local_idx]
+                if keep.sum() >= k or n_query == len(mask):
+                    break
+                n_query = min(len(mask), n_query * 2)
+            local_idx, distances = local_idx[keep][:k], distances[keep][:k]
+
+        result = self.meta.iloc[group['rows'][local_idx]].copy()
+        result['Distance'] = distances
+        return result
+
+    def save(self, path):
+        """Guarda el índice (PCA, árboles y metadatos) para no reajustarlo"""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"✓ Índice de similitud guardado en {path}")
+
+    @classmethod
+    def load(cls, path):
+        """Carga un índice guardado con save"""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Jugadores similares')
+    parser.add_argument('player')
+    parser.add_argument('--scored', default='data/processed/players_advanced_scored.csv')
+    parser.add_argument('--index', default='data/processed/similarity_index.pkl')
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--max-age', type=float)
+    parser.add_argument('--min-minutes', type=float)
+    parser.add_argument('--rebuild', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        if args.rebuild:
+            raise FileNotFoundError(args.index)
+        index = PlayerSimilarityIndex.load(args.index)
+    except FileNotFoundError:
+        try:
+            df_scored = load_scored(args.scored)
+        except FileNotFoundError:
+            print(f"❌ No se encontró {args.scored}")
+            print("   Ejecuta primero: python -m src.analysis.advanced_scorer")
+            raise SystemExit(1)
+        index = PlayerSimilarityIndex().fit(df_scored)
+        index.save(args.index)
+
+    similar = index.query(args.player, k=args.k, max_age=args.max_age,
+                          min_minutes=args.min_minutes)
+    print(f"\n🔍 Jugadores similares a {args.player}:")
+    print(similar)
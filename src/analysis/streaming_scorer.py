@@ -0,0 +1,151 @@
+"""
+Scoring por chunks para CSVs de jugadores que no caben en memoria
+
+Uso:
+    python -m src.analysis.streaming_scorer data/raw/players_stats.csv \
+        data/processed/players_advanced_scored.csv --chunksize 100000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+from src.analysis.scoring_model import ColumnStats, coerce_numeric, header_plan
+
+
+class StreamingScorer:
+    """
+    Scoring en dos pasadas con memoria acotada por el tamaño del chunk
+
+    1. Primera pasada: acumula estadísticas por columna (mín/máx, media y
+       desviación para el recorte a 3 sigmas) y ajusta la referencia.
+    2. Segunda pasada: normaliza, puntúa y escribe cada chunk.
+
+    El Rank se calcula a partir de los scores (8 bytes por jugador), sin
+    mantener el DataFrame completo en memoria.
+    """
+
+    def __init__(self, scorer=None, chunksize=100_000):
+        self.scorer = scorer or AdvancedPlayerScorer()
+        self.chunksize = chunksize
+
+    def _read_chunks(self, path, **kwargs):
+        return pd.read_csv(path, chunksize=self.chunksize, **kwargs)
+
+    def collect_stats(self, input_path):
+        """
+        Primera pasada: ajusta la referencia del scorer chunk a chunk
+
+        El plan de métricas se construye con la cabecera del CSV, no con el
+        primer chunk: toda columna que piden los pesos se trata como numérica
+        aunque sus primeras filas estén vacías o tengan texto (cada chunk se
+        convierte con coerce_numeric).
+        """
+        columns = pd.read_csv(input_path, nrows=0).columns
+        plan = header_plan(self.scorer, columns)
+        minutes_col = self.scorer.find_minutes_column(columns)
+        stats = ColumnStats(len(plan['normalized']))
+
+        for chunk in self._read_chunks(input_path):
+            chunk = coerce_numeric(chunk, plan['source'])
+            stats.update(self.scorer.plan_matrix(chunk, plan))
+
+        if stats.n_rows == 0:
+            raise ValueError(f"{input_path} no contiene jugadores")
+
+        self.scorer.fit_from_stats(stats, plan, minutes_col)
+        return self.scorer.model_
+
+    def score_csv(self, input_path, output_path, refit=True):
+        """
+        Puntúa un CSV completo y escribe el resultado chunk a chunk
+
+        Args:
+            input_path: CSV de entrada (mismo formato que players_stats.csv)
+            output_path: CSV de salida con Overall_Score y Rank
+            refit: Si es False y el scorer ya tiene una referencia ajustada
+                (fit/load_model), se omite la primera pasada
+
+        Returns:
+            Dict con tiempos por pasada y número de jugadores
+        """
+        timings = {}
+
+        start = time.perf_counter()
+        if refit or self.scorer.model_ is None:
+            self.collect_stats(input_path)
+        timings['stats'] = time.perf_counter() - start
+        model = self.scorer.model_
+
+        # Segunda pasada: scores chunk a chunk hacia un archivo temporal
+        start = time.perf_counter()
+        tmp_path = f'{output_path}.tmp'
+        score_chunks = []
+        header = True
+
+        # El temporal se borra también si falla una pasada
+        try:
+            for chunk in self._read_chunks(input_path):
+                chunk = coerce_numeric(chunk, model.params['per90'] + model.columns)
+                scored = self.scorer.transform(chunk).drop(columns=['Rank'])
+                score_chunks.append(scored['Overall_Score'].to_numpy())
+                scored.to_csv(tmp_path, mode='w' if header else 'a', header=header, index=False)
+                header = False
+
+            timings['score'] = time.perf_counter() - start
+
+            # Rank global (method='min'): 1 + jugadores con score estrictamente mayor
+            start = time.perf_counter()
+            scores = np.concatenate(score_chunks) if score_chunks else np.array([])
+            del score_chunks
+            sorted_scores = np.sort(scores[~np.isnan(scores)])
+            n_scored = len(sorted_scores)
+
+            offset = 0
+            header = True
+            for chunk in pd.read_csv(tmp_path, chunksize=self.chunksize,
+                                     dtype=str, keep_default_na=False):
+                chunk_scores = scores[offset:offset + len(chunk)]
+                offset += len(chunk)
+
+                ranks = n_scored - np.searchsorted(sorted_scores, chunk_scores, side='right') + 1
+                chunk['Rank'] = np.where(np.isnan(chunk_scores), np.nan, ranks.astype(float))
+                chunk.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+                header = False
+
+            timings['rank'] = time.perf_counter() - start
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        timings['players'] = len(scores)
+
+        return timings
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scoring por chunks de un CSV de jugadores')
+    parser.add_argument('input', nargs='?', default='data/raw/players_stats.csv')
+    parser.add_argument('output', nargs='?', default='data/processed/players_advanced_scored.csv')
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--model', help='Guarda la referencia ajustada en este archivo JSON')
+    args = parser.parse_args()
+
+    try:
+        streaming = StreamingScorer(chunksize=args.chunksize)
+        print(f"🔄 Scoring por chunks de {args.chunksize:,} filas...")
+        timings = streaming.score_csv(args.input, args.output)
+
+        print(f"✓ Estadísticas: {timings['stats']:.2f}s")
+        print(f"✓ Scoring: {timings['score']:.2f}s")
+        print(f"✓ Ranking: {timings['rank']:.2f}s")
+        print(f"\n✅ {timings['players']:,} jugadores guardados en {args.output}")
+
+        if args.model:
+            streaming.scorer.save_model(args.model)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.input}")
+        print("   Ejecuta primero: python -m src.data_collection.data_collector")
@@ -0,0 +1,218 @@
+"""
+Barridos de sensibilidad de pesos: miles de configuraciones en lote
+
+Uso:
+    python -m src.analysis.weight_sweep data/processed/players_advanced_scored.parquet \
+        --configs 1000 --noise 0.25
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau
+
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+from src.analysis.compact_storage import load_scored
+
+
+def random_configs(position_weights, n_configs, noise=0.2, seed=42):
+    """
+    Genera configuraciones perturbando los pesos base
+
+    Args:
+        position_weights: Pesos base (p. ej. scorer.position_weights)
+        n_configs: Configuraciones por posición
+        noise: Desviación relativa de la perturbación (0.2 = ±20 %)
+
+    Returns:
+        Dict posición -> DataFrame (una fila por configuración, una columna por métrica)
+    """
+    rng = np.random.default_rng(seed)
+    configs = {}
+
+    for position, weights in position_weights.items():
+        base = np.array(list(weights.values()), dtype=float)
+        factors = 1 + rng.normal(0, noise, size=(n_configs, len(base)))
+        configs[position] = pd.DataFrame(base * factors, columns=list(weights))
+
+    return configs
+
+
+def average_ranks(values):
+    """
+    Rangos promedio (como scipy.stats.rankdata) de cada fila de una matriz
+
+    Usa argsort no estable y promedia los empates con bincount, lo que es
+    bastante más rápido que el mergesort de rankdata en matrices grandes.
+    """
+    n_rows, n_cols = values.shape
+    order = np.argsort(values, axis=1)
+    sorted_values = np.take_along_axis(values, order, axis=1)
+
+    # Cada fila empieza un grupo nuevo, así los ids son únicos entre filas
+    new_group = np.empty(values.shape, dtype=bool)
+    new_group[:, 0] = True
+    np.not_equal(sorted_values[:, 1:], sorted_values[:, :-1], out=new_group[:, 1:])
+    group_id = np.cumsum(new_group, axis=None).reshape(n_rows, n_cols) - 1
+
+    positions = np.tile(np.arange(1, n_cols + 1, dtype=float), n_rows)
+    sums = np.bincount(group_id.ravel(), weights=positions)
+    counts = np.bincount(group_id.ravel())
+
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, (sums / counts)[group_id], axis=1)
+    return ranks
+
+
+class WeightSweep:
+    """
+    Puntúa a todos los jugadores bajo N configuraciones de pesos a la vez
+
+    Reutiliza la matriz normalizada de un DataFrame ya puntuado: cada bloque
+    de configuraciones es un solo producto matricial (jugadores x métricas)
+    por (métricas x configuraciones).
+    """
+
+    def __init__(self, df_scored, scorer=None, block_size=256):
+        """
+        Args:
+            df_scored: Salida de score_players/transform (columnas *_normalized
+                y Position_Category)
+            scorer: Scorer con los pesos base (AdvancedPlayerScorer por defecto)
+            block_size: Configuraciones por bloque (limita la memoria)
+        """
+        self.scorer = scorer or AdvancedPlayerScorer()
+        self.block_size = block_size
+        self.positions = df_scored['Position_Category'].astype(str).to_numpy()
+        self.df = df_scored
+
+    def _position_matrix(self, position, metrics):
+        """Matriz normalizada del grupo con las métricas disponibles"""
+        available = [m for m in metrics if f'{m}_normalized' in self.df.columns]
+        rows = np.flatnonzero(self.positions == position)
+        values = self.df[[f'{m}_normalized' for m in available]].to_numpy(dtype=float)[rows]
+        return available, values
+
+    @staticmethod
+    def _scores(values, weights):
+        """
+        Media ponderada de las métricas normalizadas para cada configuración
+
+        No se aplica el *100 + 50 ni el recorte a [0, 100] del scorer: sobre
+        métricas ya normalizadas a 0-100 casi todos los jugadores quedan en
+        100 y el ranking se vuelve un empate.
+
+        Args:
+            values: Matriz (jugadores x métricas)
+            weights: Matriz (configuraciones x métricas)
+
+        Returns:
+            Matriz (jugadores x configuraciones)
+        """
+        total_weight = np.abs(weights).sum(axis=1)
+        total_weight[total_weight == 0] = np.nan
+        scores = (values @ weights.T) / total_weight
+        return np.nan_to_num(scores, nan=0.0)
+
+    def run(self, configs, top_k=10, kendall_sample=2000, seed=42):
+        """
+        Calcula estadísticas de estabilidad del ranking para cada configuración
+
+        Args:
+            configs: Dict posición -> DataFrame de pesos (filas = configuraciones)
+            top_k: Tamaño del top para medir el solapamiento
+            kendall_sample: Jugadores muestreados para Kendall (None = todos)
+
+        Returns:
+            DataFrame con position, config, spearman, kendall, topk_overlap y
+            mean_score (spearman y kendall son NaN si la configuración da
+            el mismo score a todos los jugadores)
+        """
+        rng = np.random.default_rng(seed)
+        results = []
+
+        for position, weights_df in configs.items():
+            baseline_weights = self.scorer.position_weights.get(position, {})
+            metrics = list(weights_df.columns)
+            available, values = self._position_matrix(position, metrics)
+            n_players = len(values)
+            if n_players < 2 or not available:
+                continue
+
+            baseline = np.array([[baseline_weights.get(m, 0.0) for m in available]])
+            baseline_scores = self._scores(values, baseline)[:, 0]
+            baseline_ranks = average_ranks(-baseline_scores[None, :])[0]
+            centered_base = baseline_ranks - baseline_ranks.mean()
+
+            k = min(top_k, n_players)
+            baseline_top = np.zeros(n_players, dtype=bool)
+            baseline_top[np.argpartition(-baseline_scores, k - 1)[:k]] = True
+
+            sample = np.arange(n_players)
+            if kendall_sample and n_players > kendall_sample:
+                sample = rng.choice(n_players, kendall_sample, replace=False)
+
+            weights = weights_df[available].to_numpy(dtype=float)
+            for start in range(0, len(weights), self.block_size):
+                block = weights[start:start + self.block_size]
+                scores = self._scores(values, block)
+
+                # Spearman: correlación de Pearson entre rangos, en lote
+                ranks = average_ranks(np.ascontiguousarray(-scores.T))
+                centered = ranks - ranks.mean(axis=1, keepdims=True)
+                denominator = np.sqrt((centered ** 2).sum(axis=1) * (centered_base ** 2).sum())
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    spearman = (centered @ centered_base) / denominator
+
+                top = np.argpartition(-scores, k - 1, axis=0)[:k]
+                overlap = baseline_top[top].sum(axis=0) / k
+
+                # Kendall (tau-b de scipy, O(n log n) en C) solo donde hay
+                # orden que comparar: con scores constantes no está definido
+                sample_scores = scores[sample]
+                varies = np.ptp(sample_scores, axis=0) > 0
+                if np.ptp(baseline_scores[sample]) == 0:
+                    varies[:] = False
+
+                for j in range(len(block)):
+                    kendall = np.nan
+                    if varies[j]:
+                        kendall = kendalltau(baseline_scores[sample], sample_scores[:, j])[0]
+                    results.append({
+                        'position': position,
+                        'config': start + j,
+                        'spearman': spearman[j],
+                        'kendall': kendall,
+                        'topk_overlap': overlap[j],
+                        'mean_score': scores[:, j].mean(),
+                    })
+
+        return pd.DataFrame(results)
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Barrido de sensibilidad de pesos')
+    parser.add_argument('scored', nargs='?', default='data/processed/players_advanced_scored.csv')
+    parser.add_argument('--configs', type=int, default=1000)
+    parser.add_argument('--noise', type=float, default=0.2)
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        df_scored = load_scored(args.scored)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.scored}")
+        print("   Ejecuta primero: python -m src.analysis.advanced_scorer")
+    else:
+        scorer = AdvancedPlayerScorer()
+        configs = random_configs(scorer.position_weights, args.configs, noise=args.noise)
+
+        start = time.perf_counter()
+        results = WeightSweep(df_scored, scorer).run(configs, top_k=args.top_k)
+        print(f"✓ {args.configs} configuraciones x {len(configs)} posiciones "
+              f"en {time.perf_counter() - start:.2f}s")
+
+        print("\n📊 Estabilidad del ranking por posición:")
+        print(results.groupby('position')[['spearman', 'kendall', 'topk_overlap']].describe().T)
@@ -0,0 +1,160 @@
+"""
+Manifiesto de recolección: objetivos completados, hashes y ligas pendientes
+
+Guarda en un JSON qué objetivos (liga, tipo de estadística, temporada) de la
+ejecución actual ya terminaron, para reanudarla tras un corte, y el hash del
+contenido de cada tabla, para no reescribir ni volver a puntuar las que no
+cambiaron desde la ejecución anterior.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+def job_key(job):
+    """Clave de texto de un objetivo (liga, stat_type, temporada)"""
+    league, stat_type, season = job
+    return f'{league}|{stat_type}|{season or "current"}'
+
+
+# Subcarpeta de data/raw con las tablas por tipo de estadística de --wide
+# (discover_league_files la salta: no son ligas que puntuar)
+TABLES_DIR = 'tables'
+
+
+def table_name(league, season=None):
+    """Nombre de los archivos de una liga ({liga} o {liga}_{temporada})"""
+    return f'{league}_{season}' if season else league
+
+
+def hash_table(df):
+    """
+    Hash del contenido de una tabla (columnas y valores, sin el índice)
+
+    Se calcula sobre la tabla ya limpia, así los cambios en el HTML que no
+    afectan a los datos (anuncios, fecha de la página) no cuentan.
+    """
+    digest = hashlib.sha256('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class CrawlManifest:
+    """
+    Estado persistente de la recolección
+
+    - run: ejecución en curso (objetivos y los ya completados)
+    - tables: último hash conocido de cada objetivo
+    - dirty: ligas (liga, temporada) con datos nuevos sin puntuar
+    """
+
+    def __init__(self, path='data/cache/crawl_manifest.json'):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {'run': None, 'tables': {}, 'dirty': []}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data.update(json.load(f))
+
+    def save(self):
+        """Escritura atómica (se llama tras cada objetivo completado)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def begin(self, jobs, resume=True):
+        """
+        Empieza una ejecución o reanuda la que quedó a medias
+
+        Solo se reanuda si la ejecución anterior no terminó y pedía los mismos
+        objetivos; si no, se empieza de cero (los hashes se conservan).
+
+        Returns:
+            Objetivos pendientes
+        """
+        keys = [job_key(job) for job in jobs]
+        run = self.data['run']
+
+        with self.lock:
+            if not (resume and run and not run['finished'] and sorted(run['jobs']) == sorted(keys)):
+                self.data['run'] = {
+                    'started_at': time.time(),
+                    'finished': False,
+                    'jobs': keys,
+                    'completed': {},
+                }
+            self.save()
+
+        completed = self.data['run']['completed']
+        return [job for job in jobs if job_key(job) not in completed]
+
+    def completed(self):
+        """Objetivos ya completados en la ejecución actual"""
+        run = self.data['run']
+        return dict(run['completed']) if run else {}
+
+    def has_changed(self, job, content_hash):
+        """True si el hash es distinto del último guardado (o no hay)"""
+        previous = self.data['tables'].get(job_key(job))
+        return previous is None or previous['hash'] != content_hash
+
+    def complete(self, job, content_hash, rows, changed):
+        """Marca un objetivo como terminado (después de guardar sus datos)"""
+        league, _, season = job
+        key = job_key(job)
+
+        with self.lock:
+            self.data['run']['completed'][key] = {
+                'hash': content_hash, 'rows': rows, 'changed': changed,
+                'completed_at': time.time(),
+            }
+            self.data['tables'][key] = {'hash': content_hash, 'rows': rows,
+                                        'updated_at': time.time()}
+            if changed and [league, season] not in self.data['dirty']:
+                self.data['dirty'].append([league, season])
+            if len(self.data['run']['completed']) == len(self.data['run']['jobs']):
+                self.data['run']['finished'] = True
+            self.save()
+
+    def changed_leagues(self):
+        """(liga, temporada) con algún objetivo cambiado en esta ejecución"""
+        leagues = []
+        for key, entry in self.completed().items():
+            league, _, season = key.split('|')
+            league_season = (league, None if season == 'current' else season)
+            if entry['changed'] and league_season not in leagues:
+                leagues.append(league_season)
+        return leagues
+
+    def dirty_names(self):
+        """Nombres (table_name) de las ligas con datos sin puntuar"""
+        return [table_name(league, season) for league, season in self.data['dirty']]
+
+    def mark_scored(self, names):
+        """Quita de pendientes las ligas ya puntuadas"""
+        names = set(names)
+        with self.lock:
+            self.data['dirty'] = [
+                entry for entry in self.data['dirty'] if table_name(*entry) not in names
+            ]
+            self.save()
+
+    def report(self):
+        """Resumen de la ejecución actual"""
+        run = self.data['run'] or {'jobs': [], 'completed': {}}
+        completed = run['completed']
+        changed = sum(entry['changed'] for entry in completed.values())
+        print("\n📊 Manifiesto de recolección:")
+        print(f"   Completados: {len(completed)}/{len(run['jobs'])}  "
+              f"Con cambios: {changed}  Sin cambios: {len(completed) - changed}")
+        if self.data['dirty']:
+            print(f"   Ligas pendientes de puntuar: {', '.join(self.dirty_names())}")
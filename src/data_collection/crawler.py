@@ -0,0 +1,252 @@
+"""
+Recolección concurrente de varias ligas y tipos de estadística
+
+Uso:
+    python -m src.data_collection.crawler --leagues La-Liga Premier-League \
+        --stat-types standard shooting passing --workers 4 --rate 0.5
+
+Para probar sin tocar FBref, servir páginas guardadas con la misma estructura
+de rutas (p. ej. en/comps/12/stats/La-Liga-Stats):
+    python -m http.server 8000 --directory pages/
+    python -m src.data_collection.crawler --base-url http://localhost:8000 --rate 50
+
+Con --manifest, una ejecución cortada se reanuda donde quedó y las tablas
+sin cambios (mismo hash) no se vuelven a guardar:
+    python -m src.data_collection.crawler --wide --manifest data/cache/crawl_manifest.json
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.data_collection.data_collector import LEAGUES, WIDE_STAT_TYPES, PlayerDataCollector
+from src.data_collection.crawl_manifest import (CrawlManifest, TABLES_DIR, hash_table, job_key,
+                                                table_name)
+from src.data_collection.data_lake import WIDE_STAT_TYPE, RawDataLake
+from src.data_collection.http_cache import HttpCache
+from src.data_collection.http_client import HostRateLimiter, create_session
+
+
+def build_jobs(leagues, stat_types, seasons=(None,)):
+    """Lista de objetivos (liga, tipo de estadística, temporada)"""
+    return [
+        (league, stat_type, season)
+        for league in leagues
+        for season in seasons
+        for stat_type in stat_types
+    ]
+
+
+class ConcurrentCrawler:
+    """
+    Ejecuta una lista de objetivos con un pool de hilos
+
+    Todos los hilos comparten la sesión HTTP (pool de conexiones) y un límite
+    de peticiones por host (token bucket), así la concurrencia solo acelera
+    la espera de red sin aumentar la carga sobre el servidor.
+    """
+
+    def __init__(self, collector=None, max_workers=4, rate=0.5, burst=1, max_retries=3):
+        """
+        Args:
+            collector: PlayerDataCollector (se crea uno si es None)
+            max_workers: Hilos de descarga
+            rate: Peticiones por segundo por host
+            burst: Ráfaga máxima por host
+            max_retries: Reintentos por objetivo (errores de red, 429 y 5xx)
+        """
+        self.collector = collector or PlayerDataCollector()
+        self.collector.session = create_session(self.collector.headers, pool_size=max_workers)
+        self.collector.rate_limiter = HostRateLimiter(rate=rate, capacity=burst)
+        self.collector.max_retries = max_retries
+        self.max_workers = max_workers
+        self.errors = {}
+        self.timings = {}
+
+    def _run_job(self, job):
+        league, stat_type, season = job
+        start = time.perf_counter()
+        url = self.collector.build_url(league, stat_type, season)
+        html = self.collector.fetch_page(url, stat_type)
+        df = self.collector.clean_player_data(self.collector.parse_stats_table(html, stat_type))
+        self.timings[job] = time.perf_counter() - start
+        return df
+
+    def crawl(self, jobs, manifest=None, on_result=None, resume=True):
+        """
+        Descarga y limpia todos los objetivos
+
+        Args:
+            jobs: Lista de (liga, stat_type, temporada) (ver build_jobs)
+            manifest: CrawlManifest opcional. Se saltan los objetivos ya
+                completados de una ejecución interrumpida y se comparan los
+                hashes con la ejecución anterior.
+            on_result: Función (objetivo, DataFrame) que guarda cada tabla en
+                cuanto llega; con manifiesto solo se llama si la tabla cambió
+            resume: Con False se ignora la ejecución interrumpida
+
+        Returns:
+            Dict objetivo -> DataFrame (los fallidos quedan en self.errors)
+        """
+        results = {}
+        self.errors = {}
+        self.timings = {}
+
+        if manifest is not None:
+            pending = manifest.begin(jobs, resume=resume)
+            if len(pending) < len(jobs):
+                print(f"🔄 Reanudando: {len(jobs) - len(pending)} objetivos ya completados")
+            jobs = pending
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_job, job): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    df = future.result()
+                except Exception as e:
+                    self.errors[job] = str(e)
+                    print(f"❌ {job[0]} / {job[1]}: {e}")
+                    continue
+
+                if df is None:
+                    self.errors[job] = 'Tabla no encontrada'
+                    continue
+                results[job] = df
+
+                changed = True
+                if manifest is not None:
+                    content_hash = hash_table(df)
+                    changed = manifest.has_changed(job, content_hash)
+                if changed and on_result is not None:
+                    on_result(job, df)
+                # Se marca como completado solo después de guardar los datos
+                if manifest is not None:
+                    manifest.complete(job, content_hash, len(df), changed)
+
+                status = '' if changed else ' (sin cambios)'
+                print(f"✓ {job[0]} / {job[1]}: {len(df)} jugadores{status}")
+
+        return results
+
+    def crawl_wide(self, leagues, stat_types=WIDE_STAT_TYPES, seasons=(None,),
+                   manifest=None, on_result=None, load_table=None, resume=True):
+        """
+        Descarga todos los tipos de estadística y devuelve una tabla ancha
+        por liga y temporada (ver PlayerDataCollector.merge_stat_tables)
+
+        Con manifiesto solo se construyen las tablas de las ligas con algún
+        tipo cambiado; las tablas de objetivos completados antes de un corte
+        se recuperan con load_table(objetivo).
+
+        Returns:
+            Dict (liga, temporada) -> DataFrame ancho
+        """
+        results = self.crawl(build_jobs(leagues, stat_types, seasons),
+                             manifest=manifest, on_result=on_result, resume=resume)
+
+        targets = [(league, season) for league in leagues for season in seasons]
+        if manifest is not None:
+            changed = manifest.changed_leagues()
+            targets = [target for target in targets if target in changed]
+
+        wide_tables = {}
+        completed = manifest.completed() if manifest is not None else {}
+        for league, season in targets:
+            tables = {}
+            for stat_type in stat_types:
+                job = (league, stat_type, season)
+                if job in results:
+                    tables[stat_type] = results[job]
+                elif load_table is not None and job_key(job) in completed:
+                    df = load_table(job)
+                    if df is not None:
+                        tables[stat_type] = df
+            wide = self.collector.merge_stat_tables(tables)
+            if wide is not None:
+                wide['League'] = league
+                wide['Season'] = season or 'current'
+                wide_tables[(league, season)] = wide
+
+        return wide_tables
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Recolección concurrente de ligas')
+    parser.add_argument('--leagues', nargs='+', default=list(LEAGUES))
+    parser.add_argument('--stat-types', nargs='+', default=['standard'])
+    parser.add_argument('--seasons', nargs='+', default=[None])
+    parser.add_argument('--base-url', default='https://fbref.com')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=0.5, help='Peticiones por segundo por host')
+    parser.add_argument('--cache-dir', default='data/cache/http')
+    parser.add_argument('--ttl', type=float, default=24, help='Horas antes de revalidar')
+    parser.add_argument('--offline', action='store_true', help='Solo páginas de la caché')
+    parser.add_argument('--wide', action='store_true',
+                        help='Une todos los tipos de estadística en una tabla por liga')
+    parser.add_argument('--lake', help='Guarda en el almacén Parquet (p. ej. data/lake) '
+                                       'en lugar de CSV en data/raw')
+    parser.add_argument('--manifest', help='Manifiesto para reanudar y detectar cambios '
+                                           '(p. ej. data/cache/crawl_manifest.json)')
+    parser.add_argument('--restart', action='store_true',
+                        help='No reanudar la ejecución interrumpida del manifiesto')
+    args = parser.parse_args()
+
+    cache = HttpCache(args.cache_dir, ttl=args.ttl * 3600, offline=args.offline)
+    crawler = ConcurrentCrawler(PlayerDataCollector(base_url=args.base_url, cache=cache),
+                                max_workers=args.workers, rate=args.rate)
+    lake = RawDataLake(args.lake) if args.lake else None
+    manifest = CrawlManifest(args.manifest) if args.manifest else None
+
+    def csv_path(league, stat_type, season):
+        # Con --wide las tablas por tipo son intermedias: van a data/raw/tables
+        # y en data/raw queda solo la tabla ancha de cada liga
+        suffix = f'_{season}' if season else ''
+        prefix = f'{TABLES_DIR}/' if args.wide else ''
+        return f'{prefix}{league}_{stat_type}{suffix}.csv'
+
+    if args.wide and lake is None:
+        os.makedirs(f'data/raw/{TABLES_DIR}', exist_ok=True)
+
+    def save_table(job, df):
+        # Cada tabla se guarda en cuanto llega: si el proceso se corta, el
+        # manifiesto solo marca como completado lo que ya está en disco
+        league, stat_type, season = job
+        if lake is not None:
+            lake.write(df, league, stat_type, season)
+        else:
+            crawler.collector.save_data(df, csv_path(league, stat_type, season))
+
+    def load_table(job):
+        league, stat_type, season = job
+        if lake is not None:
+            df = lake.read(leagues=league, seasons=season or 'current', stat_types=stat_type)
+            return df.drop(columns=['League', 'Season', 'stat_type'])
+        try:
+            return pd.read_csv(f'data/raw/{csv_path(league, stat_type, season)}')
+        except FileNotFoundError:
+            return None
+
+    start = time.perf_counter()
+    if args.wide:
+        stat_types = args.stat_types if args.stat_types != ['standard'] else WIDE_STAT_TYPES
+        results = crawler.crawl_wide(args.leagues, stat_types, args.seasons,
+                                     manifest=manifest, on_result=save_table,
+                                     load_table=load_table, resume=not args.restart)
+        for (league, season), df in results.items():
+            if lake is not None:
+                lake.write(df, league, WIDE_STAT_TYPE, season)
+            else:
+                crawler.collector.save_data(df, f'{table_name(league, season)}.csv')
+    else:
+        results = crawler.crawl(build_jobs(args.leagues, args.stat_types, args.seasons),
+                                manifest=manifest, on_result=save_table,
+                                resume=not args.restart)
+    print(f"\n📊 {len(results)} tablas en {time.perf_counter() - start:.1f}s "
+          f"({len(crawler.errors)} errores)")
+    cache.report()
+    if manifest is not None:
+        manifest.report()
@@ -1,19 +1,202 @@
-import requests
 import pandas as pd
 from bs4 import BeautifulSoup
-import time
-import re
+from io import StringIO
+
+from src.data_collection.data_lake import RawDataLake
+from src.data_collection.http_cache import HttpCache
+from src.data_collection.http_client import HostRateLimiter, create_session, request_with_retries
+from src.data_collection.table_parser import (
+    HAS_LXML, clean_column_names, extract_stats_table, find_table_html
+)
+
+# Id de competición en FBref
+LEAGUES = {
+    'Premier-League': 9,
+    'La-Liga': 12,
+    'Serie-A': 11,
+    'Bundesliga': 20,
+    'Ligue-1': 13,
+}
+
+# Tipo de estadística (tabla stats_{tipo}) -> página de FBref
+STAT_PAGES = {
+    'standard': 'stats',
+    'keeper': 'keepers',
+    'keeper_adv': 'keepersadv',
+    'shooting': 'shooting',
+    'passing': 'passing',
+    'passing_types': 'passing_types',
+    'gca': 'gca',
+    'defense': 'defense',
+    'possession': 'possession',
+    'playing_time': 'playingtime',
+    'misc': 'misc',
+}
+
+# Columnas de texto que no se convierten a número
+TEXT_COLUMNS = ['Player', 'Nation', 'Pos', 'Squad', 'Comp', 'Matches', 'League', 'Season']
+
+# Identidad de un jugador al unir tablas de distintos tipos
+PLAYER_KEY = ['Player', 'Squad', 'Born']
+
+# Tipos de estadística que se unen por defecto en la tabla ancha
+WIDE_STAT_TYPES = ('standard', 'shooting', 'passing', 'defense', 'possession', 'misc',
+                   'keeper', 'keeper_adv')
+
+# Columnas de FBref (ya limpias) -> métricas de AdvancedPlayerScorer
+METRIC_COLUMNS = {
+    'standard': {
+        'Playing Time_MP': 'MP',
+        'Playing Time_Starts': 'Starts',
+        'Playing Time_Min': 'Min',
+        'Playing Time_90s': '90s',
+        'Performance_Gls': 'goals',
+        'Performance_Ast': 'assists',
+        'Progression_PrgP': 'progressive_passes',
+    },
+    'shooting': {
+        'Standard_Sh': 'shots',
+        'Standard_SoT': 'shot_on_target',
+        'Standard_SoTpct': 'shot_accuracy',
+    },
+    'passing': {
+        'Total_Cmppct': 'pass_accuracy',
+        'KP': 'key_passes',
+        'PrgP': 'progressive_passes',
+    },
+    'defense': {
+        'Tackles_Tkl': 'tackles',
+        'Int': 'interceptions',
+        'Clr': 'clearances',
+        'Blocks_Blocks': 'blocks',
+        'Err': 'errors_leading_to_shot',
+    },
+    'possession': {
+        'TakeOns_Succ': 'dribbles_successful',
+    },
+    'misc': {
+        'Performance_Off': 'offsides',
+        'Aerial Duels_Won': 'aerial_duels_won',
+    },
+    'keeper': {
+        'Performance_GA': 'goals_against',
+        'Performance_Saves': 'saves',
+        'Performance_Savepct': 'save_percentage',
+        'Performance_CS': 'clean_sheets',
+    },
+    'keeper_adv': {
+        'Launched_Cmppct': 'distribution_accuracy',
+    },
+}
 
 class PlayerDataCollector:
     """
     Recolecta datos de jugadores desde fuentes públicas
     """
     
-    def __init__(self):
+    def __init__(self, base_url="https://fbref.com", rate_limiter=None, max_retries=2,
+                 cache=None):
+        """
+        Args:
+            base_url: Servidor de origen (se puede apuntar a un servidor local
+                con páginas guardadas)
+            rate_limiter: HostRateLimiter compartido (por defecto, una
+                petición cada 3 segundos por host)
+            max_retries: Reintentos ante errores de conexión, 429 o 5xx
+            cache: HttpCache opcional (None = siempre se descarga)
+        """
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        self.base_url = "https://fbref.com"
+        self.base_url = base_url
+        self.session = create_session(self.headers)
+        self.rate_limiter = rate_limiter or HostRateLimiter(rate=1 / 3)
+        self.max_retries = max_retries
+        self.cache = cache
+    
+    def build_url(self, league, stat_type='standard', season=None):
+        """
+        URL de la página de estadísticas de una liga
+        
+        Args:
+            league: Nombre de la liga en LEAGUES (p. ej. 'La-Liga')
+            stat_type: Tipo de estadísticas (clave de STAT_PAGES)
+            season: Temporada ('2023-2024'); None = temporada actual
+        """
+        comp_id = LEAGUES[league]
+        page = STAT_PAGES[stat_type]
+        if season:
+            return f"{self.base_url}/en/comps/{comp_id}/{season}/{page}/{season}-{league}-Stats"
+        return f"{self.base_url}/en/comps/{comp_id}/{page}/{league}-Stats"
+    
+    def _download(self, url, headers=None):
+        return request_with_retries(
+            self.session, url,
+            rate_limiter=self.rate_limiter,
+            max_retries=self.max_retries,
+            headers=headers
+        )
+    
+    def fetch_page(self, url, stat_type=None):
+        """
+        Descarga una página respetando el límite por host, con reintentos
+        (a través de la caché si hay una configurada)
+        
+        Returns:
+            Contenido de la respuesta (bytes)
+        """
+        if self.cache is not None:
+            return self.cache.fetch(url, stat_type, self._download)
+        return self._download(url).content
+    
+    def parse_stats_table(self, html, stat_type='standard'):
+        """
+        Extrae la tabla stats_{stat_type} de una página
+        
+        Usa la extracción rápida con lxml si está instalado (un solo análisis
+        del fragmento de la tabla); si no, BeautifulSoup + read_html.
+        
+        Returns:
+            DataFrame (None si la página no tiene la tabla)
+        """
+        if HAS_LXML:
+            df = extract_stats_table(html, stat_type)
+        else:
+            df = self._parse_stats_table_bs4(html, stat_type)
+        
+        if df is None:
+            print(f"No se encontró tabla de tipo {stat_type}")
+        return df
+    
+    def _parse_stats_table_bs4(self, html, stat_type='standard'):
+        """Método original: BeautifulSoup para encontrar la tabla y read_html"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Buscar tabla de estadísticas
+        table = soup.find('table', {'id': f'stats_{stat_type}'})
+        
+        if not table:
+            # FBref esconde muchas tablas dentro de comentarios HTML
+            table_html = find_table_html(html, f'stats_{stat_type}')
+            if table_html is None:
+                return None
+            table = BeautifulSoup(table_html, 'html.parser').find('table')
+        
+        # Convertir a DataFrame
+        df = pd.read_html(StringIO(str(table)))[0]
+        
+        # Limpiar columnas multi-nivel si existen (sin los 'Unnamed: 0_level_0'
+        # de las columnas que no tienen grupo, como Player o Squad)
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = [
+                '_'.join(part for part in col if not part.startswith('Unnamed')).strip()
+                for col in df.columns.values
+            ]
+        
+        # Limpiar nombres de columnas
+        df.columns = clean_column_names(df.columns)
+        
+        return df
     
     def get_league_player_stats(self, league_url, stat_type='standard'):
         """
@@ -28,29 +211,11 @@ class PlayerDataCollector:
         """
         try:
             print(f"Obteniendo datos de {league_url}...")
-            response = requests.get(league_url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Parsear HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Buscar tabla de estadísticas
-            table = soup.find('table', {'id': f'stats_{stat_type}'})
+            df = self.parse_stats_table(self.fetch_page(league_url, stat_type), stat_type)
             
-            if not table:
-                print(f"No se encontró tabla de tipo {stat_type}")
+            if df is None:
                 return None
             
-            # Convertir a DataFrame
-            df = pd.read_html(str(table))[0]
-            
-            # Limpiar columnas multi-nivel si existen
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join(col).strip() for col in df.columns.values]
-            
-            # Limpiar nombres de columnas
-            df.columns = df.columns.str.replace(r'[^\w\s]', '', regex=True)
-            
             print(f"✓ Datos obtenidos: {len(df)} jugadores")
             return df
             
@@ -61,27 +226,95 @@ class PlayerDataCollector:
     def clean_player_data(self, df):
         """
         Limpia y prepara los datos de jugadores
+        
+        Una sola pasada vectorizada: elimina filas de encabezado repetidas y
+        columnas duplicadas, pasa la edad de FBref ("25-123") a años y
+        convierte a número todas las columnas que no son de texto.
         """
         if df is None:
             return None
         
-        # Eliminar filas duplicadas de encabezados
-        df = df[df['Player'] != 'Player']
+        # Eliminar filas duplicadas de encabezados y columnas repetidas
+        df = df.loc[df['Player'] != 'Player', ~df.columns.duplicated()].copy()
         
-        # Convertir columnas numéricas
-        numeric_columns = df.select_dtypes(include=['object']).columns
-        for col in numeric_columns:
-            if col not in ['Player', 'Nation', 'Pos', 'Squad', 'Born']:
-                try:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                except:
-                    pass
+        if 'Age' in df.columns:
+            df['Age'] = df['Age'].astype(str).str.split('-').str[0]
+        
+        # Convertir columnas numéricas (los miles vienen con coma: "1,234")
+        numeric_columns = [
+            col for col in df.columns
+            if col not in TEXT_COLUMNS and not pd.api.types.is_numeric_dtype(df[col])
+        ]
+        if numeric_columns:
+            df[numeric_columns] = df[numeric_columns].apply(
+                lambda values: pd.to_numeric(
+                    values.astype(str).str.replace(',', '', regex=False), errors='coerce'
+                )
+            )
         
         # Eliminar filas con todos valores nulos
         df = df.dropna(how='all')
         
         return df
     
+    def get_league_wide_stats(self, league, stat_types=WIDE_STAT_TYPES, season=None):
+        """
+        Descarga varios tipos de estadística de una liga y los une en una
+        sola tabla por jugador (Player + Squad + Born)
+        
+        Args:
+            league: Nombre de la liga en LEAGUES
+            stat_types: Tipos de estadística a unir (el primero es la base)
+            season: Temporada ('2023-2024'); None = temporada actual
+        
+        Returns:
+            DataFrame ancho con los nombres de métricas del scorer
+        """
+        tables = {}
+        for stat_type in stat_types:
+            df = self.get_league_player_stats(self.build_url(league, stat_type, season), stat_type)
+            df = self.clean_player_data(df)
+            if df is not None:
+                tables[stat_type] = df
+        
+        wide = self.merge_stat_tables(tables)
+        if wide is not None:
+            wide['League'] = league
+            wide['Season'] = season or 'current'
+        return wide
+    
+    def merge_stat_tables(self, tables):
+        """
+        Une tablas ya limpias de distintos tipos de estadística
+        
+        Las columnas de cada tipo se renombran con METRIC_COLUMNS (p. ej.
+        Tackles_Tkl -> tackles) y las que ya existen en la tabla ancha se
+        descartan (Nation, Pos, Age, xG... se toman de la primera tabla).
+        
+        Args:
+            tables: Dict stat_type -> DataFrame limpio
+        """
+        wide = None
+        
+        for stat_type, df in tables.items():
+            df = df.rename(columns=METRIC_COLUMNS.get(stat_type, {}))
+            df = df.loc[:, ~df.columns.duplicated()].drop(columns=['Rk', 'Matches'], errors='ignore')
+            
+            if wide is None:
+                wide = df
+                continue
+            
+            keys = [col for col in PLAYER_KEY if col in wide.columns and col in df.columns]
+            new_columns = [col for col in df.columns if col not in wide.columns]
+            if not keys or not new_columns:
+                continue
+            
+            # Un jugador por clave en cada tabla (evita multiplicar filas)
+            df = df.drop_duplicates(subset=keys)
+            wide = wide.merge(df[keys + new_columns], on=keys, how='left')
+        
+        return wide
+    
     def get_sample_data(self):
         """
         Obtiene datos de muestra de una liga popular
@@ -90,12 +323,10 @@ class PlayerDataCollector:
         # URL de ejemplo - La Liga 2023-2024
         league_url = "https://fbref.com/en/comps/12/stats/La-Liga-Stats"
         
+        # El rate_limiter espacia las peticiones para no sobrecargar el servidor
         df = self.get_league_player_stats(league_url)
         df = self.clean_player_data(df)
         
-        # Esperar para no sobrecargar el servidor
-        time.sleep(3)
-        
         return df
     
     def save_data(self, df, filename):
@@ -105,11 +336,20 @@ class PlayerDataCollector:
         if df is not None:
             df.to_csv(f'data/raw/{filename}', index=False)
             print(f"✓ Datos guardados en data/raw/{filename}")
+    
+    def save_to_lake(self, df, lake, league, stat_type='standard', season=None):
+        """
+        Guarda los datos en el almacén Parquet particionado (RawDataLake)
+        """
+        if df is not None:
+            path = lake.write(df, league, stat_type, season)
+            print(f"✓ Datos guardados en {path}")
 
 
 # Ejemplo de uso
 if __name__ == "__main__":
-    collector = PlayerDataCollector()
+    # Las páginas sin cambios desde la última ejecución salen de la caché
+    collector = PlayerDataCollector(cache=HttpCache())
     
     # Obtener datos de muestra
     print("Recolectando datos de jugadores...")
@@ -122,4 +362,10 @@ if __name__ == "__main__":
         print(player_data.head())
         
         # Guardar datos
-        collector.save_data(player_data, 'players_stats.csv')
\ No newline at end of file
+        collector.save_data(player_data, 'players_stats.csv')
+        try:
+            collector.save_to_lake(player_data, RawDataLake(), 'La-Liga')
+        except ImportError as error:
+            print(f"⚠️  {error}")
+    
+    collector.cache.report()
@@ -0,0 +1,273 @@
+"""
+Almacén de datos crudos en Parquet particionado por liga / temporada / tipo
+
+Estructura (particiones estilo Hive):
+    data/lake/League=La-Liga/Season=current/stat_type=standard/part-0.parquet
+
+Al leer, las particiones que no coinciden con las ligas, temporadas o tipos
+pedidos ni se abren; dentro de las que sí, solo se leen las columnas pedidas
+y los filtros sobre columnas de datos se evalúan en pyarrow (estadísticas de
+cada row group) antes de pasar a pandas.
+
+Uso:
+    python -m src.data_collection.data_lake list
+    python -m src.data_collection.data_lake import data/raw/players_stats.csv \
+        --league La-Liga --stat-type standard
+"""
+import argparse
+import glob
+import os
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Columnas de partición (no se guardan dentro de los archivos)
+PARTITION_COLUMNS = ['League', 'Season', 'stat_type']
+
+# Tipo de estadística de las tablas anchas (merge_stat_tables)
+WIDE_STAT_TYPE = 'wide'
+
+# Columnas de identidad que siempre se cargan para puntuar
+IDENTITY_COLUMNS = ['Player', 'Nation', 'Pos', 'Squad', 'Age', 'Born', 'MP', 'Min', '90s']
+
+# Operadores de filtro aceptados: (columna, operador, valor)
+_OPERATORS = {
+    '==': lambda field, value: field == value,
+    '!=': lambda field, value: field != value,
+    '<': lambda field, value: field < value,
+    '<=': lambda field, value: field <= value,
+    '>': lambda field, value: field > value,
+    '>=': lambda field, value: field >= value,
+    'in': lambda field, value: field.isin(list(value)),
+    'not in': lambda field, value: ~field.isin(list(value)),
+}
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("El almacén Parquet necesita pyarrow: pip install pyarrow")
+
+
+def _as_list(values):
+    if values is None:
+        return None
+    if isinstance(values, str):
+        return [values]
+    return list(values)
+
+
+def build_filter(filters):
+    """
+    Expresión de pyarrow a partir de una lista de tuplas (AND)
+
+    Ejemplo: [('Min', '>=', 900), ('Pos', 'in', ['FW', 'FW,MF'])]
+    """
+    expression = None
+    for column, operator, value in filters or []:
+        if operator not in _OPERATORS:
+            raise ValueError(f"Operador no soportado: {operator}")
+        condition = _OPERATORS[operator](ds.field(column), value)
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+class RawDataLake:
+    """
+    Lectura y escritura de las tablas recolectadas en un dataset Parquet
+    """
+
+    def __init__(self, root='data/lake'):
+        """
+        Args:
+            root: Carpeta raíz del dataset
+        """
+        _require_pyarrow()
+        self.root = root
+        self.lock = threading.Lock()
+        self.partitioning = ds.partitioning(
+            pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+            flavor='hive'
+        )
+
+    def partition_path(self, league, season, stat_type):
+        """Carpeta de una partición"""
+        values = [league, season or 'current', stat_type]
+        return os.path.join(self.root, *[
+            f'{name}={value}' for name, value in zip(PARTITION_COLUMNS, values)
+        ])
+
+    def _to_table(self, df):
+        # Números siempre float64 y el resto texto: así todas las particiones
+        # tienen el mismo esquema aunque una liga tenga nulos y otra no
+        df = df.drop(columns=[col for col in PARTITION_COLUMNS if col in df.columns])
+        df = df.loc[:, ~df.columns.duplicated()].copy()
+        fields = []
+        for col in df.columns:
+            if pd.api.types.is_bool_dtype(df[col]):
+                fields.append(pa.field(col, pa.bool_()))
+            elif pd.api.types.is_numeric_dtype(df[col]):
+                fields.append(pa.field(col, pa.float64()))
+            else:
+                df[col] = df[col].astype(object).where(df[col].notna(), None).map(
+                    lambda value: value if value is None else str(value)
+                )
+                fields.append(pa.field(col, pa.string()))
+        return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+    def write(self, df, league, stat_type, season=None):
+        """
+        Guarda (o reemplaza) la partición liga / temporada / tipo
+
+        Args:
+            df: DataFrame limpio (clean_player_data o merge_stat_tables)
+            league: Nombre de la liga
+            stat_type: Tipo de estadística ('wide' para la tabla ancha)
+            season: Temporada; None = 'current'
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        directory = self.partition_path(league, season, stat_type)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'part-0.parquet')
+
+        table = self._to_table(df)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        pq.write_table(table, tmp_path, compression='zstd')
+
+        # Reemplazo atómico: un lector nunca ve la partición a medio escribir
+        with self.lock:
+            os.replace(tmp_path, path)
+            for old in glob.glob(os.path.join(directory, '*.parquet')):
+                if old != path:
+                    os.remove(old)
+
+        return path
+
+    def _partition_files(self, leagues=None, seasons=None, stat_types=None):
+        """Archivos de las particiones pedidas (poda por ruta, sin abrirlos)"""
+        wanted = [_as_list(leagues), _as_list(seasons), _as_list(stat_types)]
+
+        files = []
+        for path in sorted(glob.glob(os.path.join(self.root, '*', '*', '*', '*.parquet'))):
+            parts = os.path.relpath(path, self.root).split(os.sep)[:3]
+            values = [part.split('=', 1)[1] for part in parts]
+            if all(not allowed or value in allowed for value, allowed in zip(values, wanted)):
+                files.append(path)
+        return files
+
+    def dataset(self, leagues=None, seasons=None, stat_types=None):
+        """
+        pyarrow Dataset con solo las particiones pedidas (None si no hay)
+
+        El esquema es la unión de los esquemas de los archivos (solo se leen
+        los pies de página de Parquet), porque cada tipo tiene sus columnas.
+        """
+        files = self._partition_files(leagues, seasons, stat_types)
+        if not files:
+            return None
+
+        schemas = [pq.read_schema(path) for path in files]
+        schema = pa.unify_schemas(
+            schemas + [pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS])]
+        )
+        return ds.dataset(files, schema=schema, format='parquet',
+                          partitioning=self.partitioning, partition_base_dir=self.root)
+
+    def read(self, columns=None, filters=None, leagues=None, seasons=None,
+             stat_types=None):
+        """
+        Carga en pandas solo las particiones, columnas y filas pedidas
+
+        Args:
+            columns: Columnas a leer (None = todas). Las que no existen en
+                ninguna partición se ignoran; las de partición se añaden.
+            filters: Lista de (columna, operador, valor) sobre cualquier
+                columna, p. ej. [('Min', '>=', 900)]
+            leagues, seasons, stat_types: Particiones a leer (None = todas)
+
+        Returns:
+            DataFrame (vacío si no hay particiones)
+        """
+        dataset = self.dataset(leagues, seasons, stat_types)
+        if dataset is None:
+            return pd.DataFrame(columns=columns or [])
+
+        if columns is not None:
+            names = set(dataset.schema.names)
+            columns = [col for col in columns if col in names and col not in PARTITION_COLUMNS]
+            columns += PARTITION_COLUMNS
+
+        table = dataset.to_table(columns=columns, filter=build_filter(filters))
+        return table.to_pandas()
+
+    def load_for_scoring(self, scorer, leagues=None, seasons=None,
+                         stat_type=WIDE_STAT_TYPE, filters=None):
+        """
+        Tabla para un scorer: identidad + las métricas de sus pesos
+
+        Args:
+            scorer: Objeto con position_weights (AdvancedPlayerScorer,
+                PlayerScorer...)
+        """
+        metrics = []
+        for weights in scorer.position_weights.values():
+            metrics.extend(metric for metric in weights if metric not in metrics)
+
+        return self.read(columns=IDENTITY_COLUMNS + metrics, filters=filters,
+                         leagues=leagues, seasons=seasons, stat_types=stat_type)
+
+    def partitions(self):
+        """Resumen de particiones (filas y tamaño leídos de los metadatos)"""
+        rows = []
+        for path in self._partition_files():
+            parts = os.path.relpath(path, self.root).split(os.sep)[:3]
+            record = dict(part.split('=', 1) for part in parts)
+            metadata = pq.ParquetFile(path).metadata
+            record['rows'] = metadata.num_rows
+            record['columns'] = metadata.num_columns
+            record['size_kb'] = round(os.path.getsize(path) / 1024, 1)
+            rows.append(record)
+        return pd.DataFrame(rows, columns=PARTITION_COLUMNS + ['rows', 'columns', 'size_kb'])
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Almacén Parquet de datos recolectados')
+    parser.add_argument('--root', default='data/lake')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='Lista las particiones')
+
+    import_parser = subparsers.add_parser('import', help='Importa un CSV de data/raw')
+    import_parser.add_argument('csv')
+    import_parser.add_argument('--league', required=True)
+    import_parser.add_argument('--season', default=None)
+    import_parser.add_argument('--stat-type', default='standard')
+    args = parser.parse_args()
+
+    lake = RawDataLake(args.root)
+
+    if args.command == 'import':
+        try:
+            df = pd.read_csv(args.csv)
+        except FileNotFoundError:
+            print(f"❌ No se encontró {args.csv}")
+            print("   Ejecuta primero: python -m src.data_collection.data_collector")
+        else:
+            path = lake.write(df, args.league, args.stat_type, args.season)
+            print(f"✓ {len(df)} filas guardadas en {path}")
+    else:
+        partitions = lake.partitions()
+        if partitions.empty:
+            print(f"⚠️  No hay particiones en {args.root}")
+        else:
+            print(partitions.to_string(index=False))
@@ -0,0 +1,147 @@
+"""
+Caché HTTP en disco con revalidación condicional (ETag / Last-Modified)
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class HttpCache:
+    """
+    Guarda las páginas descargadas comprimidas con gzip
+
+    Cada entrada (URL + tipo de estadística) tiene un .html.gz con el cuerpo
+    y un .json con ETag, Last-Modified y la fecha de descarga. Mientras la
+    entrada no supere el TTL se sirve sin tocar la red; después se revalida
+    con una petición condicional y, si el servidor responde 304, se reutiliza
+    el cuerpo guardado.
+    """
+
+    def __init__(self, directory='data/cache/http', ttl=24 * 3600, offline=False):
+        """
+        Args:
+            directory: Carpeta de la caché
+            ttl: Segundos durante los que una entrada se sirve sin revalidar
+            offline: Si es True solo se sirve desde la caché (sin red)
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0, 'revalidated': 0, 'misses': 0, 'offline_misses': 0,
+            'bytes_downloaded': 0, 'bytes_saved': 0,
+        }
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url, stat_type):
+        key = hashlib.sha256(f'{url}|{stat_type or ""}'.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.html.gz'
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+    def get(self, url, stat_type=None):
+        """Entrada guardada (metadatos, cuerpo) o None"""
+        meta_path, body_path = self._paths(url, stat_type)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def _write(self, path, data, mode):
+        # Escritura atómica: varios hilos pueden guardar a la vez
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        if mode == 'gzip':
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(data)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def put(self, url, stat_type, body, headers):
+        """Guarda una respuesta con sus validadores"""
+        meta_path, body_path = self._paths(url, stat_type)
+        meta = {
+            'url': url,
+            'stat_type': stat_type,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'size': len(body),
+        }
+        self._write(body_path, body, 'gzip')
+        self._write(meta_path, meta, 'json')
+        return meta
+
+    def _touch(self, url, stat_type, meta):
+        meta = dict(meta, fetched_at=time.time())
+        self._write(self._paths(url, stat_type)[0], meta, 'json')
+
+    def fetch(self, url, stat_type, download):
+        """
+        Devuelve el cuerpo de la página usando la caché cuando se puede
+
+        Args:
+            url: URL de la página
+            stat_type: Tipo de estadística (parte de la clave)
+            download: Función (url, headers) -> requests.Response
+
+        Returns:
+            Contenido (bytes)
+        """
+        entry = self.get(url, stat_type)
+
+        if entry is not None:
+            meta, body = entry
+            if self.offline or time.time() - meta['fetched_at'] < self.ttl:
+                self._count('hits')
+                self._count('bytes_saved', meta['size'])
+                return body
+        elif self.offline:
+            self._count('offline_misses')
+            raise LookupError(f"Modo offline: {url} no está en la caché")
+
+        headers = {}
+        if entry is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = download(url, headers)
+
+        if response.status_code == 304 and entry is not None:
+            self._touch(url, stat_type, meta)
+            self._count('revalidated')
+            self._count('bytes_saved', meta['size'])
+            return body
+
+        self.put(url, stat_type, response.content, response.headers)
+        self._count('misses')
+        self._count('bytes_downloaded', len(response.content))
+        return response.content
+
+    def report(self):
+        """Resumen de aciertos y fallos de la caché"""
+        stats = self.stats
+        total = stats['hits'] + stats['revalidated'] + stats['misses'] + stats['offline_misses']
+        print("\n📊 Caché HTTP:")
+        print(f"   Aciertos: {stats['hits']}  Revalidadas (304): {stats['revalidated']}  "
+              f"Descargas: {stats['misses']}  Sin caché (offline): {stats['offline_misses']}")
+        if total:
+            served = stats['hits'] + stats['revalidated']
+            print(f"   Tasa de aciertos: {served / total:.0%}  "
+                  f"Descargado: {stats['bytes_downloaded'] / 1024 ** 2:.1f} MB  "
+                  f"Ahorrado: {stats['bytes_saved'] / 1024 ** 2:.1f} MB")
+        return dict(stats)
@@ -0,0 +1,113 @@
+"""
+Utilidades HTTP para la recolección: límite de peticiones por host y reintentos
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Códigos que vale la pena reintentar (límite de peticiones y errores del servidor)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token bucket seguro entre hilos
+
+    Se recargan `rate` tokens por segundo hasta `capacity`; cada petición
+    consume uno y espera si no hay disponibles.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Espera hasta obtener un token; devuelve los segundos esperados"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """Un TokenBucket por host (fbref.com, localhost, ...)"""
+
+    def __init__(self, rate=0.5, capacity=1):
+        """
+        Args:
+            rate: Peticiones por segundo permitidas a cada host
+            capacity: Ráfaga máxima
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.capacity)
+            bucket = self.buckets[host]
+        return bucket.acquire()
+
+
+def create_session(headers=None, pool_size=10):
+    """Sesión con un pool de conexiones compartido entre hilos"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def request_with_retries(session, url, rate_limiter=None, max_retries=3, backoff=2.0,
+                         timeout=30, headers=None):
+    """
+    GET con límite de peticiones y reintentos con backoff exponencial
+
+    Reintenta errores de conexión y los códigos de RETRY_STATUS; respeta la
+    cabecera Retry-After si el servidor la envía.
+
+    Returns:
+        requests.Response (ya validada con raise_for_status)
+    """
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire(url)
+
+        try:
+            response = session.get(url, timeout=timeout, headers=headers)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            retry_after = None
+        else:
+            if response.status_code not in RETRY_STATUS or attempt == max_retries:
+                response.raise_for_status()
+                return response
+            retry_after = response.headers.get('Retry-After')
+
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            # Backoff exponencial con jitter para no sincronizar los hilos
+            delay = backoff ** attempt * (1 + random.random())
+        time.sleep(delay)
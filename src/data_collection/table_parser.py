@@ -0,0 +1,141 @@
+"""
+Extracción rápida de tablas stats_{tipo} de páginas de FBref
+
+Se localiza la tabla por su id en el HTML crudo (también cuando FBref la
+esconde dentro de un comentario <!-- ... -->) y solo ese fragmento se
+procesa con lxml, construyendo el DataFrame directamente de las celdas.
+"""
+import re
+
+import pandas as pd
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Filas de encabezado repetidas dentro del cuerpo de la tabla
+SKIPPED_ROW_CLASSES = ('thead', 'over_header', 'spacer')
+
+
+def find_table_html(html, table_id):
+    """
+    Fragmento <table id="...">...</table> del HTML crudo (o None)
+
+    Funciona igual si la tabla está dentro de un comentario, porque no se
+    interpreta el resto de la página.
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+
+    match = re.search(r'<table\b[^>]*\bid=["\']%s["\']' % re.escape(table_id), html)
+    if not match:
+        return None
+
+    end = html.find('</table>', match.end())
+    if end == -1:
+        return None
+    return html[match.start():end + len('</table>')]
+
+
+def clean_column_names(columns):
+    """
+    Limpieza de nombres del método original (solo letras, números y espacios),
+    pero con '%' -> 'pct' para que 'SoT' y 'SoT%' no queden duplicadas
+    """
+    columns = pd.Index(columns).str.replace('%', 'pct', regex=False)
+    return columns.str.replace(r'[^\w\s]', '', regex=True)
+
+
+def _expand(cells):
+    """Textos de las celdas repitiendo las que tienen colspan"""
+    values = []
+    for cell in cells:
+        text = cell.text_content().strip()
+        try:
+            span = int(cell.get('colspan', 1))
+        except ValueError:
+            span = 1
+        values.extend([text] * span)
+    return values
+
+
+def _column_names(header_rows):
+    """
+    Nombres de columna como en el método original: grupo_nombre, sin grupo
+    cuando la celda superior está vacía, y duplicados numerados (.1, .2)
+    """
+    levels = [_expand(row.xpath('./th|./td')) for row in header_rows]
+    n_columns = len(levels[-1])
+
+    names = []
+    for i in range(n_columns):
+        parts = [level[i] for level in levels if i < len(level) and level[i]]
+        names.append('_'.join(parts))
+
+    seen = {}
+    for i, name in enumerate(names):
+        if name in seen:
+            seen[name] += 1
+            names[i] = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+
+    return names
+
+
+def _to_numeric(df):
+    """Columnas numéricas (con separador de miles) a números, como read_html"""
+    for col in df.columns:
+        values = df[col]
+        present = values.notna() & (values != '')
+        numbers = pd.to_numeric(values.str.replace(',', '', regex=False), errors='coerce')
+        if present.any() and numbers[present].notna().all():
+            df[col] = numbers
+        else:
+            df[col] = values.where(present)
+    return df
+
+
+def extract_stats_table(html, stat_type='standard'):
+    """
+    DataFrame de la tabla stats_{stat_type} con un solo análisis del fragmento
+
+    Returns:
+        DataFrame con los mismos nombres de columna que el método con
+        BeautifulSoup + read_html (None si la página no tiene la tabla)
+    """
+    if not HAS_LXML:
+        raise ImportError("La extracción rápida necesita lxml: pip install lxml")
+
+    fragment = find_table_html(html, f'stats_{stat_type}')
+    if fragment is None:
+        return None
+
+    table = lxml.html.fragment_fromstring(fragment)
+    header_rows = table.xpath('./thead/tr')
+    body_rows = table.xpath('./tbody/tr') or table.xpath('./tr')
+    if not header_rows:
+        header_rows, body_rows = body_rows[:1], body_rows[1:]
+    if not header_rows:
+        return None
+
+    columns = _column_names(header_rows)
+    n_columns = len(columns)
+
+    rows = []
+    for row in body_rows:
+        classes = (row.get('class') or '').split()
+        if any(name in classes for name in SKIPPED_ROW_CLASSES):
+            continue
+        values = _expand(row.xpath('./th|./td'))[:n_columns]
+        values.extend([None] * (n_columns - len(values)))
+        rows.append(values)
+
+    df = pd.DataFrame(rows, columns=columns, dtype=object)
+    df = _to_numeric(df)
+
+    df.columns = clean_column_names(df.columns)
+
+    return df
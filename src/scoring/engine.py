@@ -0,0 +1,307 @@
+"""
+Motor de scoring multi-perfil: varios perfiles puntuados en una sola pasada
+
+Uso:
+    python -m src.scoring.engine data/raw/players_stats.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.advanced_scorer import AdvancedPlayerScorer
+from src.analysis.position_classifier import POSITION_CATEGORIES, PositionClassifier
+from src.analysis.scoring_model import ColumnStats, apply_normalization, normalization_from_stats
+
+# Normalización y fórmula de cada scorer existente
+SCORER_DEFAULTS = {
+    'PlayerScorer': {'score_mode': 'classic', 'clip_sigma': None, 'constant_value': None},
+    'AdvancedPlayerScorer': {'score_mode': 'advanced', 'clip_sigma': 3, 'constant_value': 50},
+}
+
+
+class ScoringProfile:
+    """
+    Perfil de scoring: pesos por posición, clasificación de posiciones,
+    normalización y fórmula del score
+    """
+
+    def __init__(self, name, position_weights, identify_position, score_mode='advanced',
+                 clip_sigma=3, constant_value=50, categories=None):
+        """
+        Args:
+            name: Prefijo de las columnas de salida ({name}_Score, {name}_Rank)
+            position_weights: Dict posición -> {métrica: peso}
+            identify_position: Función que clasifica un string de posición
+            score_mode: 'classic' (media ponderada) o 'advanced' (+50 y recorte)
+            clip_sigma: Recorte en desviaciones estándar (None = sin recorte)
+            constant_value: Valor para columnas constantes (None = mínimo del rango)
+            categories: Posiciones que devuelve identify_position (None =
+                POSITION_CATEGORIES); 'Unknown' se agrega al final si falta
+        """
+        if score_mode not in ('classic', 'advanced'):
+            raise ValueError("score_mode debe ser 'classic' o 'advanced'")
+
+        categories = [c for c in (categories or POSITION_CATEGORIES) if c != 'Unknown']
+        self.categories = categories + ['Unknown']
+        unknown = [position for position in position_weights if position not in self.categories]
+        if unknown:
+            raise ValueError(
+                f"Perfil '{name}': posiciones {unknown} fuera de las categorías "
+                f"{self.categories} (usar categories=)"
+            )
+
+        self.name = name
+        self.position_weights = position_weights
+        self.identify_position = identify_position
+        self.score_mode = score_mode
+        self.clip_sigma = clip_sigma
+        self.constant_value = constant_value
+
+    @classmethod
+    def from_scorer(cls, scorer, name, position_weights=None):
+        """
+        Perfil equivalente a un PlayerScorer o AdvancedPlayerScorer
+
+        Args:
+            scorer: Instancia del scorer
+            name: Nombre del perfil
+            position_weights: Pesos propios (None = los del scorer)
+        """
+        scorer_name = type(scorer).__name__
+        if scorer_name not in SCORER_DEFAULTS:
+            raise ValueError(f"Scorer no soportado: {scorer_name}")
+
+        return cls(
+            name,
+            position_weights or scorer.position_weights,
+            scorer.identify_position,
+            **SCORER_DEFAULTS[scorer_name]
+        )
+
+    @property
+    def classifier_key(self):
+        # Dos instancias del mismo scorer comparten la función de clasificación
+        function = getattr(self.identify_position, '__func__', self.identify_position)
+        return (function, tuple(self.categories))
+
+    @property
+    def normalization_key(self):
+        return (self.clip_sigma, self.constant_value)
+
+    @property
+    def metrics(self):
+        return [m for weights in self.position_weights.values() for m in weights]
+
+
+class ScoringEngine:
+    """
+    Registra varios perfiles y los puntúa juntos
+
+    Todos los perfiles comparten una factorización de Pos, un solo cálculo de
+    estadísticas por columna (media, desviación, mínimo y máximo) y, por cada
+    grupo de posición, un único producto matricial que produce los scores de
+    todos los perfiles a la vez.
+    """
+
+    def __init__(self, feature_range=(0, 100)):
+        self.feature_range = feature_range
+        self.profiles = []
+        self.preprocessor = AdvancedPlayerScorer()
+        self.timings = {}
+
+    def register(self, profile):
+        """Registra un perfil (los nombres deben ser únicos)"""
+        if any(p.name == profile.name for p in self.profiles):
+            raise ValueError(f"Ya existe un perfil llamado '{profile.name}'")
+        self.profiles.append(profile)
+        return self
+
+    def register_scorer(self, scorer, name, position_weights=None):
+        """Registra un perfil a partir de un scorer existente"""
+        return self.register(ScoringProfile.from_scorer(scorer, name, position_weights))
+
+    def compile(self, columns):
+        """
+        Agrupa los pesos de todos los perfiles en matrices por
+        (clasificador, normalización, posición)
+
+        Args:
+            columns: Métricas disponibles en la matriz compartida
+
+        Returns:
+            Lista de bloques con los perfiles, la matriz de pesos
+            (métricas x perfiles), el peso total y el modo de cada perfil
+        """
+        index = {col: i for i, col in enumerate(columns)}
+        blocks = {}
+
+        for j, profile in enumerate(self.profiles):
+            for position, weights in profile.position_weights.items():
+                if position == 'Unknown':
+                    continue
+
+                vector = np.zeros(len(columns))
+                for metric, weight in weights.items():
+                    if metric in index:
+                        vector[index[metric]] = weight
+
+                if profile.score_mode == 'advanced':
+                    total_weight = np.abs(vector).sum()
+                else:
+                    total_weight = vector.sum()
+                if total_weight == 0:
+                    continue
+
+                key = (profile.classifier_key, profile.normalization_key, position)
+                block = blocks.setdefault(key, {
+                    'classifier': profile.classifier_key,
+                    'normalization': profile.normalization_key,
+                    'position': position,
+                    'profiles': [], 'vectors': [], 'totals': [], 'advanced': [],
+                })
+                block['profiles'].append(j)
+                block['vectors'].append(vector)
+                block['totals'].append(total_weight)
+                block['advanced'].append(profile.score_mode == 'advanced')
+
+        compiled = []
+        for block in blocks.values():
+            compiled.append({
+                'classifier': block['classifier'],
+                'normalization': block['normalization'],
+                'position': block['position'],
+                'profiles': np.array(block['profiles']),
+                'weights': np.column_stack(block['vectors']),
+                'totals': np.array(block['totals']),
+                'advanced': np.array(block['advanced']),
+            })
+
+        return compiled
+
+    def _classify(self, df):
+        """Una factorización de Pos; cada clasificador solo ve los valores únicos"""
+        codes, uniques = pd.factorize(df['Pos'])
+        positions = {}
+
+        for profile in self.profiles:
+            key = profile.classifier_key
+            if key not in positions:
+                classifier = PositionClassifier(profile.identify_position, profile.categories)
+                positions[key] = classifier.category_codes(codes, uniques)
+
+        return positions
+
+    def score(self, df):
+        """
+        Puntúa el DataFrame con todos los perfiles registrados
+
+        Returns:
+            Copia del DataFrame con Position_Category (según el primer perfil),
+            {perfil}_Position si un perfil clasifica distinto, y
+            {perfil}_Score y {perfil}_Rank por cada perfil
+        """
+        if not self.profiles:
+            raise ValueError("No hay perfiles registrados")
+
+        self.timings = {}
+        start = time.perf_counter()
+        positions = self._classify(df)
+        self.timings['positions'] = time.perf_counter() - start
+
+        # Una sola matriz con la unión de métricas de todos los perfiles
+        start = time.perf_counter()
+        metrics = [m for profile in self.profiles for m in profile.metrics]
+        plan = self.preprocessor.build_metric_plan(df, metrics)
+        df = self.preprocessor.calculate_per_90_stats(df, columns=plan['per90'])
+        columns = plan['normalized']
+        values = df.reindex(columns=columns).fillna(0).to_numpy(dtype=float)
+
+        normalized = {}
+        if len(values):
+            stats = ColumnStats(len(columns)).update(values)
+            for profile in self.profiles:
+                key = profile.normalization_key
+                if key not in normalized:
+                    params = normalization_from_stats(stats, profile.clip_sigma)
+                    normalized[key] = apply_normalization(
+                        values, params, self.feature_range, constant_value=profile.constant_value
+                    )
+        self.timings['normalization'] = time.perf_counter() - start
+
+        # Un producto matricial por bloque produce todos los perfiles del bloque
+        start = time.perf_counter()
+        scores = np.zeros((len(df), len(self.profiles)))
+        for block in self.compile(columns):
+            if block['normalization'] not in normalized:
+                continue
+            # Las categorías forman parte de la clave del clasificador
+            category = block['classifier'][1].index(block['position'])
+            rows = np.flatnonzero(positions[block['classifier']] == category)
+            if len(rows) == 0:
+                continue
+
+            block_scores = normalized[block['normalization']][rows] @ block['weights']
+            block_scores /= block['totals']
+            advanced = block['advanced']
+            block_scores[:, advanced] = np.clip(block_scores[:, advanced] * 100 + 50, 0, 100)
+            scores[np.ix_(rows, block['profiles'])] = block_scores
+        self.timings['scoring'] = time.perf_counter() - start
+
+        result = {}
+        first_key = self.profiles[0].classifier_key
+        result['Position_Category'] = pd.Categorical.from_codes(
+            positions[first_key], categories=self.profiles[0].categories
+        )
+        for j, profile in enumerate(self.profiles):
+            if profile.classifier_key != first_key:
+                result[f'{profile.name}_Position'] = pd.Categorical.from_codes(
+                    positions[profile.classifier_key], categories=profile.categories
+                )
+            profile_scores = pd.Series(scores[:, j], index=df.index)
+            result[f'{profile.name}_Score'] = profile_scores
+            result[f'{profile.name}_Rank'] = profile_scores.rank(ascending=False, method='min')
+
+        output = pd.DataFrame(result, index=df.index)
+        return pd.concat([df.drop(columns=[c for c in output.columns if c in df.columns]), output],
+                         axis=1)
+
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    from src.analysis.player_scorer import PlayerScorer
+
+    parser = argparse.ArgumentParser(description='Scoring con varios perfiles en una pasada')
+    parser.add_argument('input', nargs='?', default='data/raw/players_stats.csv')
+    parser.add_argument('--output', default='data/processed/players_multi_scored.csv')
+    args = parser.parse_args()
+
+    try:
+        df = pd.read_csv(args.input)
+    except FileNotFoundError:
+        print(f"❌ No se encontró {args.input}")
+        print("   Ejecuta primero: python -m src.data_collection.data_collector")
+    else:
+        advanced = AdvancedPlayerScorer()
+        engine = ScoringEngine()
+        engine.register_scorer(PlayerScorer(), 'Classic')
+        engine.register_scorer(advanced, 'Advanced')
+
+        # Perfil propio: mismos datos, pesos orientados a recuperación
+        engine.register_scorer(advanced, 'Ball_Winner', position_weights={
+            'MF': {'tackles': 0.35, 'interceptions': 0.35, 'progressive_passes': 0.30},
+            'DF': {'tackles': 0.30, 'interceptions': 0.30, 'blocks': 0.20, 'clearances': 0.20},
+        })
+
+        df_scored = engine.score(df)
+        timings = ', '.join(f'{step} {seconds:.3f}s' for step, seconds in engine.timings.items())
+        print(f"✓ {len(engine.profiles)} perfiles en una pasada ({timings})")
+
+        print("\n🏆 TOP 10 (Advanced):")
+        print(df_scored.nsmallest(10, 'Advanced_Rank')[
+            ['Player', 'Pos', 'Squad', 'Classic_Score', 'Advanced_Score', 'Ball_Winner_Score']
+        ])
+
+        df_scored.to_csv(args.output, index=False)
+        print(f"\n✓ Resultados guardados en {args.output}")